@@ -3,29 +3,34 @@ Análisis Avanzado de Datos de Telecomunicaciones
 Script complementario para análisis detallado y generación de insights
 """
 
+import argparse
+import contextlib
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import classification_report, confusion_matrix
-from sklearn.preprocessing import StandardScaler
+from churn_data import read_churn_csv
+from churn_model import CV_FOLDS, N_JOBS, cross_validate_churn_model, load_or_train
 import warnings
 warnings.filterwarnings('ignore')
 
 class TelecomAnalyzer:
     def __init__(self, data_path):
-        """Inicializar el analizador con los datos"""
-        self.df = pd.read_csv(data_path)
+        """Inicializar el analizador con los datos (tipados y con caché Parquet)"""
+        self.df = read_churn_csv(data_path)
         self.prepare_data()
         
     def prepare_data(self):
         """Preparar y limpiar los datos"""
-        # Convertir variables booleanas
-        self.df['International plan'] = self.df['International plan'].map({'Yes': 1, 'No': 0})
-        self.df['Voice mail plan'] = self.df['Voice mail plan'].map({'Yes': 1, 'No': 0})
-        self.df['Churn'] = self.df['Churn'].map({True: 1, False: 0})
+        # Convertir variables booleanas a 0/1 (read_churn_csv ya las lee como bool)
+        self.df['International plan'] = self.df['International plan'].astype('int8')
+        self.df['Voice mail plan'] = self.df['Voice mail plan'].astype('int8')
+        self.df['Churn'] = self.df['Churn'].astype('int8')
         
         # Crear variables derivadas
         self.df['Total minutes'] = (self.df['Total day minutes'] + 
@@ -105,7 +110,7 @@ class TelecomAnalyzer:
     
     def analyze_geographic_patterns(self):
         """Analizar patrones geográficos"""
-        geo_analysis = self.df.groupby('State').agg({
+        geo_analysis = self.df.groupby('State', observed=True).agg({
             'Churn': ['mean', 'count'],
             'Account length': 'mean',
             'Customer service calls': 'mean',
@@ -117,47 +122,25 @@ class TelecomAnalyzer:
         
         return geo_analysis.sort_values('churn_rate', ascending=False)
     
-    def build_churn_model(self):
-        """Construir modelo predictivo de churn"""
-        # Seleccionar features
-        features = ['Account length', 'International plan', 'Voice mail plan',
-                   'Number vmail messages', 'Total day minutes', 'Total day calls',
-                   'Total day charge', 'Total eve minutes', 'Total eve calls',
-                   'Total eve charge', 'Total night minutes', 'Total night calls',
-                   'Total night charge', 'Total intl minutes', 'Total intl calls',
-                   'Total intl charge', 'Customer service calls']
-        
-        X = self.df[features]
-        y = self.df['Churn']
-        
-        # Dividir datos
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-        
-        # Escalar datos
-        scaler = StandardScaler()
-        X_train_scaled = scaler.fit_transform(X_train)
-        X_test_scaled = scaler.transform(X_test)
-        
-        # Entrenar modelo
-        rf_model = RandomForestClassifier(n_estimators=100, random_state=42)
-        rf_model.fit(X_train_scaled, y_train)
-        
-        # Evaluar modelo
-        y_pred = rf_model.predict(X_test_scaled)
-        
-        # Obtener importancia de features
-        feature_importance = pd.DataFrame({
-            'feature': features,
-            'importance': rf_model.feature_importances_
-        }).sort_values('importance', ascending=False)
-        
-        return {
-            'model': rf_model,
-            'scaler': scaler,
-            'feature_importance': feature_importance,
-            'classification_report': classification_report(y_test, y_pred),
-            'confusion_matrix': confusion_matrix(y_test, y_pred)
+    def build_churn_model(self, params=None, n_jobs=N_JOBS, cv_folds=0):
+        """
+        Construir modelo predictivo de churn (RandomForest + StandardScaler).
+        El modelo se guarda en disco (churn_model.py) y solo se reentrena si
+        cambian los datos o los hiperparámetros. Los árboles (y los folds de
+        la validación cruzada, si cv_folds > 1) se entrenan en n_jobs núcleos.
+        """
+        churn_model = load_or_train(self.df, params, n_jobs=n_jobs)
+        
+        results = {
+            'model': churn_model.model,
+            'scaler': churn_model.scaler,
+            'feature_importance': churn_model.feature_importance,
+            'classification_report': churn_model.classification_report,
+            'confusion_matrix': churn_model.confusion_matrix
         }
+        if cv_folds > 1:
+            results['cv_scores'] = cross_validate_churn_model(self.df, params, folds=cv_folds, n_jobs=n_jobs)
+        return results
     
     def generate_insights(self):
         """Generar insights clave"""
@@ -183,18 +166,23 @@ class TelecomAnalyzer:
         
         return insights
 
-def main():
-    """Función principal para ejecutar análisis"""
-    print("🔍 Iniciando Análisis Avanzado de Datos de Telecomunicaciones")
-    print("=" * 60)
-    
-    # Analizar ambos datasets
-    datasets = {
-        'Dataset Pequeño': 'Data/churn-bigml-20.csv',
-        'Dataset Grande': 'Data/churn-bigml-80.csv'
-    }
+# Datasets que analiza main()
+DATASETS = {
+    'Dataset Pequeño': 'Data/churn-bigml-20.csv',
+    'Dataset Grande': 'Data/churn-bigml-80.csv'
+}
+
+def analyze_dataset(name, path, n_jobs=N_JOBS, cv_folds=CV_FOLDS):
+    """
+    Analizar un dataset completo. Se ejecuta en un proceso del pool de main(),
+    por eso devuelve el texto del reporte en lugar de imprimirlo.
     
-    for name, path in datasets.items():
+    Returns:
+        tuple: (texto del reporte, segundos que tardó)
+    """
+    start = time.perf_counter()
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
         print(f"\n📊 Analizando {name}")
         print("-" * 40)
         
@@ -225,17 +213,66 @@ def main():
             
             # Modelo predictivo
             print(f"\n🤖 Construyendo Modelo Predictivo...")
-            model_results = analyzer.build_churn_model()
+            model_results = analyzer.build_churn_model(n_jobs=n_jobs, cv_folds=cv_folds)
             print(f"   • Features más importantes:")
             top_features = model_results['feature_importance'].head(5)
             for _, row in top_features.iterrows():
                 print(f"     - {row['feature']}: {row['importance']:.3f}")
+            if 'cv_scores' in model_results:
+                cv_scores = model_results['cv_scores']
+                print(f"   • Validación cruzada ({cv_folds} folds): "
+                      f"accuracy {cv_scores['accuracy'].mean():.3f} ± {cv_scores['accuracy'].std():.3f}, "
+                      f"ROC AUC {cv_scores['roc_auc'].mean():.3f} ± {cv_scores['roc_auc'].std():.3f}")
             
         except Exception as e:
             print(f"❌ Error analizando {name}: {str(e)}")
     
-    print(f"\n✅ Análisis completado!")
+    return output.getvalue(), time.perf_counter() - start
+
+def main(workers=None, n_jobs=None, cv_folds=CV_FOLDS):
+    """
+    Función principal para ejecutar análisis.
+    
+    Args:
+        workers (int): Procesos del pool (uno por dataset; por defecto
+            tantos como datasets, sin superar los núcleos disponibles)
+        n_jobs (int): Núcleos de cada proceso para árboles y folds (por
+            defecto se reparten los núcleos entre los procesos)
+        cv_folds (int): Folds de la validación cruzada (0 para omitirla)
+    """
+    print("🔍 Iniciando Análisis Avanzado de Datos de Telecomunicaciones")
+    print("=" * 60)
+    
+    cpus = os.cpu_count() or 1
+    workers = workers or min(len(DATASETS), cpus)
+    n_jobs = n_jobs or max(cpus // workers, 1)
+    print(f"⚙️  {workers} proceso(s) x {n_jobs} núcleo(s) por proceso")
+    
+    start = time.perf_counter()
+    # Analizar los datasets en paralelo (un proceso por dataset) e imprimir
+    # los reportes en el orden original
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(analyze_dataset, name, path, n_jobs, cv_folds)
+                       for name, path in DATASETS.items()]
+            results = [future.result() for future in futures]
+    else:
+        results = [analyze_dataset(name, path, n_jobs, cv_folds) for name, path in DATASETS.items()]
+    
+    for name, (report, elapsed) in zip(DATASETS, results):
+        print(report, end='')
+        print(f"   ⏱️  {name}: {elapsed:.1f} s")
+    
+    print(f"\n✅ Análisis completado en {time.perf_counter() - start:.1f} s!")
     print("=" * 60)
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Análisis avanzado de los datasets de churn")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Procesos en paralelo (uno por dataset)")
+    parser.add_argument('--n-jobs', type=int, default=None,
+                        help="Núcleos por proceso para entrenar y validar")
+    parser.add_argument('--cv-folds', type=int, default=CV_FOLDS,
+                        help="Folds de la validación cruzada (0 para omitirla)")
+    args = parser.parse_args()
+    main(workers=args.workers, n_jobs=args.n_jobs, cv_folds=args.cv_folds)
@@ -22,10 +22,15 @@ import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import numpy as np
-from sklearn.preprocessing import StandardScaler
-from sklearn.decomposition import PCA
 import warnings
 import time
+from flask import request, jsonify
+from churn_data import DATASETS, register_dataset, get_dataset
+from churn_model import churn_models
+from figure_cache import cached_figure
+from scatter_traces import scatter_traces
+from pca_service import pca_service
+from running_correlation import correlation_service
 warnings.filterwarnings('ignore')
 
 # =============================================================================
@@ -168,8 +173,8 @@ dashboard_content = html.Div([
     ),
     # Contenido del dashboard con fondo semi-transparente
     dbc.Container([
-        # Store para datos
-        dcc.Store(id='data-store', data=[]),
+        # Store con la referencia al dataset (los datos quedan en el servidor)
+        dcc.Store(id='data-store', data={}),
         
         # Selector de dataset (solo visible en la pestaña Dashboard)
         dbc.Row([
@@ -644,37 +649,28 @@ def switch_tab(active_tab):
 # =====================================================================
 # Este callback se ejecuta cuando se selecciona un dataset diferente
 @callback(
-    Output('data-store', 'data'),           # Output: almacena los datos en el store
+    Output('data-store', 'data'),           # Output: referencia al dataset en el servidor
     Input('dataset-selector', 'value'),     # Input: valor seleccionado en el dropdown
     prevent_initial_call=False              # Se ejecuta también al cargar la página
 )
 def load_initial_data(dataset):
     """
-    Carga los datos del CSV seleccionado y los prepara para el análisis.
+    Registra el dataset seleccionado en memoria del servidor y devuelve solo su
+    referencia, para no enviar el CSV completo al navegador.
     
     Args:
         dataset (str): 'churn-20' o 'churn-80'
     
     Returns:
-        list: Lista de diccionarios con los datos del CSV
+        dict: Referencia {'key', 'version', 'rows'} del dataset registrado
     """
     try:
-        # Cargar el archivo CSV según la selección
-        if dataset == 'churn-20':
-            df = pd.read_csv('Data/churn-bigml-20.csv')
-        else:
-            df = pd.read_csv('Data/churn-bigml-80.csv')
-        
-        # Convertir columnas booleanas de 'Yes'/'No' a True/False
-        df['International plan'] = df['International plan'].map({'Yes': True, 'No': False})
-        df['Voice mail plan'] = df['Voice mail plan'].map({'Yes': True, 'No': False})
-        df['Churn'] = df['Churn'].map({True: 'Yes', False: 'No'})  # Convertir a español
-        
-        print(f"✅ Datos cargados: {len(df)} registros")
-        return df.to_dict('records')  # Convertir DataFrame a lista de diccionarios
+        ref = register_dataset(dataset if dataset == 'churn-20' else 'churn-80')
+        print(f"✅ Datos cargados: {ref['rows']} registros")
+        return ref
     except Exception as e:
         print(f"❌ Error cargando datos: {e}")
-        return []
+        return {}
 
 # =====================================================================
 # CALLBACK 5: ACTUALIZACIÓN DE MÉTRICAS PRINCIPALES
@@ -687,12 +683,13 @@ def load_initial_data(dataset):
      Output('avg-customer-service', 'children')],     # Llamadas promedio
     [Input('data-store', 'data')]                     # Input: datos del store
 )
+@cached_figure
 def update_metrics(data):
     """
     Calcula y actualiza las métricas principales del dashboard.
     
     Args:
-        data (list): Lista de diccionarios con los datos de clientes
+        data (dict): Referencia al dataset registrado en el servidor
     
     Returns:
         tuple: 4 valores con las métricas calculadas
@@ -700,7 +697,7 @@ def update_metrics(data):
     if not data:  # Si no hay datos, retornar valores por defecto
         return "0", "0%", "0", "0"
     
-    df = pd.DataFrame(data)  # Convertir lista a DataFrame
+    df = get_dataset(data)  # DataFrame compartido (solo lectura)
     
     # Calcular métricas
     total_customers = len(df)  # Número total de clientes
@@ -718,12 +715,13 @@ def update_metrics(data):
     Output('churn-distribution', 'figure'),  # Output: gráfico de dona
     [Input('data-store', 'data')]            # Input: datos del store
 )
+@cached_figure
 def update_churn_distribution(data):
     """
     Crea un gráfico de dona que muestra la distribución de churn.
     
     Args:
-        data (list): Lista de diccionarios con los datos de clientes
+        data (dict): Referencia al dataset registrado en el servidor
     
     Returns:
         go.Figure: Gráfico de dona de Plotly
@@ -731,7 +729,7 @@ def update_churn_distribution(data):
     if not data:
         return go.Figure()  # Gráfico vacío si no hay datos
     
-    df = pd.DataFrame(data)
+    df = get_dataset(data)
     churn_counts = df['Churn'].value_counts()  # Contar Sí/No churn
     
     # Crear gráfico de dona (pie chart con agujero)
@@ -762,12 +760,13 @@ def update_churn_distribution(data):
     Output('churn-by-state', 'figure'),     # Output: gráfico de barras
     [Input('data-store', 'data')]           # Input: datos del store
 )
+@cached_figure
 def update_churn_by_state(data):
     """
     Crea un gráfico de barras horizontales con la tasa de churn por estado.
     
     Args:
-        data (list): Lista de diccionarios con los datos de clientes
+        data (dict): Referencia al dataset registrado en el servidor
     
     Returns:
         go.Figure: Gráfico de barras horizontales de Plotly
@@ -775,11 +774,13 @@ def update_churn_by_state(data):
     if not data:
         return go.Figure()
     
-    df = pd.DataFrame(data)
+    df = get_dataset(data)
     
     # Calcular tasa de churn por estado y ordenar de mayor a menor
-    state_churn = df.groupby('State')['Churn'].apply(
-        lambda x: (x == 'Yes').mean() * 100  # Porcentaje de churn por estado
+    # (State es categórica: el groupby trabaja sobre los códigos enteros)
+    is_churn = df['Churn'] == 'Yes'
+    state_churn = (
+        is_churn.groupby(df['State'], observed=True).mean() * 100  # Porcentaje de churn por estado
     ).sort_values(ascending=False).head(15)  # Top 15 estados
     
     # Crear gráfico de barras horizontales
@@ -811,12 +812,13 @@ def update_churn_by_state(data):
     Output('usage-analysis', 'figure'),     # Output: gráfico con 4 subplots
     [Input('data-store', 'data')]           # Input: datos del store
 )
+@cached_figure
 def update_usage_analysis(data):
     """
     Crea 4 subplots que analizan el uso de servicios por período del día.
     
     Args:
-        data (list): Lista de diccionarios con los datos de clientes
+        data (dict): Referencia al dataset registrado en el servidor
     
     Returns:
         go.Figure: Gráfico con 4 subplots de Plotly
@@ -824,7 +826,7 @@ def update_usage_analysis(data):
     if not data:
         return go.Figure()
     
-    df = pd.DataFrame(data)
+    df = get_dataset(data)
     
     # Crear subplots: 2 filas x 2 columnas
     fig = make_subplots(
@@ -900,12 +902,13 @@ def update_usage_analysis(data):
     Output('services-impact', 'figure'),    # Output: gráfico con 4 subplots
     [Input('data-store', 'data')]           # Input: datos del store
 )
+@cached_figure
 def update_services_impact(data):
     """
     Crea 4 subplots que analizan el impacto de servicios en el churn.
     
     Args:
-        data (list): Lista de diccionarios con los datos de clientes
+        data (dict): Referencia al dataset registrado en el servidor
     
     Returns:
         go.Figure: Gráfico con 4 subplots de Plotly
@@ -913,7 +916,7 @@ def update_services_impact(data):
     if not data:
         return go.Figure()
     
-    df = pd.DataFrame(data)
+    df = get_dataset(data)
     
     # Crear subplots: 2 filas x 2 columnas
     fig = make_subplots(
@@ -925,9 +928,8 @@ def update_services_impact(data):
     )
     
     # SUBPLOT 1: Plan Internacional vs Churn
-    intl_churn = df.groupby('International plan')['Churn'].apply(
-        lambda x: (x == 'Yes').mean() * 100  # Tasa de churn por plan internacional
-    )
+    is_churn = df['Churn'] == 'Yes'
+    intl_churn = is_churn.groupby(df['International plan']).mean() * 100  # Tasa de churn por plan internacional
     
     fig.add_trace(
         go.Bar(x=intl_churn.index, y=intl_churn.values,
@@ -938,9 +940,7 @@ def update_services_impact(data):
     )
     
     # SUBPLOT 2: Buzón de Voz vs Churn
-    vmail_churn = df.groupby('Voice mail plan')['Churn'].apply(
-        lambda x: (x == 'Yes').mean() * 100  # Tasa de churn por buzón de voz
-    )
+    vmail_churn = is_churn.groupby(df['Voice mail plan']).mean() * 100  # Tasa de churn por buzón de voz
     
     fig.add_trace(
         go.Bar(x=vmail_churn.index, y=vmail_churn.values,
@@ -981,12 +981,13 @@ def update_services_impact(data):
     Output('correlation-matrix', 'figure'),  # Output: heatmap de correlación
     [Input('data-store', 'data')]            # Input: datos del store
 )
+@cached_figure
 def update_correlation_matrix(data):
     """
     Crea un heatmap que muestra las correlaciones entre todas las variables numéricas.
     
     Args:
-        data (list): Lista de diccionarios con los datos de clientes
+        data (dict): Referencia al dataset registrado en el servidor
     
     Returns:
         go.Figure: Heatmap de correlación de Plotly
@@ -994,22 +995,10 @@ def update_correlation_matrix(data):
     if not data:
         return go.Figure()
     
-    df = pd.DataFrame(data)
-    
-    # Seleccionar variables numéricas para el análisis de correlación
-    numeric_cols = ['Account length', 'Number vmail messages', 'Total day minutes',
-                   'Total day calls', 'Total day charge', 'Total eve minutes',
-                   'Total eve calls', 'Total eve charge', 'Total night minutes',
-                   'Total night calls', 'Total night charge', 'Total intl minutes',
-                   'Total intl calls', 'Total intl charge', 'Customer service calls']
-    
-    # Convertir variables booleanas a numéricas para incluir en la correlación
-    df['International plan'] = df['International plan'].astype(int)
-    df['Voice mail plan'] = df['Voice mail plan'].astype(int)
-    df['Churn'] = (df['Churn'] == 'Yes').astype(int)
-    
-    # Calcular matriz de correlación
-    corr_matrix = df[numeric_cols + ['International plan', 'Voice mail plan', 'Churn']].corr()
+    # Calcular matriz de correlación de todas las variables numéricas (las
+    # booleanas como 0/1) desde las sumas acumuladas del dataset: una versión
+    # nueva que solo agrega filas al final suma únicamente esas filas
+    corr_matrix = correlation_service.correlation(data)
     
     # Crear heatmap
     fig = go.Figure(data=go.Heatmap(
@@ -1040,12 +1029,13 @@ def update_correlation_matrix(data):
     Output('pca-analysis', 'figure'),       # Output: gráfico de dispersión 2D
     [Input('data-store', 'data')]           # Input: datos del store
 )
+@cached_figure
 def update_pca_analysis(data):
     """
     Realiza análisis de componentes principales (PCA) para visualizar clientes en 2D.
     
     Args:
-        data (list): Lista de diccionarios con los datos de clientes
+        data (dict): Referencia al dataset registrado en el servidor
     
     Returns:
         go.Figure: Gráfico de dispersión 2D con clientes coloreados por churn
@@ -1053,56 +1043,42 @@ def update_pca_analysis(data):
     if not data:
         return go.Figure()
     
-    df = pd.DataFrame(data)
-    
-    # Preparar datos para PCA: seleccionar características numéricas
-    features = ['Account length', 'Number vmail messages', 'Total day minutes',
-               'Total day calls', 'Total day charge', 'Total eve minutes',
-               'Total eve calls', 'Total eve charge', 'Total night minutes',
-               'Total night calls', 'Total night charge', 'Total intl minutes',
-               'Total intl calls', 'Total intl charge', 'Customer service calls']
+    df = get_dataset(data)
     
-    # Convertir variables booleanas a numéricas
-    df['International plan'] = df['International plan'].astype(int)
-    df['Voice mail plan'] = df['Voice mail plan'].astype(int)
-    df['Churn'] = (df['Churn'] == 'Yes').astype(int)
-    
-    # Agregar variables booleanas a las características
-    features.extend(['International plan', 'Voice mail plan', 'Churn'])
-    
-    # Aplicar PCA: normalizar datos y reducir a 2 dimensiones
-    scaler = StandardScaler()  # Normalizar datos (media=0, desv=1)
-    scaled_data = scaler.fit_transform(df[features])
-    
-    pca = PCA(n_components=2)  # Reducir a 2 componentes principales
-    pca_result = pca.fit_transform(scaled_data)
+    # Componentes y coordenadas de cada cliente: el modelo (StandardScaler +
+    # PCA a 2 dimensiones) se ajusta una sola vez por versión del dataset
+    pca, pca_result = pca_service.get(data)
     
     # Crear figura
     fig = go.Figure()
     
-    # Colorear puntos por churn: verde para no churn (0), rojo para churn (1)
-    colors = ['#28a745' if x == 0 else '#dc3545' for x in df['Churn']]
+    # Colorear puntos por churn con el propio 0/1 y una escala de dos colores:
+    # verde para no churn (0), rojo para churn (1)
+    churn = (df['Churn'] == 'Yes').to_numpy().astype(int)
+    churn_colorscale = [[0, '#28a745'], [1, '#dc3545']]
     
     # Agregar scatter plot
-    fig.add_trace(go.Scatter(
-        x=pca_result[:, 0],                    # Componente principal 1
-        y=pca_result[:, 1],                    # Componente principal 2
-        mode='markers',                        # Modo de puntos
+    # (WebGL o densidad por clase si hay muchos clientes, ver scatter_traces.py)
+    fig.add_traces(scatter_traces(
+        pca_result[:, 0],                      # Componente principal 1
+        pca_result[:, 1],                      # Componente principal 2
         marker=dict(
-            color=colors,                      # Colores según churn
+            color=churn,                       # Colores según churn
+            colorscale=churn_colorscale,
+            cmin=0, cmax=1,
             size=8,                            # Tamaño de puntos
             opacity=0.7                        # Transparencia
         ),
-        text=[f"Cliente {i+1}<br>Churn: {'Yes' if df['Churn'].iloc[i] else 'No'}" 
-              for i in range(len(df))],        # Texto del hover
-        hovertemplate='%{text}<extra></extra>' # Formato del hover
+        customdata=np.arange(1, len(df) + 1),  # Número de cliente
+        text=np.where(churn == 1, 'Yes', 'No'),
+        hovertemplate='Cliente %{customdata}<br>Churn: %{text}<extra></extra>' # Formato del hover
     ))
     
     # Configurar el layout
     fig.update_layout(
         title="PCA Analysis",
-        xaxis_title=f"Principal Component 1 ({pca.explained_variance_ratio_[0]*100:.1f}%)",
-        yaxis_title=f"Principal Component 2 ({pca.explained_variance_ratio_[1]*100:.1f}%)",
+        xaxis_title=f"Principal Component 1 ({pca.explained_variance_ratio[0]*100:.1f}%)",
+        yaxis_title=f"Principal Component 2 ({pca.explained_variance_ratio[1]*100:.1f}%)",
         height=500,
         margin=dict(t=50, b=50, l=50, r=50)
     )
@@ -1115,6 +1091,39 @@ def update_pca_analysis(data):
 # Configurar el servidor para despliegue en producción
 server = app.server
 
+# Endpoint de scoring en lote: POST /api/churn-score con
+#   {"dataset": "churn-80", "customers": [{columna: valor, ...}, ...]}
+# devuelve la probabilidad de churn de cada cliente. El modelo de cada dataset
+# se carga desde disco (o se entrena) la primera vez que se pide.
+@server.route('/api/churn-score', methods=['POST'])
+def churn_score():
+    """Puntúa un lote de clientes con el modelo persistido del dataset"""
+    payload = request.get_json(silent=True) or {}
+    dataset = payload.get('dataset', 'churn-80')
+    if dataset not in DATASETS:
+        return jsonify({'error': f"Dataset desconocido: {dataset}"}), 400
+    
+    customers = payload.get('customers')
+    if not isinstance(customers, list) or not all(isinstance(row, dict) for row in customers):
+        return jsonify({'error': "'customers' debe ser una lista de objetos {columna: valor}"}), 400
+    if not customers:
+        return jsonify({'error': "La lista 'customers' está vacía"}), 400
+    
+    customers = pd.DataFrame(customers)
+    model = churn_models.get(dataset)
+    missing = [col for col in model.features if col not in customers.columns]
+    if missing:
+        return jsonify({'error': f"Faltan columnas: {', '.join(missing)}"}), 400
+    
+    try:
+        scores = model.score(customers)
+    except ValueError as exc:
+        return jsonify({'error': str(exc)}), 400
+    return jsonify({
+        'model': model.key,
+        'churn_probability': scores.round(4).tolist()
+    })
+
 # Ejecutar la aplicación en modo desarrollo
 if __name__ == '__main__':
     app.run_server(
@@ -0,0 +1,252 @@
+# =============================================================================
+# AGREGADOS PRECALCULADOS PARA EL DASHBOARD DE BILLING
+# =============================================================================
+# Los callbacks de las pestañas VIP, Department, Product y Complaints hacían
+# su propio groupby/last/agg sobre las tablas completas en cada activación.
+# Este módulo materializa esos rollups una sola vez al cargar los datos:
+#
+#   - último registro por cliente VIP / departamento / producto
+#   - totales diarios por departamento y por producto
+#   - promedios diarios de uso VIP
+#   - quejas y resoluciones por día, por tipo/prioridad y por departamento
+#   - sumas y conteos por tabla para las tarjetas de KPIs
+#
+# Todos los agregados se guardan en forma aditiva (sumas, conteos, último
+# valor), de modo que update() incorpora filas nuevas combinando solo el
+# agregado de esas filas con el existente, sin volver a recorrer la tabla.
+# updated() hace lo mismo sobre una copia, para publicar los agregados nuevos
+# junto con el snapshot de las tablas (ver data_snapshot.py) sin modificar los
+# que están leyendo los callbacks; rebuilt() recalcula en una copia los de
+# una tabla cuyas filas se reemplazan (clientes por customer_id). Los
+# promedios se derivan al consultar (suma / conteo).
+# =============================================================================
+
+import copy
+import threading
+
+import pandas as pd
+
+# Tablas con "último registro por entidad" y la columna que las identifica
+LATEST_KEYS = {
+    'vip_customers': 'customer_id',
+    'departments': 'department',
+    'products': 'product',
+}
+
+# Tablas con totales diarios de facturación por entidad
+DAILY_KEYS = {
+    'departments': 'department',
+    'products': 'product',
+}
+
+# Columnas de uso VIP que se promedian por día
+VIP_USAGE_COLUMNS = ['voice_usage_minutes', 'data_usage_gb', 'monthly_bill']
+
+
+def _merge_sum(old, new):
+    """Combina dos agregados aditivos (sumas o conteos) alineando por índice"""
+    if old is None:
+        return new
+    return old.add(new, fill_value=0).astype(new.dtypes if isinstance(new, pd.DataFrame) else new.dtype)
+
+
+def _merge_last(old, new):
+    """Combina dos tablas de "último registro por clave" (gana la más reciente)"""
+    combined = new if old is None else pd.concat([old, new])
+    return combined.groupby(level=0, observed=True).last()
+
+
+class BillingAggregates:
+    """Rollups de las tablas de billing, construidos una vez y actualizables"""
+
+    def __init__(self, data):
+        """
+        Args:
+            data (dict): Tablas generadas por load_synthetic_data()
+        """
+        self._lock = threading.Lock()
+        self._latest = {}
+        self._entities = {}
+        self._daily = {}
+        self._sums = {}
+        self._rows = {}
+        self._vip_daily_sum = None
+        self._vip_daily_count = None
+        self._complaints_daily = None
+        self._resolutions_daily = None
+        self._resolved = 0
+        self._type_priority = None
+        self._dept_complaints = None
+
+        for table, df in data.items():
+            self.update(table, df)
+
+    # -------------------------------------------------------------------------
+    # Construcción / actualización incremental
+    # -------------------------------------------------------------------------
+    def update(self, table, rows):
+        """
+        Incorpora filas nuevas de una tabla a los agregados.
+
+        Args:
+            table (str): Nombre de la tabla ('departments', 'complaints', ...)
+            rows (pd.DataFrame): Solo las filas nuevas (ya agregadas a data[table])
+        """
+        if rows.empty:
+            return
+
+        with self._lock:
+            # Sumas por columna conservando el tipo (int para conteos, float para montos)
+            numeric = rows.select_dtypes('number')
+            sums = pd.Series({col: numeric[col].sum() for col in numeric.columns}, dtype=object)
+            self._sums[table] = _merge_sum(self._sums.get(table), sums)
+            self._rows[table] = self._rows.get(table, 0) + len(rows)
+
+            if table in LATEST_KEYS:
+                key = LATEST_KEYS[table]
+                latest = rows.groupby(key, observed=True, sort=False).last()
+                self._latest[table] = _merge_last(self._latest.get(table), latest)
+                seen = self._entities.setdefault(table, [])
+                seen.extend(e for e in rows[key].unique() if e not in seen)
+
+            if table in DAILY_KEYS:
+                key = DAILY_KEYS[table]
+                daily = rows.groupby([key, 'date'], observed=False)['billed_amount'].sum()
+                self._daily[table] = _merge_sum(self._daily.get(table), daily)
+
+            if table == 'vip_customers':
+                by_date = rows.groupby('date')
+                self._vip_daily_sum = _merge_sum(self._vip_daily_sum, by_date[VIP_USAGE_COLUMNS].sum())
+                self._vip_daily_count = _merge_sum(self._vip_daily_count, by_date.size())
+
+            if table == 'complaints':
+                self._update_complaints(rows)
+
+    def updated(self, table, rows):
+        """
+        Copia de los agregados con filas nuevas incorporadas; la original no
+        cambia (los agregados guardados se reemplazan, nunca se modifican).
+
+        Returns:
+            BillingAggregates: Agregados con las filas de 'rows'
+        """
+        aggregates = self._copy()
+        aggregates.update(table, rows)
+        return aggregates
+
+    def rebuilt(self, table, df):
+        """
+        Copia de los agregados con los de una tabla recalculados desde df
+        (para tablas cuyas filas se reemplazan, p. ej. clientes por
+        customer_id, donde sumar las filas nuevas no alcanza); las demás
+        tablas se comparten sin recalcular.
+
+        Returns:
+            BillingAggregates: Agregados con la tabla 'table' igual a df
+        """
+        aggregates = self._copy()
+        for rollup in (aggregates._sums, aggregates._rows, aggregates._latest,
+                       aggregates._entities, aggregates._daily):
+            rollup.pop(table, None)
+        if table == 'vip_customers':
+            aggregates._vip_daily_sum = aggregates._vip_daily_count = None
+        if table == 'complaints':
+            aggregates._complaints_daily = aggregates._resolutions_daily = None
+            aggregates._type_priority = aggregates._dept_complaints = None
+            aggregates._resolved = 0
+        aggregates.update(table, df)
+        return aggregates
+
+    def _copy(self):
+        """Copia cuyos diccionarios de agregados se pueden modificar sin afectar a esta"""
+        with self._lock:
+            aggregates = copy.copy(self)
+            aggregates._lock = threading.Lock()
+            aggregates._latest = dict(self._latest)
+            aggregates._entities = {name: list(seen) for name, seen in self._entities.items()}
+            aggregates._daily = dict(self._daily)
+            aggregates._sums = dict(self._sums)
+            aggregates._rows = dict(self._rows)
+        return aggregates
+
+    def _update_complaints(self, rows):
+        resolved = rows[rows['status'] == 'Resolved']
+        self._resolved += len(resolved)
+        self._complaints_daily = _merge_sum(
+            self._complaints_daily, rows.groupby(rows['complaint_date'].dt.date).size()
+        )
+        self._resolutions_daily = _merge_sum(
+            self._resolutions_daily, resolved.groupby(resolved['resolution_date'].dt.date).size()
+        )
+        self._type_priority = _merge_sum(
+            self._type_priority, pd.crosstab(rows['complaint_type'], rows['priority'])
+        )
+        dept = rows.groupby('department', observed=False).agg({
+            'complaint_id': 'count',
+            'resolution_time_days': 'sum',
+            'customer_satisfaction': 'sum'
+        })
+        self._dept_complaints = _merge_sum(self._dept_complaints, dept)
+
+    # -------------------------------------------------------------------------
+    # Consultas (lo que usan los callbacks)
+    # -------------------------------------------------------------------------
+    def total(self, table, column):
+        """Suma de una columna numérica de la tabla"""
+        return self._sums[table][column]
+
+    def mean(self, table, column):
+        """Promedio de una columna numérica de la tabla"""
+        return self._sums[table][column] / self._rows[table]
+
+    def rows(self, table):
+        """Cantidad de filas de la tabla"""
+        return self._rows[table]
+
+    def entities(self, table):
+        """Entidades de la tabla en orden de aparición (como df[key].unique())"""
+        return list(self._entities[table])
+
+    def latest(self, table):
+        """Último registro de cada entidad (equivale a groupby(key).last())"""
+        latest = self._latest[table]
+        # Como groupby(key).last() sobre la tabla completa: las categorías sin
+        # registros aparecen con NaN (solo entonces se pierde el tipo entero)
+        if isinstance(latest.index, pd.CategoricalIndex) and len(latest) < len(latest.index.categories):
+            latest = latest.groupby(level=0, observed=False).last()
+        return latest.reset_index()
+
+    def daily_billing(self, table):
+        """Facturación diaria por entidad: columnas [key, 'date', 'billed_amount']"""
+        return self._daily[table].reset_index()
+
+    def vip_daily_usage(self):
+        """Uso promedio diario de los clientes VIP"""
+        return self._vip_daily_sum.div(self._vip_daily_count, axis=0).reset_index()
+
+    def resolved_count(self):
+        """Cantidad de quejas resueltas"""
+        return self._resolved
+
+    def complaints_timeline(self):
+        """Quejas y resoluciones por día"""
+        daily_complaints = self._complaints_daily.reset_index()
+        daily_complaints.columns = ['date', 'complaints_count']
+        daily_resolutions = self._resolutions_daily.reset_index()
+        daily_resolutions.columns = ['date', 'resolutions_count']
+        return daily_complaints, daily_resolutions
+
+    def complaints_by_type_priority(self):
+        """Tabla cruzada tipo de queja x prioridad"""
+        return self._type_priority
+
+    def complaints_by_department(self):
+        """Total de quejas, tiempo de resolución y satisfacción promedio por departamento"""
+        dept = self._dept_complaints
+        counts = dept['complaint_id']
+        return pd.DataFrame({
+            'department': dept.index,
+            'total_complaints': counts.values,
+            'avg_resolution_time': (dept['resolution_time_days'] / counts).values,
+            'avg_satisfaction': (dept['customer_satisfaction'] / counts).values
+        })
@@ -15,15 +15,22 @@
 # 1. IMPORTS Y LIBRERÍAS NECESARIAS
 # =============================================================================
 import dash
-from dash import dcc, html, Input, Output, callback
+from dash import dcc, html, Input, Output, State, Patch, callback
+from dash.exceptions import PreventUpdate
 import dash_bootstrap_components as dbc
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import numpy as np
-from datetime import datetime, timedelta
-import random
+from synthetic_data import load_synthetic_data, real_time_rows, network_rows
+from billing_aggregates import BillingAggregates
+from customer_churn import CustomerChurnScorer, load_or_compute_out_of_fold_scores, load_or_train_customer_model
+from billing_stream import TimeSeriesStream, STREAMING, STREAM_INTERVAL_MS
+from downsampling import downsample, points_budget
+from bucketing import Bins, Rules, Keywords, bucket_counts
+from data_snapshot import SnapshotStore
+from scatter_traces import scatter_trace
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -46,198 +53,73 @@ app.title = "Billing Operations Dashboard - Charter Spectrum"
 # 3. GENERACIÓN DE DATOS SINTÉTICOS
 # =============================================================================
 
-def generate_synthetic_data():
-    """Genera datos sintéticos para todos los dashboards"""
-    
-    # Configurar semilla para reproducibilidad
-    np.random.seed(42)
-    random.seed(42)
-    
-    # Fechas para los últimos 30 días
-    dates = pd.date_range(start=datetime.now() - timedelta(days=30), end=datetime.now(), freq='H')
-    
-    # =====================================================================
-    # DATOS DE FACTURACIÓN EN TIEMPO REAL
-    # =====================================================================
-    real_time_data = []
-    for date in dates:
-        # Simular variación por hora del día
-        hour_factor = 1 + 0.5 * np.sin(2 * np.pi * date.hour / 24)
-        
-        real_time_data.append({
-            'timestamp': date,
-            'calls_volume': int(1000 + 500 * hour_factor + np.random.normal(0, 100)),
-            'messages_volume': int(5000 + 2000 * hour_factor + np.random.normal(0, 500)),
-            'data_volume_gb': round(100 + 50 * hour_factor + np.random.normal(0, 10), 2),
-            'voice_revenue': round(5000 + 2000 * hour_factor + np.random.normal(0, 500), 2),
-            'data_revenue': round(8000 + 3000 * hour_factor + np.random.normal(0, 800), 2),
-            'total_revenue': round(13000 + 5000 * hour_factor + np.random.normal(0, 1000), 2)
+# La generación está vectorizada en synthetic_data.py (una llamada de NumPy por
+# columna) y se comparte con los generadores de reportes a través de un caché
+# Parquet; aquí solo se fija la escala que usa el dashboard.
+
+# Cargar datos (30 días con granularidad horaria, 1000 clientes)
+data = load_synthetic_data(seed=42, days=30, freq='h', n_customers=1000)
+
+# Riesgo de churn de cada cliente según un modelo guardado en disco (ver
+# customer_churn.py): los clientes del entrenamiento muestran scores fuera de
+# muestra (también en caché) y luego solo se puntúan los nuevos o modificados
+churn_scorer = CustomerChurnScorer(load_or_train_customer_model(data['customers']))
+churn_scorer.prime(data['customers'], load_or_compute_out_of_fold_scores(data['customers']))
+data['customers'] = churn_scorer.score_frame(data['customers'])
+
+# Tablas en snapshots inmutables (ver data_snapshot.py): los callbacks piden
+# el snapshot vigente y reciben vistas de solo lectura; las columnas derivadas
+# se calculan una vez por snapshot y los datos nuevos se publican de forma
+# atómica. 'data' queda solo como la carga inicial.
+#
+# Rollups por departamento, producto, cliente VIP y día (ver billing_aggregates.py):
+# se calculan una vez sobre las tablas congeladas y viajan con el snapshot
+# (snapshot.companions['aggregates']), así cada callback ve tablas y agregados
+# de la misma versión
+snapshots = SnapshotStore(data, lambda snapshot: {'aggregates': BillingAggregates(snapshot.tables())})
+
+
+def append_rows(table, rows):
+    """
+    Agrega filas nuevas a una tabla y publica, en un solo paso, el snapshot
+    nuevo con los agregados actualizados de forma incremental. Los clientes
+    se reemplazan por customer_id (en su misma posición): las filas de
+    clientes existentes actualizan sus datos y su score, y sus agregados se
+    recalculan desde la tabla nueva.
+    """
+    if table == 'customers':
+        return snapshots.upsert(table, churn_scorer.score_frame(rows), 'customer_id', lambda snapshot: {
+            'aggregates': snapshot.companions['aggregates'].rebuilt(table, snapshot.table(table))
         })
-    
-    real_time_df = pd.DataFrame(real_time_data)
-    
-    # =====================================================================
-    # DATOS DE CLIENTES VIP
-    # =====================================================================
-    vip_customers = []
-    customer_ids = [f'VIP_{i:03d}' for i in range(1, 21)]
-    
-    for customer_id in customer_ids:
-        # Generar datos históricos para cada cliente VIP
-        for i in range(30):
-            date = datetime.now() - timedelta(days=i)
-            vip_customers.append({
-                'customer_id': customer_id,
-                'date': date,
-                'voice_usage_minutes': int(200 + np.random.normal(0, 50)),
-                'data_usage_gb': round(10 + np.random.normal(0, 3), 2),
-                'monthly_bill': round(150 + np.random.normal(0, 30), 2),
-                'pending_amount': round(np.random.uniform(0, 50), 2),
-                'service_level': random.choice(['Premium', 'Enterprise', 'Gold']),
-                'satisfaction_score': round(np.random.uniform(7, 10), 1)
-            })
-    
-    vip_df = pd.DataFrame(vip_customers)
-    
-    # =====================================================================
-    # DATOS DE FACTURACIÓN POR DEPARTAMENTO
-    # =====================================================================
-    departments = ['Sales', 'Marketing', 'Engineering', 'Finance', 'HR', 'Operations', 'Customer Service']
-    dept_data = []
-    
-    for dept in departments:
-        for i in range(30):
-            date = datetime.now() - timedelta(days=i)
-            dept_data.append({
-                'department': dept,
-                'date': date,
-                'billed_amount': round(5000 + np.random.normal(0, 1000), 2),
-                'traffic_volume': int(1000 + np.random.normal(0, 200)),
-                'active_users': int(50 + np.random.normal(0, 10)),
-                'cost_per_user': round(50 + np.random.normal(0, 10), 2),
-                'efficiency_score': round(np.random.uniform(0.7, 1.0), 2)
-            })
-    
-    dept_df = pd.DataFrame(dept_data)
-    
-    # =====================================================================
-    # DATOS DE FACTURACIÓN POR PRODUCTO
-    # =====================================================================
-    products = ['Internet 100Mbps', 'Internet 500Mbps', 'Internet 1Gbps', 'Cable TV Basic', 
-                'Cable TV Premium', 'Phone Line', 'Mobile Plan', 'Bundle Package']
-    product_data = []
-    
-    for product in products:
-        for i in range(30):
-            date = datetime.now() - timedelta(days=i)
-            product_data.append({
-                'product': product,
-                'date': date,
-                'billed_amount': round(10000 + np.random.normal(0, 2000), 2),
-                'subscribers': int(500 + np.random.normal(0, 100)),
-                'revenue_per_subscriber': round(80 + np.random.normal(0, 15), 2),
-                'churn_rate': round(np.random.uniform(0.01, 0.05), 3),
-                'profit_margin': round(np.random.uniform(0.2, 0.4), 2)
-            })
-    
-    product_df = pd.DataFrame(product_data)
-    
-    # =====================================================================
-    # DATOS DE QUEJAS Y RESOLUCIONES
-    # =====================================================================
-    complaint_types = ['Billing Error', 'Service Outage', 'Speed Issues', 'Customer Service', 
-                      'Installation Problem', 'Equipment Issue', 'Contract Dispute']
-    resolution_times = [1, 2, 3, 5, 7, 10, 15]  # días
-    
-    complaints_data = []
-    for i in range(200):
-        complaint_date = datetime.now() - timedelta(days=np.random.randint(1, 30))
-        resolution_date = complaint_date + timedelta(days=random.choice(resolution_times))
-        
-        complaints_data.append({
-            'complaint_id': f'COMP_{i:04d}',
-            'complaint_date': complaint_date,
-            'resolution_date': resolution_date,
-            'complaint_type': random.choice(complaint_types),
-            'priority': random.choice(['Low', 'Medium', 'High', 'Critical']),
-            'resolution_time_days': (resolution_date - complaint_date).days,
-            'customer_satisfaction': random.choice([1, 2, 3, 4, 5]),
-            'department': random.choice(departments),
-            'status': random.choice(['Resolved', 'In Progress', 'Escalated'])
-        })
-    
-    complaints_df = pd.DataFrame(complaints_data)
-    
-    # =====================================================================
-    # DATOS DE ANÁLISIS DE CLIENTES
-    # =====================================================================
-    customer_data = []
-    for i in range(1000):
-        customer_data.append({
-            'customer_id': f'CUST_{i:04d}',
-            'age': np.random.randint(18, 80),
-            'income_level': random.choice(['Low', 'Medium', 'High']),
-            'tenure_months': np.random.randint(1, 120),
-            'monthly_bill': round(50 + np.random.normal(0, 20), 2),
-            'services_count': np.random.randint(1, 5),
-            'churn_risk': round(np.random.uniform(0, 1), 2),
-            'satisfaction_score': round(np.random.uniform(1, 10), 1),
-            'payment_method': random.choice(['Credit Card', 'Bank Transfer', 'Check', 'Auto-Pay']),
-            'region': random.choice(['Northeast', 'Southeast', 'Midwest', 'West'])
-        })
-    
-    customer_df = pd.DataFrame(customer_data)
-    
-    # =====================================================================
-    # DATOS DE ANÁLISIS DE RED
-    # =====================================================================
-    network_data = []
-    for date in dates:
-        network_data.append({
-            'timestamp': date,
-            'traffic_volume_gbps': round(10 + 5 * np.sin(2 * np.pi * date.hour / 24) + np.random.normal(0, 1), 2),
-            'connection_speed_mbps': round(100 + np.random.normal(0, 10), 2),
-            'latency_ms': round(20 + np.random.normal(0, 5), 2),
-            'packet_loss_percent': round(np.random.uniform(0, 2), 3),
-            'uptime_percent': round(99.5 + np.random.normal(0, 0.1), 2),
-            'active_connections': int(50000 + np.random.normal(0, 5000)),
-            'bandwidth_utilization': round(60 + 20 * np.sin(2 * np.pi * date.hour / 24) + np.random.normal(0, 5), 2)
-        })
-    
-    network_df = pd.DataFrame(network_data)
-    
-    # =====================================================================
-    # DATOS DE ANÁLISIS DE OPERACIONES
-    # =====================================================================
-    operations_data = []
-    for i in range(30):
-        date = datetime.now() - timedelta(days=i)
-        operations_data.append({
-            'date': date,
-            'invoices_processed': int(1000 + np.random.normal(0, 100)),
-            'processing_time_minutes': round(5 + np.random.normal(0, 1), 2),
-            'error_rate_percent': round(np.random.uniform(0.1, 2.0), 2),
-            'automation_rate_percent': round(85 + np.random.normal(0, 5), 2),
-            'staff_productivity': round(np.random.uniform(0.8, 1.2), 2),
-            'cost_per_invoice': round(2 + np.random.normal(0, 0.5), 2),
-            'customer_satisfaction': round(np.random.uniform(7, 9), 1)
-        })
-    
-    operations_df = pd.DataFrame(operations_data)
-    
-    return {
-        'real_time': real_time_df,
-        'vip_customers': vip_df,
-        'departments': dept_df,
-        'products': product_df,
-        'complaints': complaints_df,
-        'customers': customer_df,
-        'network': network_df,
-        'operations': operations_df
-    }
+    return snapshots.append(table, rows, lambda snapshot: {
+        'aggregates': snapshot.companions['aggregates'].updated(table, rows)
+    })
+
+# Series real_time y network en ring buffers de capacidad fija (ver
+# billing_stream.py y ring_buffer.py): los callbacks de Real-time Billing y
+# Network Analysis leen de aquí, y en modo streaming crecen con el reloj sin
+# aumentar la memoria. Network conserva toda la historia inicial para sus KPIs.
+real_time_stream = TimeSeriesStream(snapshots.current().table('real_time'), real_time_rows)
+network_stream = TimeSeriesStream(snapshots.current().table('network'), network_rows,
+                                  capacity=len(snapshots.current().table('network')))
 
-# Generar datos
-data = generate_synthetic_data()
+# Período que muestran los gráficos de la pestaña Real-time Billing (por
+# timestamp, no por cantidad de registros: no depende de la frecuencia)
+REALTIME_WINDOW = '24h'
+
+# Botones de rango de los gráficos de tendencia: al elegir un rango (o hacer
+# zoom) se piden los datos de ese rango reducidos al ancho del gráfico
+TREND_RANGE_BUTTONS = [
+    dict(count=24, label="24h", step="hour", stepmode="backward"),
+    dict(count=7, label="7d", step="day", stepmode="backward"),
+    dict(count=30, label="30d", step="day", stepmode="backward")
+]
+
+
+def trend_range_buttons(stream):
+    """Botones de TREND_RANGE_BUTTONS cuyo rango entra en el buffer del stream"""
+    return [button for button in TREND_RANGE_BUTTONS
+            if pd.Timedelta(**{f"{button['step']}s": button['count']}) <= stream.span]
 
 # =============================================================================
 # 4. LAYOUT PRINCIPAL
@@ -329,8 +211,27 @@ main_dashboard = dbc.Container([
 # CONTENIDO DE CADA PESTAÑA
 # =====================================================================
 
+# Cada pestaña incluye un dcc.Store "<tab>-loaded" que solo existe mientras la
+# pestaña está renderizada en 'tab-content'. Los callbacks de la pestaña usan
+# ese store como Input, así que al cambiar de pestaña Dash ejecuta solo los
+# callbacks de la pestaña nueva (en lugar de los ~40 con active_tab).
+def tab_loaded(tab_id):
+    """Store que marca que la pestaña tab_id está renderizada"""
+    return dcc.Store(id=f'{tab_id}-loaded', data=True)
+
+
+def tab_input(tab_id):
+    """Input para los callbacks de una pestaña: se dispara al renderizarla"""
+    return Input(f'{tab_id}-loaded', 'data')
+
 # 1. REAL-TIME BILLING
 real_time_content = html.Div([
+    # Marca de pestaña renderizada (dispara solo los callbacks de esta pestaña)
+    tab_loaded('real-time-tab'),
+    # Modo streaming: el intervalo solo existe mientras la pestaña está abierta y
+    # el store guarda el timestamp del último registro que tiene el navegador
+    dcc.Interval(id='real-time-interval', interval=STREAM_INTERVAL_MS, disabled=not STREAMING),
+    dcc.Store(id='real-time-last'),
     # Imagen de fondo
     html.Img(
         src="/assets/Enterprise_Hero_0.jpg",
@@ -347,6 +248,13 @@ real_time_content = html.Div([
     ),
     # Contenido
     dbc.Container([
+        # Interruptor del modo streaming
+        dbc.Row([
+            dbc.Col([
+                dbc.Switch(id='real-time-live', label="Live streaming", value=STREAMING)
+            ], width="auto")
+        ], justify="end", className="mb-2"),
+        
         # Métricas principales
         dbc.Row([
             dbc.Col([
@@ -434,6 +342,8 @@ real_time_content = html.Div([
 
 # 2. VIP CUSTOMERS
 vip_content = html.Div([
+    # Marca de pestaña renderizada (dispara solo los callbacks de esta pestaña)
+    tab_loaded('vip-tab'),
     # Imagen de fondo
     html.Img(
         src="/assets/Enterprise_Hero_0.jpg",
@@ -537,6 +447,8 @@ vip_content = html.Div([
 
 # 3. DEPARTMENT BILLING
 dept_content = html.Div([
+    # Marca de pestaña renderizada (dispara solo los callbacks de esta pestaña)
+    tab_loaded('dept-tab'),
     # Imagen de fondo
     html.Img(
         src="/assets/Enterprise_Hero_0.jpg",
@@ -640,6 +552,8 @@ dept_content = html.Div([
 
 # 4. PRODUCT BILLING
 product_content = html.Div([
+    # Marca de pestaña renderizada (dispara solo los callbacks de esta pestaña)
+    tab_loaded('product-tab'),
     # Imagen de fondo
     html.Img(
         src="/assets/Enterprise_Hero_0.jpg",
@@ -759,6 +673,8 @@ product_content = html.Div([
 
 # 5. COMPLAINTS & RESOLUTIONS
 complaints_content = html.Div([
+    # Marca de pestaña renderizada (dispara solo los callbacks de esta pestaña)
+    tab_loaded('complaints-tab'),
     # Imagen de fondo
     html.Img(
         src="/assets/Enterprise_Hero_0.jpg",
@@ -878,6 +794,8 @@ complaints_content = html.Div([
 
 # 6. CUSTOMER ANALYSIS
 customer_content = html.Div([
+    # Marca de pestaña renderizada (dispara solo los callbacks de esta pestaña)
+    tab_loaded('customer-tab'),
     # Imagen de fondo
     html.Img(
         src="/assets/Enterprise_Hero_0.jpg",
@@ -997,6 +915,8 @@ customer_content = html.Div([
 
 # 7. NETWORK ANALYSIS
 network_content = html.Div([
+    # Marca de pestaña renderizada (dispara solo los callbacks de esta pestaña)
+    tab_loaded('network-tab'),
     # Imagen de fondo
     html.Img(
         src="/assets/Enterprise_Hero_0.jpg",
@@ -1116,6 +1036,8 @@ network_content = html.Div([
 
 # 8. OPERATIONS ANALYSIS
 operations_content = html.Div([
+    # Marca de pestaña renderizada (dispara solo los callbacks de esta pestaña)
+    tab_loaded('operations-tab'),
     # Imagen de fondo
     html.Img(
         src="/assets/Enterprise_Hero_0.jpg",
@@ -1686,6 +1608,9 @@ app.layout = html.Div([
     # Store para controlar la visibilidad
     dcc.Store(id='loading-state', data={'show_loading': True}),
     
+    # Ancho de la ventana del navegador (presupuesto de puntos de los gráficos)
+    dcc.Store(id='viewport-width'),
+    
     # Intervalo para la animación de puntos suspensivos
     dcc.Interval(
         id='loading-interval',
@@ -1760,21 +1685,8 @@ def switch_tab(active_tab):
     else:
         return index_content
 
-# Callbacks para Real-time Billing
-@callback(
-    [Output('total-revenue', 'children'),
-     Output('calls-volume', 'children'),
-     Output('data-volume', 'children'),
-     Output('messages-volume', 'children')],
-    [Input('tabs', 'active_tab')]
-)
-def update_real_time_metrics(active_tab):
-    if active_tab != "real-time-tab":
-        return "N/A", "N/A", "N/A", "N/A"
-    
-    # Obtener datos de las últimas 24 horas
-    last_24h = data['real_time'].tail(24)
-    
+# Figuras y KPIs para Real-time Billing
+def update_real_time_metrics(last_24h):
     total_revenue = f"${last_24h['total_revenue'].sum():,.0f}"
     calls_volume = f"{last_24h['calls_volume'].sum():,}"
     data_volume = f"{last_24h['data_volume_gb'].sum():,.0f}"
@@ -1782,16 +1694,7 @@ def update_real_time_metrics(active_tab):
     
     return total_revenue, calls_volume, data_volume, messages_volume
 
-@callback(
-    Output('revenue-trends', 'figure'),
-    [Input('tabs', 'active_tab')]
-)
-def update_revenue_trends(active_tab):
-    if active_tab != "real-time-tab":
-        return go.Figure()
-    
-    df = data['real_time'].tail(24)
-    
+def update_revenue_trends(df):
     fig = go.Figure()
     
     fig.add_trace(go.Scatter(
@@ -1824,6 +1727,7 @@ def update_revenue_trends(active_tab):
     fig.update_layout(
         title="Revenue Trends - Last 24 Hours",
         xaxis_title="Time",
+        xaxis=dict(rangeselector=dict(buttons=trend_range_buttons(real_time_stream))),
         yaxis_title="Revenue ($)",
         height=400,
         showlegend=True,
@@ -1832,16 +1736,7 @@ def update_revenue_trends(active_tab):
     
     return fig
 
-@callback(
-    Output('service-usage', 'figure'),
-    [Input('tabs', 'active_tab')]
-)
-def update_service_usage(active_tab):
-    if active_tab != "real-time-tab":
-        return go.Figure()
-    
-    df = data['real_time'].tail(24)
-    
+def update_service_usage(df):
     fig = make_subplots(
         rows=2, cols=2,
         subplot_titles=('Calls Volume', 'Messages Volume', 'Data Volume', 'Revenue per Hour'),
@@ -1881,16 +1776,7 @@ def update_service_usage(active_tab):
     
     return fig
 
-@callback(
-    Output('revenue-distribution', 'figure'),
-    [Input('tabs', 'active_tab')]
-)
-def update_revenue_distribution(active_tab):
-    if active_tab != "real-time-tab":
-        return go.Figure()
-    
-    df = data['real_time'].tail(24)
-    
+def update_revenue_distribution(df):
     voice_total = df['voice_revenue'].sum()
     data_total = df['data_revenue'].sum()
     
@@ -1911,43 +1797,147 @@ def update_revenue_distribution(active_tab):
     
     return fig
 
-# Callbacks para VIP Customers
+# Callback único de la pestaña Real-time Billing: calcula todas sus figuras y KPIs
+# en una sola respuesta, compartiendo los slices de datos entre ellas
 @callback(
-    [Output('total-vip', 'children'),
-     Output('avg-vip-bill', 'children'),
-     Output('vip-satisfaction', 'children'),
-     Output('pending-vip-amount', 'children')],
-    [Input('tabs', 'active_tab')]
+    [Output('total-revenue', 'children'),
+     Output('calls-volume', 'children'),
+     Output('data-volume', 'children'),
+     Output('messages-volume', 'children'),
+     Output('revenue-trends', 'figure'),
+     Output('service-usage', 'figure'),
+     Output('revenue-distribution', 'figure'),
+     Output('real-time-last', 'data')],
+    [tab_input('real-time-tab')],
+    State('viewport-width', 'data')
 )
-def update_vip_metrics(active_tab):
-    if active_tab != "vip-tab":
-        return "N/A", "N/A", "N/A", "N/A"
-    
-    df = data['vip_customers']
-    
-    total_vip = len(df['customer_id'].unique())
-    avg_bill = f"${df['monthly_bill'].mean():.0f}"
-    avg_satisfaction = f"{df['satisfaction_score'].mean():.1f}/10"
-    pending_amount = f"${df['pending_amount'].sum():,.0f}"
-    
-    return total_vip, avg_bill, avg_satisfaction, pending_amount
+def render_real_time_tab(loaded, viewport_width):
+    # Últimas 24 horas: KPIs y torta sobre los datos crudos, series reducidas
+    # al ancho del gráfico
+    last_24h = real_time_stream.last(REALTIME_WINDOW)
+    chart = chart_window(real_time_stream, last_24h, viewport_width, 'total_revenue')
+    
+    return (
+        *update_real_time_metrics(last_24h),
+        update_revenue_trends(chart),
+        update_service_usage(chart),
+        update_revenue_distribution(last_24h),
+        real_time_stream.last_timestamp()
+    )
+
+@callback(
+    Output('real-time-interval', 'disabled'),
+    Input('real-time-live', 'value')
+)
+def toggle_real_time_streaming(live):
+    return not live
 
+# Tick del modo streaming: solo se envían los registros nuevos (extendData con
+# maxPoints) y los valores de KPIs y torta, nunca la figura completa
 @callback(
-    Output('vip-usage-trends', 'figure'),
-    [Input('tabs', 'active_tab')]
+    [Output('revenue-trends', 'extendData'),
+     Output('service-usage', 'extendData'),
+     Output('revenue-distribution', 'figure', allow_duplicate=True),
+     Output('total-revenue', 'children', allow_duplicate=True),
+     Output('calls-volume', 'children', allow_duplicate=True),
+     Output('data-volume', 'children', allow_duplicate=True),
+     Output('messages-volume', 'children', allow_duplicate=True),
+     Output('real-time-last', 'data', allow_duplicate=True)],
+    Input('real-time-interval', 'n_intervals'),
+    State('real-time-last', 'data'),
+    State('viewport-width', 'data'),
+    prevent_initial_call=True
 )
-def update_vip_usage_trends(active_tab):
-    if active_tab != "vip-tab":
-        return go.Figure()
+def stream_real_time_tab(n_intervals, last_timestamp, viewport_width):
+    real_time_stream.advance()
+    # Mismo presupuesto de puntos que el render inicial, sin pasar de la ventana
+    max_points = min(real_time_stream.rows(REALTIME_WINDOW), points_budget(viewport_width))
+    new_rows = real_time_stream.since(last_timestamp).tail(max_points)
+    if new_rows.empty:
+        raise PreventUpdate
+    
+    last_24h = real_time_stream.last(REALTIME_WINDOW)
+    x = new_rows['timestamp']
+    
+    # Mismo orden de trazas que update_revenue_trends / update_service_usage
+    revenue_trends = (
+        dict(x=[x, x, x],
+             y=[new_rows['total_revenue'], new_rows['voice_revenue'], new_rows['data_revenue']]),
+        [0, 1, 2],
+        max_points
+    )
+    service_usage = (
+        dict(x=[x, x, x, x],
+             y=[new_rows['calls_volume'], new_rows['messages_volume'],
+                new_rows['data_volume_gb'], new_rows['total_revenue']]),
+        [0, 1, 2, 3],
+        max_points
+    )
     
-    df = data['vip_customers']
+    # La torta solo cambia sus dos valores
+    revenue_distribution = Patch()
+    revenue_distribution['data'][0]['values'] = [last_24h['voice_revenue'].sum(),
+                                                 last_24h['data_revenue'].sum()]
+    
+    return (
+        revenue_trends,
+        service_usage,
+        revenue_distribution,
+        *update_real_time_metrics(last_24h),
+        real_time_stream.last_timestamp()
+    )
+
+# Ancho del navegador, para dimensionar el downsampling de los gráficos
+app.clientside_callback(
+    "function(state) { return window.innerWidth; }",
+    Output('viewport-width', 'data'),
+    Input('loading-state', 'data')
+)
+
+def chart_window(stream, window, viewport_width, value_column):
+    """Ventana de la serie reducida al ancho del gráfico (ver downsampling.py)"""
+    return downsample(window, points_budget(viewport_width), value_column, rollups=stream.rollup)
+
+def zoom_window(stream, relayout, viewport_width, value_column, default_window):
+    """
+    Datos para el rango pedido con zoom o con los botones de rango, reducidos
+    al ancho del gráfico (ver downsampling.py).
+    """
+    if not relayout:
+        raise PreventUpdate
+    if relayout.get('xaxis.autorange'):
+        # Doble click: volver a la vista por defecto
+        return chart_window(stream, stream.last(default_window), viewport_width, value_column)
+    if 'xaxis.range[0]' in relayout:
+        window = stream.between(relayout['xaxis.range[0]'], relayout['xaxis.range[1]'])
+    elif 'xaxis.range' in relayout:
+        window = stream.between(*relayout['xaxis.range'])
+    else:
+        raise PreventUpdate
+    return chart_window(stream, window, viewport_width, value_column)
+
+@callback(
+    Output('revenue-trends', 'figure', allow_duplicate=True),
+    Input('revenue-trends', 'relayoutData'),
+    State('viewport-width', 'data'),
+    prevent_initial_call=True
+)
+def zoom_revenue_trends(relayout, viewport_width):
+    window = zoom_window(real_time_stream, relayout, viewport_width, 'total_revenue', REALTIME_WINDOW)
+    return update_revenue_trends(window)
+
+# Figuras y KPIs para VIP Customers
+def update_vip_metrics(aggregates):
+    total_vip = len(aggregates.entities('vip_customers'))
+    avg_bill = f"${aggregates.mean('vip_customers', 'monthly_bill'):.0f}"
+    avg_satisfaction = f"{aggregates.mean('vip_customers', 'satisfaction_score'):.1f}/10"
+    pending_amount = f"${aggregates.total('vip_customers', 'pending_amount'):,.0f}"
     
-    # Agrupar por fecha
-    daily_usage = df.groupby('date').agg({
-        'voice_usage_minutes': 'mean',
-        'data_usage_gb': 'mean',
-        'monthly_bill': 'mean'
-    }).reset_index()
+    return total_vip, avg_bill, avg_satisfaction, pending_amount
+
+def update_vip_usage_trends(aggregates):
+    # Promedios diarios precalculados
+    daily_usage = aggregates.vip_daily_usage()
     
     fig = go.Figure()
     
@@ -1980,19 +1970,7 @@ def update_vip_usage_trends(active_tab):
     
     return fig
 
-@callback(
-    Output('vip-performance', 'figure'),
-    [Input('tabs', 'active_tab')]
-)
-def update_vip_performance(active_tab):
-    if active_tab != "vip-tab":
-        return go.Figure()
-    
-    df = data['vip_customers']
-    
-    # Obtener los últimos datos de cada cliente VIP
-    latest_data = df.groupby('customer_id').last().reset_index()
-    
+def update_vip_performance(latest_data):
     # Top 10 clientes por factura mensual
     top_customers = latest_data.nlargest(10, 'monthly_bill')
     
@@ -2019,19 +1997,7 @@ def update_vip_performance(active_tab):
     
     return fig
 
-@callback(
-    Output('vip-service-levels', 'figure'),
-    [Input('tabs', 'active_tab')]
-)
-def update_vip_service_levels(active_tab):
-    if active_tab != "vip-tab":
-        return go.Figure()
-    
-    df = data['vip_customers']
-    
-    # Obtener los últimos datos de cada cliente VIP
-    latest_data = df.groupby('customer_id').last().reset_index()
-    
+def update_vip_service_levels(latest_data):
     # Contar clientes por nivel de servicio
     service_level_counts = latest_data['service_level'].value_counts()
     
@@ -2052,44 +2018,47 @@ def update_vip_service_levels(active_tab):
     
     return fig
 
-# Callbacks para Department Billing
+# Callback único de la pestaña VIP Customers: calcula todas sus figuras y KPIs
+# en una sola respuesta, compartiendo los slices de datos entre ellas
 @callback(
-    [Output('total-dept-billed', 'children'),
-     Output('avg-dept-efficiency', 'children'),
-     Output('total-dept-users', 'children'),
-     Output('avg-cost-per-user', 'children')],
-    [Input('tabs', 'active_tab')]
+    [Output('total-vip', 'children'),
+     Output('avg-vip-bill', 'children'),
+     Output('vip-satisfaction', 'children'),
+     Output('pending-vip-amount', 'children'),
+     Output('vip-usage-trends', 'figure'),
+     Output('vip-performance', 'figure'),
+     Output('vip-service-levels', 'figure')],
+    [tab_input('vip-tab')]
 )
-def update_dept_metrics(active_tab):
-    if active_tab != "dept-tab":
-        return "N/A", "N/A", "N/A", "N/A"
-    
-    df = data['departments']
-    
-    total_billed = f"${df['billed_amount'].sum():,.0f}"
-    avg_efficiency = f"{df['efficiency_score'].mean():.1%}"
-    total_users = f"{df['active_users'].sum():,}"
-    avg_cost = f"${df['cost_per_user'].mean():.0f}"
+def render_vip_tab(loaded):
+    aggregates = snapshots.current().companions['aggregates']
+    # Último registro de cada cliente VIP (compartido)
+    latest_data = aggregates.latest('vip_customers')
+    
+    return (
+        *update_vip_metrics(aggregates),
+        update_vip_usage_trends(aggregates),
+        update_vip_performance(latest_data),
+        update_vip_service_levels(latest_data)
+    )
+
+# Figuras y KPIs para Department Billing
+def update_dept_metrics(aggregates):
+    total_billed = f"${aggregates.total('departments', 'billed_amount'):,.0f}"
+    avg_efficiency = f"{aggregates.mean('departments', 'efficiency_score'):.1%}"
+    total_users = f"{aggregates.total('departments', 'active_users'):,}"
+    avg_cost = f"${aggregates.mean('departments', 'cost_per_user'):.0f}"
     
     return total_billed, avg_efficiency, total_users, avg_cost
 
-@callback(
-    Output('dept-billing-trends', 'figure'),
-    [Input('tabs', 'active_tab')]
-)
-def update_dept_billing_trends(active_tab):
-    if active_tab != "dept-tab":
-        return go.Figure()
-    
-    df = data['departments']
-    
-    # Agrupar por departamento y fecha
-    dept_trends = df.groupby(['department', 'date'])['billed_amount'].sum().reset_index()
+def update_dept_billing_trends(aggregates):
+    # Facturación diaria por departamento (precalculada)
+    dept_trends = aggregates.daily_billing('departments')
     
     fig = go.Figure()
     
     # Agregar una línea por cada departamento
-    departments = df['department'].unique()
+    departments = aggregates.entities('departments')
     colors = ['#007bff', '#28a745', '#ffc107', '#dc3545', '#6f42c1', '#fd7e14', '#20c997']
     
     for i, dept in enumerate(departments):
@@ -2114,19 +2083,7 @@ def update_dept_billing_trends(active_tab):
     
     return fig
 
-@callback(
-    Output('dept-performance', 'figure'),
-    [Input('tabs', 'active_tab')]
-)
-def update_dept_performance(active_tab):
-    if active_tab != "dept-tab":
-        return go.Figure()
-    
-    df = data['departments']
-    
-    # Obtener los últimos datos de cada departamento
-    latest_data = df.groupby('department').last().reset_index()
-    
+def update_dept_performance(latest_data):
     fig = go.Figure()
     
     # Gráfico de barras para facturación total
@@ -2163,21 +2120,9 @@ def update_dept_performance(active_tab):
     
     return fig
 
-@callback(
-    Output('dept-efficiency', 'figure'),
-    [Input('tabs', 'active_tab')]
-)
-def update_dept_efficiency(active_tab):
-    if active_tab != "dept-tab":
-        return go.Figure()
-    
-    df = data['departments']
-    
-    # Obtener los últimos datos de cada departamento
-    latest_data = df.groupby('department').last().reset_index()
-    
+def update_dept_efficiency(latest_data):
     # Calcular eficiencia promedio por departamento
-    dept_efficiency = latest_data.groupby('department')['efficiency_score'].mean().reset_index()
+    dept_efficiency = latest_data.groupby('department', observed=True)['efficiency_score'].mean().reset_index()
     
     fig = go.Figure(data=[go.Pie(
         labels=dept_efficiency['department'],
@@ -2196,44 +2141,47 @@ def update_dept_efficiency(active_tab):
     
     return fig
 
-# Callbacks para Product Billing
+# Callback único de la pestaña Department Billing: calcula todas sus figuras y KPIs
+# en una sola respuesta, compartiendo los slices de datos entre ellas
 @callback(
-    [Output('total-product-revenue', 'children'),
-     Output('total-subscribers', 'children'),
-     Output('avg-churn-rate', 'children'),
-     Output('avg-profit-margin', 'children')],
-    [Input('tabs', 'active_tab')]
+    [Output('total-dept-billed', 'children'),
+     Output('avg-dept-efficiency', 'children'),
+     Output('total-dept-users', 'children'),
+     Output('avg-cost-per-user', 'children'),
+     Output('dept-billing-trends', 'figure'),
+     Output('dept-performance', 'figure'),
+     Output('dept-efficiency', 'figure')],
+    [tab_input('dept-tab')]
 )
-def update_product_metrics(active_tab):
-    if active_tab != "product-tab":
-        return "N/A", "N/A", "N/A", "N/A"
-    
-    df = data['products']
-    
-    total_revenue = f"${df['billed_amount'].sum():,.0f}"
-    total_subs = f"{df['subscribers'].sum():,}"
-    avg_churn = f"{df['churn_rate'].mean():.1%}"
-    avg_margin = f"{df['profit_margin'].mean():.1%}"
+def render_dept_tab(loaded):
+    aggregates = snapshots.current().companions['aggregates']
+    # Último registro de cada departamento (compartido)
+    latest_data = aggregates.latest('departments')
+    
+    return (
+        *update_dept_metrics(aggregates),
+        update_dept_billing_trends(aggregates),
+        update_dept_performance(latest_data),
+        update_dept_efficiency(latest_data)
+    )
+
+# Figuras y KPIs para Product Billing
+def update_product_metrics(aggregates):
+    total_revenue = f"${aggregates.total('products', 'billed_amount'):,.0f}"
+    total_subs = f"{aggregates.total('products', 'subscribers'):,}"
+    avg_churn = f"{aggregates.mean('products', 'churn_rate'):.1%}"
+    avg_margin = f"{aggregates.mean('products', 'profit_margin'):.1%}"
     
     return total_revenue, total_subs, avg_churn, avg_margin
 
-@callback(
-    Output('product-revenue-trends', 'figure'),
-    [Input('tabs', 'active_tab')]
-)
-def update_product_revenue_trends(active_tab):
-    if active_tab != "product-tab":
-        return go.Figure()
-    
-    df = data['products']
-    
-    # Agrupar por producto y fecha
-    product_trends = df.groupby(['product', 'date'])['billed_amount'].sum().reset_index()
+def update_product_revenue_trends(aggregates):
+    # Facturación diaria por producto (precalculada)
+    product_trends = aggregates.daily_billing('products')
     
     fig = go.Figure()
     
     # Agregar una línea por cada producto
-    products = df['product'].unique()
+    products = aggregates.entities('products')
     colors = ['#007bff', '#28a745', '#ffc107', '#dc3545', '#6f42c1', '#fd7e14', '#20c997', '#e83e8c']
     
     for i, product in enumerate(products):
@@ -2258,19 +2206,7 @@ def update_product_revenue_trends(active_tab):
     
     return fig
 
-@callback(
-    Output('product-performance', 'figure'),
-    [Input('tabs', 'active_tab')]
-)
-def update_product_performance(active_tab):
-    if active_tab != "product-tab":
-        return go.Figure()
-    
-    df = data['products']
-    
-    # Obtener los últimos datos de cada producto
-    latest_data = df.groupby('product').last().reset_index()
-    
+def update_product_performance(latest_data):
     fig = go.Figure()
     
     # Gráfico de barras para facturación total
@@ -2307,38 +2243,22 @@ def update_product_performance(active_tab):
     
     return fig
 
-@callback(
-    Output('product-revenue-distribution', 'figure'),
-    [Input('tabs', 'active_tab')]
-)
-def update_product_revenue_distribution(active_tab):
-    if active_tab != "product-tab":
-        return go.Figure()
-    
-    df = data['products']
-    
-    # Obtener los últimos datos de cada producto
-    latest_data = df.groupby('product').last().reset_index()
-    
+# Categoría de cada producto según su nombre (ver bucketing.py)
+PRODUCT_CATEGORIES = Keywords([
+    ('Internet', 'Internet Services'),
+    ('Cable TV', 'Cable TV'),
+    ('Phone', 'Phone Services'),
+    ('Mobile', 'Mobile Services'),
+    ('Bundle', 'Bundle Packages')
+], default='Other Services')
+
+def update_product_revenue_distribution(latest_data):
     # Categorizar productos
-    def categorize_product(product_name):
-        if 'Internet' in product_name:
-            return 'Internet Services'
-        elif 'Cable TV' in product_name:
-            return 'Cable TV'
-        elif 'Phone' in product_name:
-            return 'Phone Services'
-        elif 'Mobile' in product_name:
-            return 'Mobile Services'
-        elif 'Bundle' in product_name:
-            return 'Bundle Packages'
-        else:
-            return 'Other Services'
-    
-    latest_data['category'] = latest_data['product'].apply(categorize_product)
+    category = pd.Series(np.asarray(PRODUCT_CATEGORIES(latest_data['product'])),
+                         index=latest_data.index, name='category')
     
     # Agrupar por categoría
-    category_revenue = latest_data.groupby('category')['billed_amount'].sum().reset_index()
+    category_revenue = latest_data['billed_amount'].groupby(category).sum().reset_index()
     
     fig = go.Figure(data=[go.Pie(
         labels=category_revenue['category'],
@@ -2357,19 +2277,7 @@ def update_product_revenue_distribution(active_tab):
     
     return fig
 
-@callback(
-    Output('product-churn-analysis', 'figure'),
-    [Input('tabs', 'active_tab')]
-)
-def update_product_churn_analysis(active_tab):
-    if active_tab != "product-tab":
-        return go.Figure()
-    
-    df = data['products']
-    
-    # Obtener los últimos datos de cada producto
-    latest_data = df.groupby('product').last().reset_index()
-    
+def update_product_churn_analysis(latest_data):
     fig = make_subplots(
         rows=2, cols=2,
         subplot_titles=('Churn Rate by Product', 'Profit Margin by Product', 
@@ -2414,44 +2322,44 @@ def update_product_churn_analysis(active_tab):
     
     return fig
 
-# Callbacks para Complaints & Resolutions
+# Callback único de la pestaña Product Billing: calcula todas sus figuras y KPIs
+# en una sola respuesta, compartiendo los slices de datos entre ellas
 @callback(
-    [Output('total-complaints', 'children'),
-     Output('avg-resolution-time', 'children'),
-     Output('avg-satisfaction', 'children'),
-     Output('resolution-rate', 'children')],
-    [Input('tabs', 'active_tab')]
+    [Output('total-product-revenue', 'children'),
+     Output('total-subscribers', 'children'),
+     Output('avg-churn-rate', 'children'),
+     Output('avg-profit-margin', 'children'),
+     Output('product-revenue-trends', 'figure'),
+     Output('product-performance', 'figure'),
+     Output('product-revenue-distribution', 'figure'),
+     Output('product-churn-analysis', 'figure')],
+    [tab_input('product-tab')]
 )
-def update_complaints_metrics(active_tab):
-    if active_tab != "complaints-tab":
-        return "N/A", "N/A", "N/A", "N/A"
-    
-    df = data['complaints']
-    
-    total_complaints = len(df)
-    avg_resolution_time = f"{df['resolution_time_days'].mean():.1f} days"
-    avg_satisfaction = f"{df['customer_satisfaction'].mean():.1f}/5"
-    resolution_rate = f"{(len(df[df['status'] == 'Resolved']) / len(df)) * 100:.1f}%"
+def render_product_tab(loaded):
+    aggregates = snapshots.current().companions['aggregates']
+    # Último registro de cada producto (compartido)
+    latest_data = aggregates.latest('products')
+    
+    return (
+        *update_product_metrics(aggregates),
+        update_product_revenue_trends(aggregates),
+        update_product_performance(latest_data),
+        update_product_revenue_distribution(latest_data),
+        update_product_churn_analysis(latest_data)
+    )
+
+# Figuras y KPIs para Complaints & Resolutions
+def update_complaints_metrics(aggregates):
+    total_complaints = aggregates.rows('complaints')
+    avg_resolution_time = f"{aggregates.mean('complaints', 'resolution_time_days'):.1f} days"
+    avg_satisfaction = f"{aggregates.mean('complaints', 'customer_satisfaction'):.1f}/5"
+    resolution_rate = f"{(aggregates.resolved_count() / total_complaints) * 100:.1f}%"
     
     return total_complaints, avg_resolution_time, avg_satisfaction, resolution_rate
 
-@callback(
-    Output('complaints-timeline', 'figure'),
-    [Input('tabs', 'active_tab')]
-)
-def update_complaints_timeline(active_tab):
-    if active_tab != "complaints-tab":
-        return go.Figure()
-    
-    df = data['complaints']
-    
-    # Agrupar quejas por fecha
-    daily_complaints = df.groupby(df['complaint_date'].dt.date).size().reset_index()
-    daily_complaints.columns = ['date', 'complaints_count']
-    
-    # Agrupar resoluciones por fecha
-    daily_resolutions = df[df['status'] == 'Resolved'].groupby(df['resolution_date'].dt.date).size().reset_index()
-    daily_resolutions.columns = ['date', 'resolutions_count']
+def update_complaints_timeline(aggregates):
+    # Quejas y resoluciones por fecha (precalculadas)
+    daily_complaints, daily_resolutions = aggregates.complaints_timeline()
     
     fig = go.Figure()
     
@@ -2486,18 +2394,9 @@ def update_complaints_timeline(active_tab):
     
     return fig
 
-@callback(
-    Output('complaints-by-type', 'figure'),
-    [Input('tabs', 'active_tab')]
-)
-def update_complaints_by_type(active_tab):
-    if active_tab != "complaints-tab":
-        return go.Figure()
-    
-    df = data['complaints']
-    
-    # Crear tabla cruzada de tipo de queja vs prioridad
-    complaint_cross = pd.crosstab(df['complaint_type'], df['priority'])
+def update_complaints_by_type(aggregates):
+    # Tabla cruzada de tipo de queja vs prioridad (precalculada)
+    complaint_cross = aggregates.complaints_by_type_priority()
     
     fig = go.Figure()
     
@@ -2528,31 +2427,16 @@ def update_complaints_by_type(active_tab):
     
     return fig
 
-@callback(
-    Output('resolution-time-distribution', 'figure'),
-    [Input('tabs', 'active_tab')]
-)
-def update_resolution_time_distribution(active_tab):
-    if active_tab != "complaints-tab":
-        return go.Figure()
-    
-    df = data['complaints']
-    
-    # Categorizar tiempos de resolución
-    def categorize_resolution_time(days):
-        if days <= 1:
-            return 'Same Day'
-        elif days <= 3:
-            return '1-3 Days'
-        elif days <= 7:
-            return '4-7 Days'
-        elif days <= 14:
-            return '8-14 Days'
-        else:
-            return '15+ Days'
-    
-    df['resolution_category'] = df['resolution_time_days'].apply(categorize_resolution_time)
-    resolution_dist = df['resolution_category'].value_counts()
+# Tiempos de resolución en días (límite superior incluido)
+RESOLUTION_TIME_BUCKETS = Bins([1, 3, 7, 14], ['Same Day', '1-3 Days', '4-7 Days', '8-14 Days', '15+ Days'])
+
+def resolution_category(df):
+    """Categoría de tiempo de resolución de cada queja"""
+    return RESOLUTION_TIME_BUCKETS(df['resolution_time_days'])
+
+def update_resolution_time_distribution(resolution_categories):
+    # Contar quejas por categoría de tiempo de resolución
+    resolution_dist = bucket_counts(resolution_categories)
     
     fig = go.Figure(data=[go.Pie(
         labels=resolution_dist.index,
@@ -2571,24 +2455,9 @@ def update_resolution_time_distribution(active_tab):
     
     return fig
 
-@callback(
-    Output('department-complaints-performance', 'figure'),
-    [Input('tabs', 'active_tab')]
-)
-def update_department_complaints_performance(active_tab):
-    if active_tab != "complaints-tab":
-        return go.Figure()
-    
-    df = data['complaints']
-    
-    # Calcular métricas por departamento
-    dept_metrics = df.groupby('department').agg({
-        'complaint_id': 'count',
-        'resolution_time_days': 'mean',
-        'customer_satisfaction': 'mean'
-    }).reset_index()
-    
-    dept_metrics.columns = ['department', 'total_complaints', 'avg_resolution_time', 'avg_satisfaction']
+def update_department_complaints_performance(aggregates):
+    # Métricas por departamento (precalculadas)
+    dept_metrics = aggregates.complaints_by_department()
     
     fig = make_subplots(
         rows=2, cols=2,
@@ -2636,20 +2505,35 @@ def update_department_complaints_performance(active_tab):
     
     return fig
 
-# Callbacks para Customer Analysis
+# Callback único de la pestaña Complaints & Resolutions: calcula todas sus figuras y KPIs
+# en una sola respuesta, compartiendo los slices de datos entre ellas
 @callback(
-    [Output('total-customers', 'children'),
-     Output('avg-monthly-bill', 'children'),
-     Output('avg-satisfaction-score', 'children'),
-     Output('high-churn-risk', 'children')],
-    [Input('tabs', 'active_tab')]
+    [Output('total-complaints', 'children'),
+     Output('avg-resolution-time', 'children'),
+     Output('avg-satisfaction', 'children'),
+     Output('resolution-rate', 'children'),
+     Output('complaints-timeline', 'figure'),
+     Output('complaints-by-type', 'figure'),
+     Output('resolution-time-distribution', 'figure'),
+     Output('department-complaints-performance', 'figure')],
+    [tab_input('complaints-tab')]
 )
-def update_customer_metrics(active_tab):
-    if active_tab != "customer-tab":
-        return "N/A", "N/A", "N/A", "N/A"
-    
-    df = data['customers']
-    
+def render_complaints_tab(loaded):
+    snapshot = snapshots.current()
+    aggregates = snapshot.companions['aggregates']
+    
+    return (
+        *update_complaints_metrics(aggregates),
+        update_complaints_timeline(aggregates),
+        update_complaints_by_type(aggregates),
+        update_resolution_time_distribution(
+            snapshot.derived('complaints', 'resolution_category', resolution_category)
+        ),
+        update_department_complaints_performance(aggregates)
+    )
+
+# Figuras y KPIs para Customer Analysis
+def update_customer_metrics(df):
     total_customers = len(df)
     avg_monthly_bill = f"${df['monthly_bill'].mean():.0f}"
     avg_satisfaction = f"{df['satisfaction_score'].mean():.1f}/10"
@@ -2657,17 +2541,8 @@ def update_customer_metrics(active_tab):
     
     return total_customers, avg_monthly_bill, avg_satisfaction, high_churn_risk
 
-@callback(
-    Output('customer-demographics', 'figure'),
-    [Input('tabs', 'active_tab')]
-)
-def update_customer_demographics(active_tab):
-    if active_tab != "customer-tab":
-        return go.Figure()
-    
+def update_customer_demographics(df):
     try:
-        df = data['customers'].copy()  # Hacer una copia para evitar modificar el original
-        
         fig = make_subplots(
             rows=2, cols=2,
             subplot_titles=('Age Distribution', 'Income Level Distribution', 
@@ -2679,8 +2554,7 @@ def update_customer_demographics(active_tab):
         # Age Distribution
         age_bins = [18, 25, 35, 45, 55, 65, 80]
         age_labels = ['18-25', '26-35', '36-45', '46-55', '56-65', '65+']
-        df['age_group'] = pd.cut(df['age'], bins=age_bins, labels=age_labels, include_lowest=True)
-        age_dist = df['age_group'].value_counts()
+        age_dist = pd.cut(df['age'], bins=age_bins, labels=age_labels, include_lowest=True).value_counts()
         
         fig.add_trace(
             go.Bar(x=age_dist.index.astype(str), y=age_dist.values, name='Age Groups', marker_color='#007bff'),
@@ -2698,8 +2572,7 @@ def update_customer_demographics(active_tab):
         # Tenure Distribution
         tenure_bins = [0, 12, 24, 36, 48, 60, 120]
         tenure_labels = ['0-1y', '1-2y', '2-3y', '3-4y', '4-5y', '5y+']
-        df['tenure_group'] = pd.cut(df['tenure_months'], bins=tenure_bins, labels=tenure_labels, include_lowest=True)
-        tenure_dist = df['tenure_group'].value_counts()
+        tenure_dist = pd.cut(df['tenure_months'], bins=tenure_bins, labels=tenure_labels, include_lowest=True).value_counts()
         
         fig.add_trace(
             go.Bar(x=tenure_dist.index.astype(str), y=tenure_dist.values, name='Tenure Groups', marker_color='#ffc107'),
@@ -2738,17 +2611,8 @@ def update_customer_demographics(active_tab):
         )
         return fig
 
-@callback(
-    Output('customer-behavior', 'figure'),
-    [Input('tabs', 'active_tab')]
-)
-def update_customer_behavior(active_tab):
-    if active_tab != "customer-tab":
-        return go.Figure()
-    
+def update_customer_behavior(df):
     try:
-        df = data['customers'].copy()  # Hacer una copia para evitar modificar el original
-        
         fig = make_subplots(
             rows=2, cols=2,
             subplot_titles=('Monthly Bill Distribution', 'Services Count Distribution', 
@@ -2760,8 +2624,7 @@ def update_customer_behavior(active_tab):
         # Monthly Bill Distribution
         bill_bins = [0, 30, 50, 70, 90, 120]
         bill_labels = ['$0-30', '$30-50', '$50-70', '$70-90', '$90+']
-        df['bill_group'] = pd.cut(df['monthly_bill'], bins=bill_bins, labels=bill_labels, include_lowest=True)
-        bill_dist = df['bill_group'].value_counts()
+        bill_dist = pd.cut(df['monthly_bill'], bins=bill_bins, labels=bill_labels, include_lowest=True).value_counts()
         
         fig.add_trace(
             go.Bar(x=bill_dist.index.astype(str), y=bill_dist.values, name='Bill Groups', marker_color='#007bff'),
@@ -2816,29 +2679,16 @@ def update_customer_behavior(active_tab):
         )
         return fig
 
-@callback(
-    Output('customer-segmentation', 'figure'),
-    [Input('tabs', 'active_tab')]
-)
-def update_customer_segmentation(active_tab):
-    if active_tab != "customer-tab":
-        return go.Figure()
-    
-    df = data['customers']
-    
-    # Crear segmentos de clientes
-    def segment_customers(row):
-        if row['monthly_bill'] > 80 and row['satisfaction_score'] > 8:
-            return 'High Value, Satisfied'
-        elif row['monthly_bill'] > 80 and row['satisfaction_score'] <= 8:
-            return 'High Value, At Risk'
-        elif row['monthly_bill'] <= 80 and row['satisfaction_score'] > 8:
-            return 'Low Value, Satisfied'
-        else:
-            return 'Low Value, At Risk'
-    
-    df['segment'] = df.apply(segment_customers, axis=1)
-    segment_dist = df['segment'].value_counts()
+# Segmentos de clientes por valor (factura) y satisfacción
+CUSTOMER_SEGMENTS = Rules([
+    ('High Value, Satisfied', lambda df: (df['monthly_bill'] > 80) & (df['satisfaction_score'] > 8)),
+    ('High Value, At Risk', lambda df: (df['monthly_bill'] > 80) & (df['satisfaction_score'] <= 8)),
+    ('Low Value, Satisfied', lambda df: (df['monthly_bill'] <= 80) & (df['satisfaction_score'] > 8))
+], default='Low Value, At Risk')
+
+def update_customer_segmentation(segments):
+    # Contar clientes por segmento
+    segment_dist = bucket_counts(segments)
     
     fig = go.Figure(data=[go.Pie(
         labels=segment_dist.index,
@@ -2857,16 +2707,15 @@ def update_customer_segmentation(active_tab):
     
     return fig
 
-@callback(
-    Output('churn-risk-analysis', 'figure'),
-    [Input('tabs', 'active_tab')]
-)
-def update_churn_risk_analysis(active_tab):
-    if active_tab != "customer-tab":
-        return go.Figure()
-    
-    df = data['customers']
-    
+# Grupos de riesgo de churn
+CHURN_RISK_BINS = [0, 0.2, 0.4, 0.6, 0.8, 1.0]
+CHURN_RISK_LABELS = ['0-20%', '20-40%', '40-60%', '60-80%', '80-100%']
+
+def churn_group(df):
+    """Grupo de riesgo de churn de cada cliente"""
+    return pd.cut(df['churn_risk'], bins=CHURN_RISK_BINS, labels=CHURN_RISK_LABELS, include_lowest=True)
+
+def update_churn_risk_analysis(df, churn_groups):
     fig = make_subplots(
         rows=2, cols=2,
         subplot_titles=('Churn Risk Distribution', 'Churn Risk vs Monthly Bill',
@@ -2876,10 +2725,7 @@ def update_churn_risk_analysis(active_tab):
     )
     
     # Churn Risk Distribution
-    churn_bins = [0, 0.2, 0.4, 0.6, 0.8, 1.0]
-    churn_labels = ['0-20%', '20-40%', '40-60%', '60-80%', '80-100%']
-    df['churn_group'] = pd.cut(df['churn_risk'], bins=churn_bins, labels=churn_labels, include_lowest=True)
-    churn_dist = df['churn_group'].value_counts()
+    churn_dist = churn_groups.value_counts()
     
     fig.add_trace(
         go.Bar(x=churn_dist.index, y=churn_dist.values, name='Churn Risk Groups', marker_color='#dc3545'),
@@ -2888,22 +2734,22 @@ def update_churn_risk_analysis(active_tab):
     
     # Churn Risk vs Monthly Bill
     fig.add_trace(
-        go.Scatter(x=df['monthly_bill'], y=df['churn_risk'], mode='markers',
-                  name='Bill vs Churn', marker=dict(size=5, color='#007bff', opacity=0.6)),
+        scatter_trace(df['monthly_bill'], df['churn_risk'],
+                      name='Bill vs Churn', marker=dict(size=5, color='#007bff', opacity=0.6)),
         row=1, col=2
     )
     
     # Churn Risk vs Tenure
     fig.add_trace(
-        go.Scatter(x=df['tenure_months'], y=df['churn_risk'], mode='markers',
-                  name='Tenure vs Churn', marker=dict(size=5, color='#28a745', opacity=0.6)),
+        scatter_trace(df['tenure_months'], df['churn_risk'],
+                      name='Tenure vs Churn', marker=dict(size=5, color='#28a745', opacity=0.6)),
         row=2, col=1
     )
     
     # Churn Risk vs Satisfaction
     fig.add_trace(
-        go.Scatter(x=df['satisfaction_score'], y=df['churn_risk'], mode='markers',
-                  name='Satisfaction vs Churn', marker=dict(size=5, color='#ffc107', opacity=0.6)),
+        scatter_trace(df['satisfaction_score'], df['churn_risk'],
+                      name='Satisfaction vs Churn', marker=dict(size=5, color='#ffc107', opacity=0.6)),
         row=2, col=2
     )
     
@@ -2915,20 +2761,33 @@ def update_churn_risk_analysis(active_tab):
     
     return fig
 
-# Callbacks para Network Analysis
+# Callback único de la pestaña Customer Analysis: calcula todas sus figuras y KPIs
+# en una sola respuesta, compartiendo los slices de datos entre ellas
 @callback(
-    [Output('avg-traffic-volume', 'children'),
-     Output('avg-connection-speed', 'children'),
-     Output('avg-uptime', 'children'),
-     Output('avg-latency', 'children')],
-    [Input('tabs', 'active_tab')]
+    [Output('total-customers', 'children'),
+     Output('avg-monthly-bill', 'children'),
+     Output('avg-satisfaction-score', 'children'),
+     Output('high-churn-risk', 'children'),
+     Output('customer-demographics', 'figure'),
+     Output('customer-behavior', 'figure'),
+     Output('customer-segmentation', 'figure'),
+     Output('churn-risk-analysis', 'figure')],
+    [tab_input('customer-tab')]
 )
-def update_network_metrics(active_tab):
-    if active_tab != "network-tab":
-        return "N/A", "N/A", "N/A", "N/A"
-    
-    df = data['network']
-    
+def render_customer_tab(loaded):
+    snapshot = snapshots.current()
+    df = snapshot.table('customers')
+    
+    return (
+        *update_customer_metrics(df),
+        update_customer_demographics(df),
+        update_customer_behavior(df),
+        update_customer_segmentation(snapshot.derived('customers', 'segment', CUSTOMER_SEGMENTS)),
+        update_churn_risk_analysis(df, snapshot.derived('customers', 'churn_group', churn_group))
+    )
+
+# Figuras y KPIs para Network Analysis
+def update_network_metrics(df):
     avg_traffic = f"{df['traffic_volume_gbps'].mean():.1f} Gbps"
     avg_speed = f"{df['connection_speed_mbps'].mean():.0f} Mbps"
     avg_uptime = f"{df['uptime_percent'].mean():.2f}%"
@@ -2936,20 +2795,8 @@ def update_network_metrics(active_tab):
     
     return avg_traffic, avg_speed, avg_uptime, avg_latency
 
-@callback(
-    Output('network-performance-trends', 'figure'),
-    [Input('tabs', 'active_tab')]
-)
-def update_network_performance_trends(active_tab):
-    if active_tab != "network-tab":
-        return go.Figure()
-    
+def update_network_performance_trends(last_24h):
     try:
-        df = data['network'].copy()
-        
-        # Obtener datos de las últimas 24 horas
-        last_24h = df.tail(24)
-        
         fig = go.Figure()
         
         # Traffic Volume
@@ -2988,6 +2835,7 @@ def update_network_performance_trends(active_tab):
         fig.update_layout(
             title="Network Performance Trends - Last 24 Hours",
             xaxis_title="Time",
+            xaxis=dict(rangeselector=dict(buttons=trend_range_buttons(network_stream))),
             yaxis_title="Traffic Volume (Gbps)",
             yaxis2=dict(title="Connection Speed (Mbps)", overlaying='y', side='right'),
             yaxis3=dict(title="Latency (ms)", overlaying='y', side='right', position=0.95),
@@ -3013,20 +2861,8 @@ def update_network_performance_trends(active_tab):
         )
         return fig
 
-@callback(
-    Output('network-metrics-analysis', 'figure'),
-    [Input('tabs', 'active_tab')]
-)
-def update_network_metrics_analysis(active_tab):
-    if active_tab != "network-tab":
-        return go.Figure()
-    
+def update_network_metrics_analysis(last_24h):
     try:
-        df = data['network'].copy()
-        
-        # Obtener datos de las últimas 24 horas
-        last_24h = df.tail(24)
-        
         fig = make_subplots(
             rows=2, cols=2,
             subplot_titles=('Active Connections', 'Packet Loss %', 'Bandwidth Utilization %', 'Uptime %'),
@@ -3085,30 +2921,14 @@ def update_network_metrics_analysis(active_tab):
         )
         return fig
 
-@callback(
-    Output('bandwidth-utilization', 'figure'),
-    [Input('tabs', 'active_tab')]
-)
-def update_bandwidth_utilization(active_tab):
-    if active_tab != "network-tab":
-        return go.Figure()
-    
+# Utilización de ancho de banda en % (límite superior excluido)
+BANDWIDTH_BUCKETS = Bins([50, 75, 90], ['Low (<50%)', 'Medium (50-75%)', 'High (75-90%)', 'Critical (>90%)'],
+                         closed='left')
+
+def update_bandwidth_utilization(df):
     try:
-        df = data['network'].copy()
-        
         # Categorizar utilización de ancho de banda
-        def categorize_bandwidth(utilization):
-            if utilization < 50:
-                return 'Low (<50%)'
-            elif utilization < 75:
-                return 'Medium (50-75%)'
-            elif utilization < 90:
-                return 'High (75-90%)'
-            else:
-                return 'Critical (>90%)'
-        
-        df['bandwidth_category'] = df['bandwidth_utilization'].apply(categorize_bandwidth)
-        bandwidth_dist = df['bandwidth_category'].value_counts()
+        bandwidth_dist = bucket_counts(BANDWIDTH_BUCKETS(df['bandwidth_utilization']))
         
         fig = go.Figure(data=[go.Pie(
             labels=bandwidth_dist.index,
@@ -3142,20 +2962,8 @@ def update_bandwidth_utilization(active_tab):
         )
         return fig
 
-@callback(
-    Output('network-health-dashboard', 'figure'),
-    [Input('tabs', 'active_tab')]
-)
-def update_network_health_dashboard(active_tab):
-    if active_tab != "network-tab":
-        return go.Figure()
-    
+def update_network_health_dashboard(last_24h):
     try:
-        df = data['network'].copy()
-        
-        # Obtener datos de las últimas 24 horas
-        last_24h = df.tail(24)
-        
         fig = make_subplots(
             rows=2, cols=2,
             subplot_titles=('Network Health Score', 'Performance vs Time of Day',
@@ -3224,20 +3032,48 @@ def update_network_health_dashboard(active_tab):
         )
         return fig
 
-# Callbacks para Operations Analysis
+# Callback único de la pestaña Network Performance: calcula todas sus figuras y KPIs
+# en una sola respuesta, compartiendo los slices de datos entre ellas
 @callback(
-    [Output('total-invoices-processed', 'children'),
-     Output('avg-processing-time', 'children'),
-     Output('automation-rate', 'children'),
-     Output('error-rate', 'children')],
-    [Input('tabs', 'active_tab')]
+    [Output('avg-traffic-volume', 'children'),
+     Output('avg-connection-speed', 'children'),
+     Output('avg-uptime', 'children'),
+     Output('avg-latency', 'children'),
+     Output('network-performance-trends', 'figure'),
+     Output('network-metrics-analysis', 'figure'),
+     Output('bandwidth-utilization', 'figure'),
+     Output('network-health-dashboard', 'figure')],
+    [tab_input('network-tab')],
+    State('viewport-width', 'data')
 )
-def update_operations_metrics(active_tab):
-    if active_tab != "operations-tab":
-        return "N/A", "N/A", "N/A", "N/A"
-    
-    df = data['operations']
-    
+def render_network_tab(loaded, viewport_width):
+    if STREAMING:
+        network_stream.advance()
+    # Historia completa solo para KPIs y la torta (valores agregados); las
+    # figuras de tendencia usan las últimas 24 horas reducidas al ancho
+    df = network_stream.window()
+    last_24h = chart_window(network_stream, network_stream.last('24h'), viewport_width, 'traffic_volume_gbps')
+    
+    return (
+        *update_network_metrics(df),
+        update_network_performance_trends(last_24h),
+        update_network_metrics_analysis(last_24h),
+        update_bandwidth_utilization(df),
+        update_network_health_dashboard(last_24h)
+    )
+
+@callback(
+    Output('network-performance-trends', 'figure', allow_duplicate=True),
+    Input('network-performance-trends', 'relayoutData'),
+    State('viewport-width', 'data'),
+    prevent_initial_call=True
+)
+def zoom_network_performance_trends(relayout, viewport_width):
+    window = zoom_window(network_stream, relayout, viewport_width, 'traffic_volume_gbps', '24h')
+    return update_network_performance_trends(window)
+
+# Figuras y KPIs para Operations Analysis
+def update_operations_metrics(df):
     total_invoices = f"{df['invoices_processed'].sum():,}"
     avg_processing = f"{df['processing_time_minutes'].mean():.1f} min"
     automation_rate = f"{df['automation_rate_percent'].mean():.1f}%"
@@ -3245,17 +3081,8 @@ def update_operations_metrics(active_tab):
     
     return total_invoices, avg_processing, automation_rate, error_rate
 
-@callback(
-    Output('operations-performance-trends', 'figure'),
-    [Input('tabs', 'active_tab')]
-)
-def update_operations_performance_trends(active_tab):
-    if active_tab != "operations-tab":
-        return go.Figure()
-    
+def update_operations_performance_trends(df):
     try:
-        df = data['operations'].copy()
-        
         fig = go.Figure()
         
         # Invoices Processed
@@ -3319,17 +3146,8 @@ def update_operations_performance_trends(active_tab):
         )
         return fig
 
-@callback(
-    Output('operations-efficiency-analysis', 'figure'),
-    [Input('tabs', 'active_tab')]
-)
-def update_operations_efficiency_analysis(active_tab):
-    if active_tab != "operations-tab":
-        return go.Figure()
-    
+def update_operations_efficiency_analysis(df):
     try:
-        df = data['operations'].copy()
-        
         fig = make_subplots(
             rows=2, cols=2,
             subplot_titles=('Staff Productivity', 'Error Rate %', 'Cost per Invoice', 'Customer Satisfaction'),
@@ -3388,30 +3206,19 @@ def update_operations_efficiency_analysis(active_tab):
         )
         return fig
 
-@callback(
-    Output('cost-analysis', 'figure'),
-    [Input('tabs', 'active_tab')]
-)
-def update_cost_analysis(active_tab):
-    if active_tab != "operations-tab":
-        return go.Figure()
-    
+# Costo por factura en dólares (límite superior excluido)
+COST_BUCKETS = Bins([1.5, 2.5, 3.5], ['Low Cost (<$1.50)', 'Medium Cost ($1.50-$2.50)',
+                                      'High Cost ($2.50-$3.50)', 'Very High Cost (>$3.50)'],
+                    closed='left')
+
+def cost_category(df):
+    """Categoría de costo por factura de cada día"""
+    return COST_BUCKETS(df['cost_per_invoice'])
+
+def update_cost_analysis(cost_categories):
     try:
-        df = data['operations'].copy()
-        
-        # Categorizar costos por operación
-        def categorize_cost(cost):
-            if cost < 1.5:
-                return 'Low Cost (<$1.50)'
-            elif cost < 2.5:
-                return 'Medium Cost ($1.50-$2.50)'
-            elif cost < 3.5:
-                return 'High Cost ($2.50-$3.50)'
-            else:
-                return 'Very High Cost (>$3.50)'
-        
-        df['cost_category'] = df['cost_per_invoice'].apply(categorize_cost)
-        cost_dist = df['cost_category'].value_counts()
+        # Contar días por categoría de costo
+        cost_dist = bucket_counts(cost_categories)
         
         fig = go.Figure(data=[go.Pie(
             labels=cost_dist.index,
@@ -3445,17 +3252,8 @@ def update_cost_analysis(active_tab):
         )
         return fig
 
-@callback(
-    Output('operations-health-dashboard', 'figure'),
-    [Input('tabs', 'active_tab')]
-)
-def update_operations_health_dashboard(active_tab):
-    if active_tab != "operations-tab":
-        return go.Figure()
-    
+def update_operations_health_dashboard(df):
     try:
-        df = data['operations'].copy()
-        
         fig = make_subplots(
             rows=2, cols=2,
             subplot_titles=('Operations Health Score', 'Efficiency vs Cost',
@@ -3524,6 +3322,31 @@ def update_operations_health_dashboard(active_tab):
         )
         return fig
 
+# Callback único de la pestaña Operations Analysis: calcula todas sus figuras y KPIs
+# en una sola respuesta, compartiendo los slices de datos entre ellas
+@callback(
+    [Output('total-invoices-processed', 'children'),
+     Output('avg-processing-time', 'children'),
+     Output('automation-rate', 'children'),
+     Output('error-rate', 'children'),
+     Output('operations-performance-trends', 'figure'),
+     Output('operations-efficiency-analysis', 'figure'),
+     Output('cost-analysis', 'figure'),
+     Output('operations-health-dashboard', 'figure')],
+    [tab_input('operations-tab')]
+)
+def render_operations_tab(loaded):
+    snapshot = snapshots.current()
+    df = snapshot.table('operations')
+    
+    return (
+        *update_operations_metrics(df),
+        update_operations_performance_trends(df),
+        update_operations_efficiency_analysis(df),
+        update_cost_analysis(snapshot.derived('operations', 'cost_category', cost_category)),
+        update_operations_health_dashboard(df)
+    )
+
 # =============================================================================
 # 6. CONFIGURACIÓN DEL SERVIDOR
 # =============================================================================
@@ -0,0 +1,152 @@
+# =============================================================================
+# MODO STREAMING PARA LAS SERIES REAL_TIME Y NETWORK
+# =============================================================================
+# Mantiene los últimos registros de una serie temporal en un ring buffer de
+# capacidad fija (ring_buffer.py) y lo extiende con registros nuevos a medida
+# que pasa el tiempo. La pestaña Real-time Billing pide solo las filas
+# posteriores al último timestamp que ya tiene y las agrega a los gráficos con
+# extendData, así ni la memoria ni el payload por tick crecen con la historia.
+#
+# Los registros nuevos se generan por bloques de STREAM_BLOCK_ROWS timestamps
+# alineados al reloj (una llamada vectorizada a make_rows por bloque), con una
+# semilla derivada del bloque: todos los workers de gunicorn producen
+# exactamente las mismas filas sin compartir estado, sin importar en qué
+# momento avance cada uno.
+#
+# Configuración por variables de entorno:
+#   REALTIME_STREAMING        -> '1' para arrancar la pestaña en vivo
+#   REALTIME_STREAM_FREQ      -> frecuencia de los registros nuevos ('h', 'min', 's');
+#                                por defecto la de la historia (horaria)
+#   REALTIME_STREAM_INTERVAL  -> intervalo de refresco del navegador en ms
+#   REALTIME_STREAM_HISTORY   -> período que se conserva en memoria ('30D')
+#   REALTIME_STREAM_CAPACITY  -> cantidad máxima de registros en memoria (por
+#                                defecto, los de REALTIME_STREAM_HISTORY a
+#                                REALTIME_STREAM_FREQ)
+# =============================================================================
+
+import os
+import threading
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from downsampling import rollup
+from ring_buffer import RingBuffer
+
+STREAMING = os.environ.get('REALTIME_STREAMING', '0') == '1'
+STREAM_FREQ = os.environ.get('REALTIME_STREAM_FREQ', 'h')
+STREAM_INTERVAL_MS = int(os.environ.get('REALTIME_STREAM_INTERVAL', 2000))
+STREAM_HISTORY = os.environ.get('REALTIME_STREAM_HISTORY', '30D')
+STREAM_BLOCK_ROWS = 256
+STREAM_CAPACITY = int(os.environ.get(
+    'REALTIME_STREAM_CAPACITY',
+    pd.Timedelta(STREAM_HISTORY) // pd.Timedelta(pd.tseries.frequencies.to_offset(STREAM_FREQ)) + 1))
+
+
+class TimeSeriesStream:
+    """Serie temporal en un ring buffer acotado que crece con el reloj"""
+
+    def __init__(self, history, make_rows, freq=STREAM_FREQ, capacity=STREAM_CAPACITY, seed=42):
+        """
+        Args:
+            history (pd.DataFrame): Historia inicial (columna 'timestamp' ascendente)
+            make_rows (callable): Función (rng, timestamps) -> DataFrame, p. ej.
+                synthetic_data.real_time_rows o synthetic_data.network_rows
+            freq (str): Frecuencia de los registros nuevos
+            capacity (int): Cantidad máxima de registros que se conservan
+            seed (int): Semilla base para los registros nuevos
+        """
+        self.make_rows = make_rows
+        self.freq = pd.tseries.frequencies.to_offset(freq)
+        self.capacity = capacity
+        self.seed = seed
+        self._buffer = RingBuffer.from_frame(history.tail(capacity), capacity)
+        self._lock = threading.Lock()
+        # Rollups por regla ('1min', '1h', '1D'), válidos mientras no lleguen filas
+        self._rollups = {}
+
+    def _new_rows(self, timestamps):
+        """
+        Filas de los timestamps pedidos: se genera cada bloque de
+        STREAM_BLOCK_ROWS timestamps que los contiene (con la semilla del
+        bloque) y se toman solo las filas pedidas.
+        """
+        step = pd.Timedelta(self.freq).value
+        span = step * STREAM_BLOCK_ROWS
+        values = timestamps.asi8
+        phase = values[0] % step
+        frames = []
+        for block in np.unique(values // span):
+            first = block * span + (phase - block * span) % step
+            grid = np.arange(first, (block + 1) * span, step)
+            rows = self.make_rows(np.random.default_rng([self.seed, block]), pd.DatetimeIndex(grid))
+            frames.append(rows[np.isin(grid, values)])
+        return pd.concat(frames, ignore_index=True)
+
+    def advance(self, now=None):
+        """
+        Agrega los registros que corresponden hasta 'now' y descarta los más
+        viejos para no superar la capacidad. Un stream sin historia empieza
+        con el registro de 'now'.
+
+        Returns:
+            int: Cantidad de registros nuevos
+        """
+        now = pd.Timestamp(now if now is not None else datetime.now())
+        with self._lock:
+            if len(self._buffer) == 0:
+                timestamps = pd.DatetimeIndex([now.floor(self.freq)])
+            else:
+                last = pd.Timestamp(self._buffer.view(1)['timestamp'][0])
+                timestamps = pd.date_range(start=last + self.freq, end=now, freq=self.freq)
+            if len(timestamps) == 0:
+                return 0
+            # Si la pestaña estuvo mucho tiempo sin pedir datos, solo interesan
+            # los últimos 'capacity' registros
+            timestamps = timestamps[-self.capacity:]
+            self._buffer.append(self._new_rows(timestamps))
+            self._rollups.clear()
+            return len(timestamps)
+
+    @property
+    def span(self):
+        """Período que cubre el buffer lleno (capacity registros a la frecuencia del stream)"""
+        return (self.capacity - 1) * pd.Timedelta(self.freq)
+
+    def rows(self, offset):
+        """Cantidad de registros dentro de un período 'offset' ('24h', '7D', ...)"""
+        return min(pd.Timedelta(offset) // pd.Timedelta(self.freq), self.capacity)
+
+    def window(self, n=None):
+        """Últimos n registros (todos si n es None)"""
+        return self._buffer.tail(n)
+
+    def last(self, offset):
+        """Registros dentro del último 'offset' ('24h', '7D', ...)"""
+        return self._buffer.last(offset)
+
+    def between(self, start, end):
+        """Registros con timestamp en [start, end]"""
+        return self._buffer.between(start, end)
+
+    def rollup(self, rule):
+        """Rollup de toda la serie por intervalo 'rule', recalculado solo si hay filas nuevas"""
+        with self._lock:
+            version = self._buffer.appended
+            cached = self._rollups.get(rule)
+            if cached is None or cached[0] != version:
+                cached = (version, rollup(self._buffer.tail(), rule))
+                self._rollups[rule] = cached
+            return cached[1]
+
+    def since(self, timestamp):
+        """Registros posteriores a 'timestamp' (todos si es None)"""
+        if timestamp is None:
+            return self._buffer.tail()
+        return self._buffer.since(timestamp)
+
+    def last_timestamp(self):
+        """Timestamp del registro más reciente en formato ISO (None si no hay registros)"""
+        last = self._buffer.tail(1)['timestamp']
+        return last.iloc[0].isoformat() if len(last) else None
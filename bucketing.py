@@ -0,0 +1,108 @@
+# =============================================================================
+# MOTOR DE SEGMENTACIÓN Y BUCKETS VECTORIZADO
+# =============================================================================
+# Las figuras de distribución clasificaban cada fila con una función de Python
+# con if/elif (Series.apply o df.apply(axis=1)). Aquí las reglas se declaran
+# una vez y se compilan a operaciones de NumPy sobre la columna completa:
+#
+#   - Bins:     umbrales ordenados  -> np.searchsorted (como pd.cut)
+#   - Rules:    condiciones en orden -> np.select (la primera que se cumple)
+#   - Keywords: texto que contiene una palabra clave -> se evalúa una vez por
+#               valor distinto y se expande con los códigos de pd.factorize
+#
+# Todas devuelven un pd.Categorical (códigos enteros + etiquetas), y
+# bucket_counts() cuenta por etiqueta en el mismo orden que value_counts().
+# =============================================================================
+
+import numpy as np
+import pandas as pd
+
+
+class Bins:
+    """Buckets por umbrales: valor <= umbral (closed='right') o valor < umbral (closed='left')"""
+
+    def __init__(self, edges, labels, closed='right'):
+        """
+        Args:
+            edges (list): Umbrales ascendentes entre buckets (len(labels) - 1)
+            labels (list): Etiqueta de cada bucket, del menor al mayor
+            closed (str): 'right' para 'x <= umbral', 'left' para 'x < umbral'
+        """
+        if len(edges) != len(labels) - 1:
+            raise ValueError("Bins necesita exactamente una etiqueta más que umbrales")
+        self.edges = np.asarray(edges, dtype=np.float64)
+        self.labels = list(labels)
+        self._side = 'left' if closed == 'right' else 'right'
+
+    def __call__(self, values):
+        """Clasifica una columna (los NaN caen en el último bucket, como el else de un if/elif)"""
+        values = np.asarray(values, dtype=np.float64)
+        codes = np.searchsorted(self.edges, values, side=self._side)
+        return pd.Categorical.from_codes(codes, categories=self.labels)
+
+
+class Rules:
+    """Segmentos por condiciones sobre varias columnas; gana la primera que se cumple"""
+
+    def __init__(self, rules, default):
+        """
+        Args:
+            rules (list): Pares (etiqueta, condición); la condición recibe el
+                DataFrame y devuelve una máscara booleana vectorizada, p. ej.
+                lambda df: (df['monthly_bill'] > 80) & (df['satisfaction_score'] > 8)
+            default (str): Etiqueta si no se cumple ninguna condición
+        """
+        self.rules = list(rules)
+        self.labels = [label for label, _ in self.rules] + [default]
+
+    def __call__(self, df):
+        conditions = [np.asarray(condition(df), dtype=bool) for _, condition in self.rules]
+        codes = np.select(conditions, np.arange(len(conditions)), default=len(conditions))
+        return pd.Categorical.from_codes(codes, categories=self.labels)
+
+
+class Keywords:
+    """Categoría según la primera palabra clave contenida en el texto"""
+
+    def __init__(self, keywords, default):
+        """
+        Args:
+            keywords (list): Pares (palabra clave, etiqueta) en orden de prioridad
+            default (str): Etiqueta si el texto no contiene ninguna palabra clave
+        """
+        self.keywords = list(keywords)
+        self.labels = list(dict.fromkeys([label for _, label in self.keywords] + [default]))
+        self.default = default
+
+    def _label(self, text):
+        for keyword, label in self.keywords:
+            if keyword in text:
+                return label
+        return self.default
+
+    def __call__(self, values):
+        # Las reglas de texto se evalúan una vez por valor distinto (unos pocos
+        # productos) y se expanden a todas las filas con los códigos
+        codes, uniques = pd.factorize(pd.Series(values), use_na_sentinel=False)
+        lookup = np.array([self.labels.index(self._label(str(value))) for value in uniques], dtype=np.int64)
+        return pd.Categorical.from_codes(lookup[codes], categories=self.labels)
+
+
+def bucket_counts(buckets):
+    """
+    Cantidad de filas por etiqueta, sin las vacías y de mayor a menor, en el
+    mismo orden que value_counts() sobre las etiquetas como texto (incluso
+    en los empates, que dependen del orden de primera aparición).
+
+    Args:
+        buckets (pd.Categorical): Resultado de Bins / Rules / Keywords
+
+    Returns:
+        pd.Series: Etiqueta -> cantidad
+    """
+    codes = np.asarray(buckets.codes)
+    counts = np.bincount(codes, minlength=len(buckets.categories))
+    present, first_seen = np.unique(codes, return_index=True)
+    present = present[np.argsort(first_seen)]
+    labels = pd.Index(np.asarray(buckets.categories)[present], dtype=object)
+    return pd.Series(counts[present], index=labels, name='count').sort_values(ascending=False)
@@ -0,0 +1,233 @@
+# =============================================================================
+# REGISTRO DE DATASETS DE CHURN (LADO SERVIDOR)
+# =============================================================================
+# Mantiene en memoria del proceso un DataFrame compartido por cada dataset de
+# churn. El dcc.Store del dashboard solo guarda una referencia pequeña
+# ({'key': ..., 'version': ...}) y cada callback obtiene el DataFrame desde
+# aquí, en lugar de serializar todo el CSV al navegador y reconstruirlo en
+# cada request.
+#
+# Los DataFrames del registro son compartidos entre callbacks (y entre hilos):
+# se deben tratar como de solo lectura. Para columnas derivadas, usar
+# df.assign(...) o copias locales.
+#
+# Los CSV se leen con tipos compactos (CHURN_SCHEMA: category / bool / int16 /
+# float32) y se convierten una sola vez a Parquet en Data/cache/, de modo que
+# las cargas siguientes no vuelven a parsear texto.
+# =============================================================================
+
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Archivos disponibles para el selector de dataset
+DATASETS = {
+    'churn-20': os.path.join('Data', 'churn-bigml-20.csv'),
+    'churn-80': os.path.join('Data', 'churn-bigml-80.csv'),
+}
+
+# Tipos de cada columna de los CSV de churn ('bool' acepta Yes/No y True/False)
+CHURN_SCHEMA = {
+    'State': 'category',
+    'Account length': 'int16',
+    'Area code': 'int16',
+    'International plan': 'bool',
+    'Voice mail plan': 'bool',
+    'Number vmail messages': 'int16',
+    'Total day minutes': 'float32',
+    'Total day calls': 'int16',
+    'Total day charge': 'float32',
+    'Total eve minutes': 'float32',
+    'Total eve calls': 'int16',
+    'Total eve charge': 'float32',
+    'Total night minutes': 'float32',
+    'Total night calls': 'int16',
+    'Total night charge': 'float32',
+    'Total intl minutes': 'float32',
+    'Total intl calls': 'int16',
+    'Total intl charge': 'float32',
+    'Customer service calls': 'int16',
+    'Churn': 'bool',
+}
+
+# Variables que usan la matriz de correlación y el PCA (las booleanas como 0/1)
+FEATURE_COLUMNS = ['Account length', 'Number vmail messages', 'Total day minutes',
+                   'Total day calls', 'Total day charge', 'Total eve minutes',
+                   'Total eve calls', 'Total eve charge', 'Total night minutes',
+                   'Total night calls', 'Total night charge', 'Total intl minutes',
+                   'Total intl calls', 'Total intl charge', 'Customer service calls',
+                   'International plan', 'Voice mail plan', 'Churn']
+
+# Valores aceptados en las columnas booleanas que llegan como texto
+BOOLEAN_VALUES = {'Yes': 1.0, 'No': 0.0, 'True': 1.0, 'False': 0.0, True: 1.0, False: 0.0}
+
+# Carpeta del caché Parquet (junto a los CSV)
+CACHE_DIR = os.path.join('Data', 'cache')
+
+# Filas por chunk al recorrer un CSV por partes (CHURN_CHUNK_ROWS)
+CHUNK_ROWS = int(os.environ.get('CHURN_CHUNK_ROWS', 50000))
+
+# Registro en memoria: key -> (version, DataFrame)
+_registry = {}
+_lock = threading.Lock()
+
+
+def dataset_version(key):
+    """
+    Calcula la versión de un dataset a partir de la fecha de modificación y el
+    tamaño del archivo, para detectar cuando el CSV cambia en disco.
+
+    Args:
+        key (str): 'churn-20' o 'churn-80'
+
+    Returns:
+        str: Identificador de versión, p. ej. 'churn-80:1718900000:279997'
+    """
+    stat = os.stat(DATASETS[key])
+    return f"{key}:{int(stat.st_mtime)}:{stat.st_size}"
+
+
+def read_churn_csv(path):
+    """
+    Lee un CSV de churn con los tipos de CHURN_SCHEMA.
+
+    Usa el caché Parquet de Data/cache/ si existe y es más nuevo que el CSV;
+    si no, parsea el CSV y escribe el caché (si pyarrow está disponible).
+
+    Args:
+        path (str): Ruta del CSV
+
+    Returns:
+        pd.DataFrame: Datos con columnas category / bool / int16 / float32
+    """
+    cache_path = os.path.join(CACHE_DIR, os.path.splitext(os.path.basename(path))[0] + '.parquet')
+    try:
+        if os.path.getmtime(cache_path) >= os.path.getmtime(path):
+            return pd.read_parquet(cache_path)
+    except (OSError, ImportError):
+        pass
+
+    df = pd.read_csv(path, dtype=CHURN_SCHEMA,
+                     true_values=['Yes', 'True'], false_values=['No', 'False'])
+    _write_cache(df, cache_path)
+    return df
+
+
+def read_churn_csv_chunks(path, chunksize=CHUNK_ROWS):
+    """
+    Lee un CSV de churn por partes con los tipos de CHURN_SCHEMA, para
+    recorrer archivos que no entran en memoria.
+
+    Returns:
+        Iterator[pd.DataFrame]: Chunks de hasta chunksize filas (Churn booleano)
+    """
+    return pd.read_csv(path, dtype=CHURN_SCHEMA, chunksize=chunksize,
+                       true_values=['Yes', 'True'], false_values=['No', 'False'])
+
+
+def _write_cache(df, cache_path):
+    """Guarda el Parquet de forma atómica (varios workers pueden escribirlo a la vez)"""
+    tmp_path = f"{cache_path}.tmp-{os.getpid()}"
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, cache_path)
+    except ImportError:
+        print("⚠️ pyarrow no está instalado: los CSV de churn se leen sin caché Parquet")
+    except OSError:
+        pass
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _load_churn_csv(path):
+    """Carga el CSV tipado con el formato que usa el dashboard (Churn como 'Yes'/'No')"""
+    df = read_churn_csv(path)
+    df['Churn'] = pd.Categorical(np.where(df['Churn'], 'Yes', 'No'), categories=['No', 'Yes'])
+    return df
+
+
+def feature_matrix(df, columns=FEATURE_COLUMNS):
+    """
+    Matriz float64 con las variables de 'columns' (booleanas como 0/1).
+
+    Acepta tanto los DataFrames del registro (Churn como 'Yes'/'No') como los
+    que devuelve read_churn_csv() o un chunk del CSV (Churn booleano). Las
+    columnas de texto se convierten con BOOLEAN_VALUES o como números.
+
+    Args:
+        df (pd.DataFrame): Datos de churn
+        columns (list): Columnas a incluir, en orden
+
+    Returns:
+        np.ndarray: Matriz de len(df) x len(columns)
+
+    Raises:
+        ValueError: Si una columna de texto tiene un valor vacío o que no es
+            Yes/No, True/False ni un número (el mensaje nombra la columna)
+    """
+    matrix = np.empty((len(df), len(columns)), dtype=np.float64)
+    for j, col in enumerate(columns):
+        values = df[col]
+        if not (pd.api.types.is_numeric_dtype(values) or pd.api.types.is_bool_dtype(values)):
+            values = _parse_text_column(values, col)
+        matrix[:, j] = values.to_numpy(dtype=np.float64)
+    return matrix
+
+
+def _parse_text_column(values, col):
+    """Columna de texto -> float64 (Yes/No, True/False o números); falla con el primer valor inválido"""
+    parsed = values.map(BOOLEAN_VALUES).astype(np.float64)
+    pending = parsed.isna()
+    if pending.any():
+        parsed[pending] = pd.to_numeric(values[pending].astype(object), errors='coerce')
+        invalid = parsed.isna()
+        if invalid.any():
+            raise ValueError(f"Columna '{col}': valor inválido {values[invalid].iloc[0]!r} "
+                             f"(se espera Yes/No, True/False o un número)")
+    return parsed
+
+
+def register_dataset(key):
+    """
+    Carga (o reutiliza) el dataset en el registro y devuelve la referencia que
+    se guarda en el dcc.Store.
+
+    Args:
+        key (str): 'churn-20' o 'churn-80'
+
+    Returns:
+        dict: {'key', 'version', 'rows'} - unos pocos bytes para el navegador
+    """
+    version = dataset_version(key)
+    with _lock:
+        cached = _registry.get(key)
+        if cached is None or cached[0] != version:
+            cached = (version, _load_churn_csv(DATASETS[key]))
+            _registry[key] = cached
+    return {'key': key, 'version': version, 'rows': len(cached[1])}
+
+
+def get_dataset(ref):
+    """
+    Devuelve el DataFrame compartido para la referencia guardada en el store.
+
+    Si el proceso todavía no tiene el dataset (p. ej. otro worker de gunicorn
+    atendió la carga inicial) o la versión cambió, se carga en ese momento.
+
+    Args:
+        ref (dict): Referencia devuelta por register_dataset()
+
+    Returns:
+        pd.DataFrame: DataFrame de solo lectura con los datos del dataset
+    """
+    key = ref['key']
+    with _lock:
+        cached = _registry.get(key)
+        if cached is not None and cached[0] == ref.get('version'):
+            return cached[1]
+    register_dataset(key)
+    return _registry[key][1]
@@ -0,0 +1,254 @@
+# =============================================================================
+# MODELO DE CHURN PERSISTIDO Y SCORING EN LOTE
+# =============================================================================
+# TelecomAnalyzer.build_churn_model() entrenaba un RandomForest de 100 árboles
+# en cada llamada y lo descartaba. Este módulo entrena el modelo (y su
+# StandardScaler) una sola vez por combinación de datos + hiperparámetros y lo
+# guarda con joblib en CHURN_MODEL_DIR:
+#
+#   - la clave del archivo es un hash de la matriz de features y el target,
+#     de los hiperparámetros y de la versión de scikit-learn
+#   - load_or_train() reutiliza el archivo si existe y si no entrena y lo
+#     escribe de forma atómica (varios workers pueden hacerlo a la vez)
+#   - ChurnModel.score() puntúa miles de clientes por llamada en lotes
+#     vectorizados (scaler + predict_proba sobre la matriz completa)
+#   - churn_models carga el modelo de cada dataset la primera vez que se pide
+#     (lo usa el endpoint /api/churn-score de app.py)
+#   - el entrenamiento construye los árboles en paralelo y
+#     cross_validate_churn_model() evalúa los folds en paralelo (n_jobs)
+#
+# Configuración por variables de entorno:
+#   CHURN_MODEL_DIR     -> carpeta de los modelos entrenados
+#   CHURN_SCORE_BATCH   -> filas por lote al puntuar
+#   CHURN_N_JOBS        -> núcleos para entrenar / validar (-1 = todos)
+#   CHURN_CV_FOLDS      -> folds de la validación cruzada
+# =============================================================================
+
+import hashlib
+import json
+import os
+import threading
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import classification_report, confusion_matrix
+from sklearn.model_selection import StratifiedKFold, cross_validate, train_test_split
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+from churn_data import feature_matrix, get_dataset, register_dataset
+
+MODEL_DIR = os.environ.get('CHURN_MODEL_DIR', os.path.join('Data', 'models'))
+SCORE_BATCH_ROWS = int(os.environ.get('CHURN_SCORE_BATCH', 50000))
+N_JOBS = int(os.environ.get('CHURN_N_JOBS', -1))
+CV_FOLDS = int(os.environ.get('CHURN_CV_FOLDS', 5))
+
+# Variables de entrada del modelo (mismo orden que usaba analysis.py)
+MODEL_FEATURES = ['Account length', 'International plan', 'Voice mail plan',
+                  'Number vmail messages', 'Total day minutes', 'Total day calls',
+                  'Total day charge', 'Total eve minutes', 'Total eve calls',
+                  'Total eve charge', 'Total night minutes', 'Total night calls',
+                  'Total night charge', 'Total intl minutes', 'Total intl calls',
+                  'Total intl charge', 'Customer service calls']
+
+# Hiperparámetros por defecto (los del modelo original de analysis.py)
+DEFAULT_PARAMS = {'n_estimators': 100, 'random_state': 42}
+
+# Proporción de datos reservada para evaluar el modelo
+TEST_SIZE = 0.2
+
+
+class ChurnModel:
+    """RandomForest + StandardScaler entrenados, con sus métricas de evaluación"""
+
+    def __init__(self, model, scaler, features, key, report, matrix):
+        """
+        Args:
+            model (RandomForestClassifier): Clasificador entrenado
+            scaler (StandardScaler): Normalización ajustada sobre el train
+            features (list): Columnas de entrada, en orden
+            key (str): Clave de datos + hiperparámetros (nombre del archivo)
+            report (str): classification_report sobre el conjunto de test
+            matrix (np.ndarray): confusion_matrix sobre el conjunto de test
+        """
+        self.model = model
+        self.scaler = scaler
+        self.features = list(features)
+        self.key = key
+        self.classification_report = report
+        self.confusion_matrix = matrix
+
+    @property
+    def feature_importance(self):
+        """Importancia de cada feature, de mayor a menor"""
+        return pd.DataFrame({
+            'feature': self.features,
+            'importance': self.model.feature_importances_
+        }).sort_values('importance', ascending=False)
+
+    def score(self, df, batch_size=SCORE_BATCH_ROWS):
+        """
+        Probabilidad de churn de cada cliente.
+
+        Args:
+            df (pd.DataFrame): Clientes con las columnas de self.features
+                (booleanas como bool, 0/1 o 'Yes'/'No')
+            batch_size (int): Filas por lote (acota la memoria intermedia)
+
+        Returns:
+            np.ndarray: Probabilidades en [0, 1], una por fila
+        """
+        features = feature_matrix(df, self.features)
+        scores = np.empty(len(features))
+        for start in range(0, len(features), batch_size):
+            batch = self.scaler.transform(features[start:start + batch_size])
+            scores[start:start + batch_size] = self.model.predict_proba(batch)[:, 1]
+        return scores
+
+
+def model_key(df, params=None, features=MODEL_FEATURES):
+    """
+    Clave del modelo: hash de los datos de entrenamiento (features + Churn),
+    de los hiperparámetros y de la versión de scikit-learn.
+
+    Returns:
+        str: 16 caracteres hexadecimales
+    """
+    params = {**DEFAULT_PARAMS, **(params or {})}
+    digest = hashlib.sha1(feature_matrix(df, list(features) + ['Churn']).tobytes())
+    digest.update(json.dumps({
+        'features': list(features),
+        'params': params,
+        'test_size': TEST_SIZE,
+        'sklearn': sklearn.__version__
+    }, sort_keys=True).encode())
+    return digest.hexdigest()[:16]
+
+
+def train_churn_model(df, params=None, features=MODEL_FEATURES, n_jobs=N_JOBS):
+    """
+    Entrena y evalúa el modelo (split 80/20 como el análisis original).
+    n_jobs no forma parte de la clave: los árboles salen iguales con
+    cualquier cantidad de núcleos.
+    """
+    params = {**DEFAULT_PARAMS, **(params or {})}
+    X = feature_matrix(df, features)
+    y = feature_matrix(df, ['Churn'])[:, 0].astype(int)
+
+    # Dividir datos
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=TEST_SIZE, random_state=42)
+
+    # Escalar datos
+    scaler = StandardScaler()
+    X_train_scaled = scaler.fit_transform(X_train)
+    X_test_scaled = scaler.transform(X_test)
+
+    # Entrenar y evaluar
+    rf_model = RandomForestClassifier(**params, n_jobs=n_jobs)
+    rf_model.fit(X_train_scaled, y_train)
+    y_pred = rf_model.predict(X_test_scaled)
+
+    return ChurnModel(rf_model, scaler, features, model_key(df, params, features),
+                      classification_report(y_test, y_pred), confusion_matrix(y_test, y_pred))
+
+
+def cross_validate_churn_model(df, params=None, features=MODEL_FEATURES, folds=CV_FOLDS, n_jobs=N_JOBS):
+    """
+    Validación cruzada estratificada del modelo (scaler + RandomForest),
+    con un proceso por fold.
+
+    Returns:
+        dict: Arrays 'accuracy' y 'roc_auc' con el resultado de cada fold
+    """
+    params = {**DEFAULT_PARAMS, **(params or {})}
+    X = feature_matrix(df, features)
+    y = feature_matrix(df, ['Churn'])[:, 0].astype(int)
+
+    # Los folds se reparten los núcleos: cada bosque se entrena en un solo hilo
+    pipeline = make_pipeline(StandardScaler(), RandomForestClassifier(**params, n_jobs=1))
+    cv = StratifiedKFold(n_splits=folds, shuffle=True, random_state=42)
+    scores = cross_validate(pipeline, X, y, cv=cv, scoring=['accuracy', 'roc_auc'], n_jobs=n_jobs)
+    return {'accuracy': scores['test_accuracy'], 'roc_auc': scores['test_roc_auc']}
+
+
+def load_or_fit(path, fit):
+    """
+    Carga el modelo guardado en 'path' o, si no existe, lo crea con fit() y lo
+    guarda de forma atómica (varios workers pueden entrenarlo a la vez).
+
+    Args:
+        path (str): Archivo .joblib del modelo
+        fit (callable): Función sin argumentos que entrena el modelo
+
+    Returns:
+        object: Modelo cargado o recién entrenado
+    """
+    try:
+        return joblib.load(path)
+    except (OSError, EOFError):
+        pass
+
+    model = fit()
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        joblib.dump(model, tmp_path)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return model
+
+
+def load_or_train(df, params=None, features=MODEL_FEATURES, model_dir=MODEL_DIR, n_jobs=N_JOBS):
+    """
+    Devuelve el modelo guardado para estos datos e hiperparámetros; si no
+    existe, lo entrena y lo guarda.
+
+    Args:
+        df (pd.DataFrame): Datos de entrenamiento (con la columna Churn)
+        params (dict): Hiperparámetros del RandomForest (sobre DEFAULT_PARAMS)
+        features (list): Columnas de entrada
+        model_dir (str): Carpeta de los modelos
+        n_jobs (int): Núcleos para entrenar si no hay modelo guardado
+
+    Returns:
+        ChurnModel: Modelo listo para score()
+    """
+    path = os.path.join(model_dir, f"churn-{model_key(df, params, features)}.joblib")
+    return load_or_fit(path, lambda: train_churn_model(df, params, features, n_jobs))
+
+
+class ChurnModelRegistry:
+    """Modelo de cada dataset de churn, cargado (o entrenado) al primer uso"""
+
+    def __init__(self, params=None):
+        self.params = params
+        self._lock = threading.Lock()
+        # key del dataset -> (versión, ChurnModel)
+        self._models = {}
+
+    def get(self, dataset):
+        """
+        Args:
+            dataset (str): 'churn-20' o 'churn-80'
+
+        Returns:
+            ChurnModel: Modelo entrenado sobre la versión actual del dataset
+        """
+        ref = register_dataset(dataset)
+        with self._lock:
+            cached = self._models.get(dataset)
+            if cached is None or cached[0] != ref['version']:
+                cached = (ref['version'], load_or_train(get_dataset(ref), self.params))
+                self._models[dataset] = cached
+        return cached[1]
+
+
+# Registro compartido por el endpoint de scoring
+churn_models = ChurnModelRegistry()
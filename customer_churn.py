@@ -0,0 +1,198 @@
+# =============================================================================
+# RIESGO DE CHURN DE LOS CLIENTES DE BILLING CON UN MODELO EN CACHÉ
+# =============================================================================
+# La pestaña Customer Analysis mostraba un churn_risk sorteado al generar los
+# datos. Aquí ese valor sale de un RandomForest (como el de churn_model.py)
+# entrenado sobre las columnas de la tabla customers y guardado con joblib:
+#
+#   - el modelo se entrena una vez por versión de datos + hiperparámetros y
+#     se reutiliza desde CHURN_MODEL_DIR en los arranques siguientes
+#   - los clientes con los que se entrenó se muestran con scores fuera de
+#     muestra (cross_val_predict, cada cliente puntuado por un modelo que no
+#     lo vio), guardados en CHURN_MODEL_DIR junto al modelo
+#   - CustomerChurnScorer reutiliza esos scores y después puntúa solo los
+#     clientes nuevos o cuyas columnas cambiaron (detectados por un hash de
+#     cada fila) con el modelo completo
+#
+# La tabla sintética no trae un churn observado: el modelo se entrena con
+# resultados de churn simulados a partir de las columnas del cliente (con
+# semilla fija, ver churn_labels()); el churn_risk sorteado por el generador
+# no interviene. Con datos reales alcanza con reemplazar churn_labels() por
+# la columna real.
+# =============================================================================
+
+import hashlib
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import StratifiedKFold, cross_val_predict
+
+from churn_model import CV_FOLDS, MODEL_DIR, N_JOBS, load_or_fit
+from synthetic_data import INCOME_LEVELS, PAYMENT_METHODS, REGIONS
+
+# Columnas numéricas y categóricas (con sus categorías) que usa el modelo
+NUMERIC_FEATURES = ['age', 'tenure_months', 'monthly_bill', 'services_count', 'satisfaction_score']
+CATEGORICAL_FEATURES = {
+    'income_level': INCOME_LEVELS,
+    'payment_method': PAYMENT_METHODS,
+    'region': REGIONS,
+}
+
+# Hiperparámetros: hojas de al menos 10 clientes para que el score sea una
+# probabilidad suave y no memorice a los clientes del entrenamiento
+CUSTOMER_MODEL_PARAMS = {'n_estimators': 100, 'min_samples_leaf': 10, 'random_state': 42}
+
+
+def customer_features(df):
+    """
+    Matriz de features: columnas numéricas + one-hot de las categóricas.
+
+    Returns:
+        np.ndarray: Matriz float64 de len(df) x n_features
+    """
+    blocks = [df[NUMERIC_FEATURES].to_numpy(dtype=np.float64)]
+    for col, categories in CATEGORICAL_FEATURES.items():
+        codes = pd.Categorical(df[col], categories=categories).codes
+        # Código -1 (categoría desconocida) queda con todos los indicadores en 0
+        blocks.append((codes[:, None] == np.arange(len(categories))[None, :]).astype(np.float64))
+    return np.hstack(blocks)
+
+
+def churn_labels(df, seed=42):
+    """
+    Churn observado simulado (la tabla sintética no lo trae): cada cliente
+    abandona con una probabilidad que sube con la factura y baja con la
+    satisfacción y la antigüedad.
+
+    Returns:
+        np.ndarray: 1 si el cliente abandonó, 0 si no
+    """
+    logit = (3.0
+             - 0.6 * df['satisfaction_score'].to_numpy()
+             - 0.02 * df['tenure_months'].to_numpy()
+             + 0.03 * (df['monthly_bill'].to_numpy() - 50))
+    probability = 1 / (1 + np.exp(-logit))
+    rng = np.random.default_rng(seed)
+    return (rng.random(len(df)) < probability).astype(int)
+
+
+def train_customer_model(df, params=None, n_jobs=N_JOBS):
+    """Entrena el RandomForest de churn sobre la tabla customers"""
+    params = {**CUSTOMER_MODEL_PARAMS, **(params or {})}
+    model = RandomForestClassifier(**params, n_jobs=n_jobs)
+    model.fit(customer_features(df), churn_labels(df))
+    return model
+
+
+def out_of_fold_scores(df, params=None, folds=CV_FOLDS, n_jobs=N_JOBS):
+    """
+    Probabilidad de churn de cada cliente según un modelo entrenado sin él
+    (cross_val_predict con StratifiedKFold), para no mostrar scores dentro
+    de muestra.
+
+    Returns:
+        np.ndarray: Probabilidades en [0, 1], una por fila de df
+    """
+    params = {**CUSTOMER_MODEL_PARAMS, **(params or {})}
+    cv = StratifiedKFold(n_splits=folds, shuffle=True, random_state=42)
+    return cross_val_predict(RandomForestClassifier(**params), customer_features(df), churn_labels(df),
+                             cv=cv, method='predict_proba', n_jobs=n_jobs)[:, 1]
+
+
+def _customer_model_path(df, params, model_dir, suffix=''):
+    """Archivo en model_dir identificado por los clientes, sus etiquetas y los hiperparámetros"""
+    digest = hashlib.sha1(customer_features(df).tobytes())
+    digest.update(churn_labels(df).tobytes())
+    digest.update(repr(sorted(params.items())).encode())
+    return os.path.join(model_dir, f"customers-{digest.hexdigest()[:16]}{suffix}.joblib")
+
+
+def load_or_train_customer_model(df, params=None, model_dir=MODEL_DIR):
+    """Modelo guardado para estos clientes e hiperparámetros (lo entrena si no existe)"""
+    params = {**CUSTOMER_MODEL_PARAMS, **(params or {})}
+    return load_or_fit(_customer_model_path(df, params, model_dir), lambda: train_customer_model(df, params))
+
+
+def load_or_compute_out_of_fold_scores(df, params=None, model_dir=MODEL_DIR):
+    """Scores fuera de muestra guardados para estos clientes (los calcula si no existen)"""
+    params = {**CUSTOMER_MODEL_PARAMS, **(params or {})}
+    return load_or_fit(_customer_model_path(df, params, model_dir, '-oof'), lambda: out_of_fold_scores(df, params))
+
+
+class CustomerChurnScorer:
+    """Scores de churn por cliente, recalculados solo para las filas que cambian"""
+
+    def __init__(self, model):
+        """
+        Args:
+            model (RandomForestClassifier): Modelo entrenado (ver load_or_train_customer_model)
+        """
+        self.model = model
+        self._lock = threading.Lock()
+        # customer_id -> hash de las columnas del modelo / score
+        self._hashes = pd.Series(dtype='Int64')
+        self._scores = pd.Series(dtype=np.float64)
+
+    def score(self, df):
+        """Probabilidad de churn de cada fila (un solo predict_proba sobre el lote)"""
+        if len(df) == 0:
+            return np.empty(0)
+        return self.model.predict_proba(customer_features(df))[:, 1]
+
+    @staticmethod
+    def _row_hashes(df):
+        """Hash de las columnas del modelo de cada fila"""
+        columns = NUMERIC_FEATURES + list(CATEGORICAL_FEATURES)
+        return pd.util.hash_pandas_object(df[columns], index=False).to_numpy().view(np.int64)
+
+    @staticmethod
+    def _check_ids(df):
+        duplicated = df['customer_id'][df['customer_id'].duplicated()].unique()
+        if len(duplicated):
+            raise ValueError(f"customer_id repetidos en el lote: {list(duplicated[:10])}")
+
+    def prime(self, df, scores):
+        """
+        Registra scores ya calculados para los clientes de df (p. ej. los de
+        out_of_fold_scores()); score_frame los reutiliza mientras esas filas
+        no cambien.
+        """
+        self._check_ids(df)
+        ids = df['customer_id'].to_numpy()
+        with self._lock:
+            self._hashes = pd.Series(self._row_hashes(df), index=ids, dtype='Int64')
+            self._scores = pd.Series(np.asarray(scores, dtype=np.float64), index=ids)
+
+    def score_frame(self, df):
+        """
+        Devuelve una copia de df con churn_risk según el modelo. Solo se
+        puntúan los clientes nuevos o cuyas columnas cambiaron desde la
+        última llamada; el resto reutiliza su score.
+
+        Args:
+            df (pd.DataFrame): Clientes (customer_id + columnas del modelo)
+
+        Returns:
+            pd.DataFrame: df con la columna churn_risk reemplazada
+
+        Raises:
+            ValueError: Si un customer_id aparece más de una vez en df
+        """
+        self._check_ids(df)
+        ids = df['customer_id'].to_numpy()
+        hashes = self._row_hashes(df)
+
+        with self._lock:
+            known = self._hashes.reindex(ids)
+            stale = known.ne(hashes).fillna(True).to_numpy(dtype=bool)
+            if stale.any():
+                stale_ids = pd.Index(ids[stale])
+                keep = ~self._hashes.index.isin(stale_ids)
+                self._hashes = pd.concat([self._hashes[keep], pd.Series(hashes[stale], index=stale_ids, dtype='Int64')])
+                self._scores = pd.concat([self._scores[keep], pd.Series(self.score(df[stale]), index=stale_ids)])
+            scores = self._scores.reindex(ids).to_numpy()
+
+        return df.assign(churn_risk=np.round(scores, 2))
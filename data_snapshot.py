@@ -0,0 +1,170 @@
+# =============================================================================
+# SNAPSHOTS INMUTABLES DE LAS TABLAS DEL DASHBOARD
+# =============================================================================
+# Los callbacks leían y escribían directamente el dict global 'data'. Con
+# gunicorn en modo threads eso no es seguro: un callback puede ver una tabla a
+# medio reemplazar, o agregarle columnas que ven todos los demás.
+#
+# SnapshotStore guarda una versión inmutable de todas las tablas:
+#
+#   - cada tabla se "congela": sus arrays de NumPy (y los códigos de las
+#     categóricas) son de solo lectura, así que escribir valores falla con
+#     ValueError en lugar de modificar los datos compartidos
+#   - Snapshot.table() entrega una copia superficial: sin copiar datos, pero
+#     agregar o reemplazar columnas solo afecta a quien la pidió
+#   - Snapshot.derived() calcula una columna derivada (buckets, segmentos,
+#     ...) una sola vez por snapshot y la comparte entre los callbacks
+#   - update() / append() / upsert() arman un snapshot nuevo y lo publican con
+#     una sola asignación: quien ya tenía el anterior lo sigue viendo completo
+#   - Snapshot.companions guarda objetos calculados a partir de todas las
+#     tablas (p. ej. los agregados de billing_aggregates.py); se arman antes
+#     de publicar el snapshot y se publican junto con él
+# =============================================================================
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+
+def freeze(df):
+    """
+    Copia de df cuyas columnas no se pueden modificar.
+
+    Args:
+        df (pd.DataFrame): Tabla original (no se modifica)
+
+    Returns:
+        pd.DataFrame: Tabla con arrays de solo lectura
+    """
+    columns = {}
+    for col in df.columns:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes = np.array(series.cat.codes.to_numpy(), copy=True)
+            codes.flags.writeable = False
+            columns[col] = pd.Categorical.from_codes(codes, dtype=series.dtype)
+        elif isinstance(series.dtype, np.dtype):
+            values = np.array(series.to_numpy(), copy=True)
+            values.flags.writeable = False
+            columns[col] = values
+        else:
+            columns[col] = series.array.copy()
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+
+class Snapshot:
+    """Versión inmutable de las tablas, con caché de columnas derivadas"""
+
+    def __init__(self, tables, version=1, frozen=(), companions=None):
+        """
+        Args:
+            tables (dict): Nombre -> DataFrame
+            version (int): Número de versión del snapshot
+            frozen (iterable): Tablas que ya están congeladas (se reutilizan sin copiar)
+            companions (dict): Nombre -> objeto derivado de las tablas (ver SnapshotStore)
+        """
+        self.version = version
+        self._tables = {name: df if name in frozen else freeze(df) for name, df in tables.items()}
+        self._derived = {}
+        self._lock = threading.Lock()
+        self.companions = dict(companions or {})
+
+    def __contains__(self, name):
+        return name in self._tables
+
+    def table(self, name):
+        """Vista de solo lectura de la tabla (copia superficial, sin copiar datos)"""
+        return self._tables[name].copy(deep=False)
+
+    def tables(self):
+        """Vistas de solo lectura de todas las tablas"""
+        return {name: self.table(name) for name in self._tables}
+
+    def derived(self, table, key, compute):
+        """
+        Columna derivada de una tabla, calculada una sola vez por snapshot.
+
+        Args:
+            table (str): Tabla de origen
+            key (str): Nombre de la columna derivada ('segment', 'churn_group', ...)
+            compute (callable): Función tabla -> valores (p. ej. una regla de bucketing.py)
+
+        Returns:
+            object: Resultado de compute (compartido: tratar como de solo lectura)
+        """
+        with self._lock:
+            if (table, key) not in self._derived:
+                self._derived[(table, key)] = compute(self._tables[table])
+            return self._derived[(table, key)]
+
+    def replace(self, **tables):
+        """Nuevo snapshot con algunas tablas reemplazadas (las demás se comparten)"""
+        merged = {**self._tables, **tables}
+        unchanged = [name for name in self._tables if name not in tables]
+        return Snapshot(merged, self.version + 1, frozen=unchanged, companions=self.companions)
+
+
+class SnapshotStore:
+    """
+    Snapshot vigente de las tablas; los cambios publican uno nuevo de forma
+    atómica.
+
+    Los métodos que publican aceptan 'companions': una función snapshot nuevo
+    -> {nombre: objeto} que se ejecuta antes de publicarlo (ahí
+    snapshot.companions todavía tiene los objetos del snapshot anterior), así
+    las tablas y sus objetos derivados cambian juntos.
+    """
+
+    def __init__(self, tables, companions=None):
+        """
+        Args:
+            tables (dict): Tablas iniciales (p. ej. las de load_synthetic_data())
+            companions (callable): Objetos derivados del snapshot inicial
+        """
+        self._lock = threading.Lock()
+        self._current = None
+        self._publish(Snapshot(tables), companions)
+
+    def _publish(self, snapshot, companions):
+        if companions is not None:
+            snapshot.companions.update(companions(snapshot))
+        self._current = snapshot
+        return snapshot
+
+    def current(self):
+        """Snapshot vigente (un callback debería pedirlo una vez y usar solo ese)"""
+        return self._current
+
+    def update(self, companions=None, **tables):
+        """Reemplaza tablas completas y publica el nuevo snapshot"""
+        with self._lock:
+            return self._publish(self._current.replace(**tables), companions)
+
+    def append(self, table, rows, companions=None):
+        """Agrega filas al final de una tabla y publica el nuevo snapshot"""
+        with self._lock:
+            combined = pd.concat([self._current.table(table), rows], ignore_index=True)
+            return self._publish(self._current.replace(**{table: combined}), companions)
+
+    def upsert(self, table, rows, key, companions=None):
+        """
+        Reemplaza las filas con el mismo 'key' (p. ej. clientes modificados)
+        en su misma posición, agrega las nuevas al final y publica el nuevo
+        snapshot.
+
+        Raises:
+            ValueError: Si un valor de 'key' aparece más de una vez en rows
+        """
+        duplicated = rows[key][rows[key].duplicated()].unique()
+        if len(duplicated):
+            raise ValueError(f"{table}: {key} repetidos en el lote: {list(duplicated[:10])}")
+        with self._lock:
+            combined = pd.concat([self._current.table(table), rows], ignore_index=True)
+            # Orden de la primera aparición de cada clave: las filas
+            # reemplazadas conservan la posición de la fila original
+            order = combined.groupby(key, sort=False, observed=True, dropna=False).ngroup()
+            combined = combined.drop_duplicates(key, keep='last')
+            combined = combined.iloc[np.argsort(order[combined.index].to_numpy(), kind='stable')]
+            combined = combined.reset_index(drop=True)
+            return self._publish(self._current.replace(**{table: combined}), companions)
@@ -0,0 +1,135 @@
+# =============================================================================
+# DOWNSAMPLING DE SERIES TEMPORALES PARA GRÁFICOS DE RANGO LARGO
+# =============================================================================
+# Un gráfico no puede mostrar más puntos que píxeles de ancho: enviar 30 días
+# por minuto o por segundo solo agranda el payload. downsample() elige la
+# resolución según el rango pedido y el ancho del gráfico:
+#
+#   1. si la ventana cruda entra en el presupuesto de puntos, se envía tal cual
+#   2. si no, se usa el rollup precalculado más fino que entre (1min, 1h, 1D)
+#   3. si el rollup queda demasiado grueso, LTTB sobre los datos crudos
+#
+# Así el payload queda acotado por el ancho del gráfico y no por la historia.
+# =============================================================================
+
+import numpy as np
+import pandas as pd
+
+# Resoluciones de los rollups precalculados, de la más fina a la más gruesa
+ROLLUP_RULES = ['1min', '1h', '1D']
+
+# Ancho por defecto cuando el navegador todavía no informó el suyo
+DEFAULT_WIDTH_PX = 1200
+
+
+def points_budget(width_px=None, points_per_px=1):
+    """Cantidad máxima de puntos a enviar para un gráfico de width_px de ancho"""
+    return int((width_px or DEFAULT_WIDTH_PX) * points_per_px)
+
+
+def rollup(df, rule, x='timestamp'):
+    """Promedio de las columnas numéricas por intervalo 'rule' (sin intervalos vacíos)"""
+    return df.resample(rule, on=x).mean(numeric_only=True).dropna(how='all').reset_index()
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Índices elegidos por Largest-Triangle-Three-Buckets: conserva la forma de
+    la serie (picos incluidos) con n_out puntos.
+
+    Args:
+        x (np.ndarray): Eje x numérico y ascendente
+        y (np.ndarray): Valores
+        n_out (int): Puntos de salida (incluye el primero y el último)
+
+    Returns:
+        np.ndarray: Índices de los puntos elegidos
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    # Límites de los n_out - 2 buckets interiores
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        # Promedio del bucket siguiente (o el último punto)
+        next_start, next_end = end, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        # Punto del bucket actual que forma el triángulo de mayor área
+        area = np.abs(
+            (x[previous] - avg_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (avg_y - y[previous])
+        )
+        previous = start + int(np.argmax(area))
+        selected[i + 1] = previous
+    return selected
+
+
+def minmax_indices(y, n_out):
+    """
+    Índices del mínimo y el máximo de cada bucket (n_out // 2 buckets):
+    más barato que LTTB y conserva todos los extremos.
+    """
+    n = len(y)
+    n_buckets = max(n_out // 2, 1)
+    if n <= n_out:
+        return np.arange(n)
+
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(0, n, n_buckets + 1).astype(np.int64)
+    # Rellenar a buckets de igual largo para usar argmin/argmax vectorizados
+    width = int(np.diff(edges).max())
+    offsets = edges[:-1, None] + np.arange(width)[None, :]
+    valid = offsets < edges[1:, None]
+    padded = np.where(valid, y[np.minimum(offsets, n - 1)], np.nan)
+    lows = edges[:-1] + np.nanargmin(padded, axis=1)
+    highs = edges[:-1] + np.nanargmax(padded, axis=1)
+    return np.unique(np.concatenate([lows, highs]))
+
+
+def downsample(df, max_points, value_column, x='timestamp', rollups=None, method='lttb'):
+    """
+    Reduce una ventana de la serie a lo sumo max_points filas.
+
+    Args:
+        df (pd.DataFrame): Ventana cruda, ordenada por x
+        max_points (int): Presupuesto de puntos (ver points_budget())
+        value_column (str): Columna que guía LTTB / min-max
+        x (str): Columna de tiempo
+        rollups (callable): rule -> DataFrame con el rollup precalculado de
+            toda la serie; si es None los rollups se calculan sobre df
+        method (str): 'lttb' o 'minmax' para el último paso
+
+    Returns:
+        pd.DataFrame: Filas a graficar
+    """
+    if len(df) <= max_points:
+        return df
+
+    start, end = df[x].iloc[0], df[x].iloc[-1]
+    span = end - start
+    for rule in ROLLUP_RULES:
+        if span / pd.Timedelta(rule) > max_points:
+            continue
+        rolled = rollups(rule) if rollups is not None else rollup(df, rule, x)
+        rolled = rolled[(rolled[x] >= start.floor(rule)) & (rolled[x] <= end)]
+        # Un rollup con muy pocos puntos pierde la forma de la serie: en ese
+        # caso conviene LTTB sobre los datos crudos
+        if len(rolled) >= max_points // 4:
+            return rolled.reset_index(drop=True)
+        break
+
+    if method == 'minmax':
+        indices = minmax_indices(df[value_column].to_numpy(), max_points)
+    else:
+        x_values = df[x].to_numpy().astype('datetime64[ns]').astype(np.int64)
+        indices = lttb_indices(x_values, df[value_column].to_numpy(), max_points)
+    return df.iloc[indices].reset_index(drop=True)
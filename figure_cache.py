@@ -0,0 +1,144 @@
+# =============================================================================
+# CACHÉ DE FIGURAS PARA LOS CALLBACKS DEL DASHBOARD
+# =============================================================================
+# Los callbacks del dashboard de churn son deterministas: para un mismo
+# dataset (y versión) y los mismos parámetros siempre devuelven la misma
+# figura. Este módulo memoriza esos resultados en un LRU acotado por cantidad
+# de entradas y, opcionalmente, vuelca a disco las entradas desalojadas para
+# recuperarlas sin recalcular (correlación, PCA, ...).
+#
+# Las figuras se vuelcan como dict (fig.to_plotly_json()): al leerlas de disco
+# se devuelven como dict, que Dash acepta igual que un go.Figure y evita
+# volver a validar toda la figura al reconstruirla.
+#
+# Configuración por variables de entorno:
+#   FIGURE_CACHE_SIZE  -> máximo de entradas en memoria (por defecto 64)
+#   FIGURE_CACHE_DIR   -> carpeta para el volcado a disco (por defecto, sin volcado)
+# =============================================================================
+
+import functools
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+
+def _to_plain(value):
+    """Convierte figuras (también dentro de tuplas) a dict para volcarlas a disco"""
+    if hasattr(value, 'to_plotly_json'):
+        return value.to_plotly_json()
+    if isinstance(value, (tuple, list)):
+        return type(value)(_to_plain(v) for v in value)
+    return value
+
+
+class FigureCache:
+    """LRU de resultados de callbacks con volcado opcional a disco"""
+
+    def __init__(self, max_entries=64, spill_dir=None):
+        """
+        Args:
+            max_entries (int): Máximo de entradas que se mantienen en memoria
+            spill_dir (str): Carpeta donde se guardan las entradas desalojadas
+        """
+        self.max_entries = max_entries
+        self.spill_dir = spill_dir
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+
+    def _spill_path(self, key):
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()
+        return os.path.join(self.spill_dir, f"{digest}.pkl")
+
+    def get(self, key):
+        """Devuelve (True, valor) si la clave está en memoria o en disco"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, self._entries[key]
+
+        if self.spill_dir:
+            try:
+                with open(self._spill_path(key), 'rb') as f:
+                    value = pickle.load(f)
+            except (OSError, pickle.PickleError, EOFError):
+                pass
+            else:
+                self.put(key, value)
+                with self._lock:
+                    self.hits += 1
+                return True, value
+
+        with self._lock:
+            self.misses += 1
+        return False, None
+
+    def put(self, key, value):
+        """Guarda un valor y desaloja (o vuelca a disco) el menos usado"""
+        evicted = []
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                evicted.append(self._entries.popitem(last=False))
+
+        if self.spill_dir:
+            for old_key, old_value in evicted:
+                tmp_path = f"{self._spill_path(old_key)}.tmp-{os.getpid()}"
+                try:
+                    with open(tmp_path, 'wb') as f:
+                        pickle.dump(_to_plain(old_value), f, protocol=pickle.HIGHEST_PROTOCOL)
+                    os.replace(tmp_path, self._spill_path(old_key))
+                except OSError:
+                    pass
+
+    def clear(self):
+        """Vacía la memoria (los archivos volcados a disco se conservan)"""
+        with self._lock:
+            self._entries.clear()
+
+
+# Caché por defecto compartido por todos los callbacks del proceso
+figure_cache = FigureCache(
+    max_entries=int(os.environ.get('FIGURE_CACHE_SIZE', 64)),
+    spill_dir=os.environ.get('FIGURE_CACHE_DIR') or None
+)
+
+
+def cached_figure(func=None, cache=None):
+    """
+    Decorador que memoriza el resultado de un callback por
+    (nombre del callback, versión del dataset, parámetros).
+
+    El primer argumento del callback debe ser la referencia del dataset
+    guardada en el dcc.Store ({'key', 'version', ...}); si está vacía, el
+    callback se ejecuta sin caché.
+
+    Uso:
+        @callback(Output(...), Input('data-store', 'data'))
+        @cached_figure
+        def update_algo(data): ...
+    """
+    if func is None:
+        return functools.partial(cached_figure, cache=cache)
+
+    @functools.wraps(func)
+    def wrapper(data, *args, **kwargs):
+        if not data:
+            return func(data, *args, **kwargs)
+
+        store = cache or figure_cache
+        key = (func.__name__, data.get('version'), args, tuple(sorted(kwargs.items())))
+        found, value = store.get(key)
+        if not found:
+            value = func(data, *args, **kwargs)
+            store.put(key, value)
+        return value
+
+    return wrapper
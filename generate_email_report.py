@@ -1,174 +1,25 @@
+import argparse
 import dash
 from dash import html, dcc
 import plotly.graph_objects as go
 import plotly.express as px
 import pandas as pd
-import numpy as np
-from datetime import datetime, timedelta
-import random
+from datetime import datetime
+from synthetic_data import load_synthetic_data
+from report_cache import ReportCache
+from report_compact import FLOAT_DECIMALS, PLOTLY_JS_URL, compact_json, render_compact_script, write_compressed
+from plotly_bundle import script_tag, trace_types
+from report_pipeline import PLOTLY_CDN_URL, build_charts, render_script
 import warnings
 warnings.filterwarnings('ignore')
 
-# Generar datos sintéticos (mismo código que en billing_dashboard.py)
-def generate_synthetic_data():
-    np.random.seed(42)
-    
-    # 1. Real-time data (últimas 24 horas)
-    timestamps = pd.date_range(start=datetime.now() - timedelta(hours=23), 
-                              end=datetime.now(), freq='H')
-    
-    real_time_data = []
-    for ts in timestamps:
-        real_time_data.append({
-            'timestamp': ts,
-            'total_revenue': np.random.uniform(50000, 150000),
-            'voice_revenue': np.random.uniform(20000, 60000),
-            'data_revenue': np.random.uniform(30000, 90000),
-            'calls_volume': np.random.randint(1000, 5000),
-            'data_volume_gb': np.random.uniform(500, 2000),
-            'messages_volume': np.random.randint(5000, 15000)
-        })
-    
-    real_time = pd.DataFrame(real_time_data)
-    
-    # 2. VIP Customers
-    vip_data = []
-    for i in range(50):
-        for day in range(30):
-            vip_data.append({
-                'customer_id': f'VIP_{i+1:03d}',
-                'date': datetime.now() - timedelta(days=29-day),
-                'voice_usage_minutes': np.random.uniform(200, 800),
-                'data_usage_gb': np.random.uniform(50, 200),
-                'monthly_bill': np.random.uniform(150, 500),
-                'satisfaction_score': np.random.uniform(7, 10),
-                'service_level': np.random.choice(['Premium', 'Enterprise', 'Gold']),
-                'pending_amount': np.random.uniform(0, 100)
-            })
-    
-    vip_customers = pd.DataFrame(vip_data)
-    
-    # 3. Departments
-    departments = ['Sales', 'Marketing', 'Engineering', 'Finance', 'HR', 'Operations', 'Support']
-    dept_data = []
-    for dept in departments:
-        for day in range(30):
-            dept_data.append({
-                'department': dept,
-                'date': datetime.now() - timedelta(days=29-day),
-                'billed_amount': np.random.uniform(10000, 100000),
-                'active_users': np.random.randint(50, 300),
-                'efficiency_score': np.random.uniform(0.7, 0.95),
-                'cost_per_user': np.random.uniform(50, 200)
-            })
-    
-    departments_df = pd.DataFrame(dept_data)
-    
-    # 4. Products
-    products = ['Internet Basic', 'Internet Premium', 'Cable TV', 'Phone Service', 'Bundle Package']
-    product_data = []
-    for product in products:
-        for day in range(30):
-            product_data.append({
-                'product': product,
-                'date': datetime.now() - timedelta(days=29-day),
-                'billed_amount': np.random.uniform(5000, 50000),
-                'subscribers': np.random.randint(100, 1000),
-                'churn_rate': np.random.uniform(0.02, 0.08),
-                'profit_margin': np.random.uniform(0.15, 0.35)
-            })
-    
-    products_df = pd.DataFrame(product_data)
-    
-    # 5. Complaints
-    complaint_types = ['Billing Issue', 'Service Outage', 'Speed Problem', 'Customer Service']
-    priorities = ['Low', 'Medium', 'High', 'Critical']
-    depts = ['Support', 'Billing', 'Technical', 'Sales']
-    
-    complaints_data = []
-    for day in range(30):
-        daily_complaints = np.random.randint(10, 50)
-        for _ in range(daily_complaints):
-            complaints_data.append({
-                'date': datetime.now() - timedelta(days=29-day),
-                'complaint_type': np.random.choice(complaint_types),
-                'priority': np.random.choice(priorities),
-                'resolution_time_hours': np.random.uniform(1, 72),
-                'satisfaction_score': np.random.uniform(1, 10),
-                'department': np.random.choice(depts),
-                'resolved': np.random.choice([True, False], p=[0.85, 0.15])
-            })
-    
-    complaints = pd.DataFrame(complaints_data)
-    
-    # 6. Customers
-    customer_data = []
-    for i in range(1000):
-        customer_data.append({
-            'customer_id': f'CUST_{i+1:04d}',
-            'age': np.random.randint(18, 80),
-            'income_level': np.random.choice(['Low', 'Medium', 'High', 'Very High']),
-            'tenure_months': np.random.randint(1, 120),
-            'region': np.random.choice(['North', 'South', 'East', 'West', 'Central']),
-            'monthly_bill': np.random.uniform(50, 300),
-            'services_count': np.random.randint(1, 5),
-            'payment_method': np.random.choice(['Credit Card', 'Bank Transfer', 'Cash', 'Digital Wallet']),
-            'satisfaction_score': np.random.uniform(1, 10),
-            'churn_risk': np.random.uniform(0, 1)
-        })
-    
-    customers = pd.DataFrame(customer_data)
-    
-    # 7. Network
-    network_data = []
-    for hour in range(24):
-        network_data.append({
-            'timestamp': datetime.now() - timedelta(hours=23-hour),
-            'traffic_volume_gbps': np.random.uniform(50, 200),
-            'connection_speed_mbps': np.random.uniform(100, 1000),
-            'uptime_percentage': np.random.uniform(95, 99.9),
-            'latency_ms': np.random.uniform(5, 50),
-            'active_connections': np.random.randint(10000, 50000),
-            'packet_loss_percentage': np.random.uniform(0, 2),
-            'bandwidth_utilization': np.random.uniform(30, 90)
-        })
-    
-    network = pd.DataFrame(network_data)
-    
-    # 8. Operations
-    operations_data = []
-    for day in range(30):
-        operations_data.append({
-            'date': datetime.now() - timedelta(days=29-day),
-            'invoices_processed': np.random.randint(500, 2000),
-            'processing_time_minutes': np.random.uniform(5, 30),
-            'automation_rate': np.random.uniform(0.6, 0.95),
-            'error_rate': np.random.uniform(0.01, 0.05),
-            'staff_productivity': np.random.uniform(0.7, 0.95),
-            'cost_per_invoice': np.random.uniform(2, 10),
-            'customer_satisfaction': np.random.uniform(7, 10)
-        })
-    
-    operations = pd.DataFrame(operations_data)
-    
-    return {
-        'real_time': real_time,
-        'vip_customers': vip_customers,
-        'departments': departments_df,
-        'products': products_df,
-        'complaints': complaints,
-        'customers': customers,
-        'network': network,
-        'operations': operations
-    }
+# Rango de los títulos cuando las tablas no traen df.attrs['period'] (report_batch.py)
+DEFAULT_PERIOD = "Last 30 Days"
 
-# Generar todos los gráficos
-def generate_all_charts():
-    data = generate_synthetic_data()
+# 1. Real-time Billing Charts
+def realtime_charts(data):
     charts = {}
-    
-    # 1. Real-time Billing Charts
-    df = data['real_time']
+    df = data['real_time'].tail(24)
     
     # Revenue Trends
     fig = go.Figure()
@@ -204,8 +55,11 @@ def generate_all_charts():
                                 values=[total_voice, total_data], hole=0.4)])
     fig.update_layout(title="Revenue Distribution", height=400)
     charts['revenue_distribution'] = fig
-    
-    # 2. VIP Customers Charts
+    return charts
+
+# 2. VIP Customers Charts
+def vip_charts(data):
+    charts = {}
     df = data['vip_customers']
     latest_vip = df.groupby('customer_id').last().reset_index()
     
@@ -245,9 +99,13 @@ def generate_all_charts():
                                 marker_colors=['#007bff', '#28a745', '#ffc107'])])
     fig.update_layout(title="VIP Service Level Distribution", height=400)
     charts['vip_service_levels'] = fig
-    
-    # 3. Department Charts
+    return charts
+
+# 3. Department Charts
+def department_charts(data):
+    charts = {}
     df = data['departments']
+    period = df.attrs.get('period', DEFAULT_PERIOD)
     latest_dept = df.groupby('department').last().reset_index()
     
     # Department Billing Trends
@@ -262,7 +120,7 @@ def generate_all_charts():
                                 mode='lines+markers', name=dept, 
                                 line=dict(color=colors[i % len(colors)], width=2)))
     
-    fig.update_layout(title="Department Billing Trends - Last 30 Days", height=400)
+    fig.update_layout(title=f"Department Billing Trends - {period}", height=400)
     charts['dept_billing_trends'] = fig
     
     # Department Performance
@@ -282,9 +140,13 @@ def generate_all_charts():
                                 marker_colors=['#007bff', '#28a745', '#ffc107', '#dc3545', '#6f42c1', '#fd7e14', '#20c997'])])
     fig.update_layout(title="Department Efficiency Distribution", height=400)
     charts['dept_efficiency'] = fig
-    
-    # 4. Product Charts
+    return charts
+
+# 4. Product Charts
+def product_charts(data):
+    charts = {}
     df = data['products']
+    period = df.attrs.get('period', DEFAULT_PERIOD)
     latest_products = df.groupby('product').last().reset_index()
     
     # Product Revenue Trends
@@ -299,7 +161,7 @@ def generate_all_charts():
                                 mode='lines+markers', name=product, 
                                 line=dict(color=colors[i % len(colors)], width=2)))
     
-    fig.update_layout(title="Product Revenue Trends - Last 30 Days", height=400)
+    fig.update_layout(title=f"Product Revenue Trends - {period}", height=400)
     charts['product_revenue_trends'] = fig
     
     # Product Performance
@@ -328,13 +190,19 @@ def generate_all_charts():
     fig.update_layout(title="Churn Rate Analysis by Product", 
                      yaxis2=dict(overlaying='y', side='right'), height=400, barmode='group')
     charts['product_churn_analysis'] = fig
-    
-    # 5. Complaints Charts
+    return charts
+
+# 5. Complaints Charts
+def complaint_charts(data):
+    charts = {}
     df = data['complaints']
     
     # Complaints Timeline
-    daily_complaints = df.groupby('date').size().reset_index(name='count')
-    daily_resolved = df[df['resolved']].groupby('date').size().reset_index(name='resolved_count')
+    daily_complaints = df.groupby(df['complaint_date'].dt.date).size().reset_index(name='count')
+    daily_complaints.columns = ['date', 'count']
+    resolved = df[df['status'] == 'Resolved']
+    daily_resolved = resolved.groupby(resolved['resolution_date'].dt.date).size().reset_index(name='resolved_count')
+    daily_resolved.columns = ['date', 'resolved_count']
     
     fig = go.Figure()
     fig.add_trace(go.Scatter(x=daily_complaints['date'], y=daily_complaints['count'], 
@@ -354,31 +222,34 @@ def generate_all_charts():
     charts['complaints_by_type'] = fig
     
     # Resolution Time Distribution
-    resolution_bins = pd.cut(df['resolution_time_hours'], bins=[0, 1, 24, 72, float('inf')], 
-                            labels=['Same Day', '1-24 Hours', '1-3 Days', '3+ Days'])
+    resolution_bins = pd.cut(df['resolution_time_days'], bins=[0, 1, 3, 7, 14, float('inf')], 
+                            labels=['Same Day', '1-3 Days', '4-7 Days', '8-14 Days', '15+ Days'])
     resolution_dist = resolution_bins.value_counts()
     fig = go.Figure(data=[go.Pie(labels=resolution_dist.index, values=resolution_dist.values, hole=0.4,
-                                marker_colors=['#28a745', '#ffc107', '#fd7e14', '#dc3545'])])
+                                marker_colors=['#28a745', '#ffc107', '#fd7e14', '#dc3545', '#6c757d'])])
     fig.update_layout(title="Resolution Time Distribution", height=400)
     charts['resolution_time_distribution'] = fig
     
     # Department Performance in Complaints
     dept_complaints = df.groupby('department').agg({
         'complaint_type': 'count',
-        'resolution_time_hours': 'mean',
-        'satisfaction_score': 'mean'
+        'resolution_time_days': 'mean',
+        'customer_satisfaction': 'mean'
     }).reset_index()
     
     fig = go.Figure()
     fig.add_trace(go.Bar(x=dept_complaints['department'], y=dept_complaints['complaint_type'], 
                         name='Total Complaints', marker_color='#007bff'))
-    fig.add_trace(go.Bar(x=dept_complaints['department'], y=dept_complaints['resolution_time_hours'], 
-                        name='Avg Resolution Time (h)', marker_color='#ffc107', yaxis='y2'))
+    fig.add_trace(go.Bar(x=dept_complaints['department'], y=dept_complaints['resolution_time_days'], 
+                        name='Avg Resolution Time (days)', marker_color='#ffc107', yaxis='y2'))
     fig.update_layout(title="Department Performance in Complaints", 
                      yaxis2=dict(overlaying='y', side='right'), height=400, barmode='group')
     charts['dept_complaints_performance'] = fig
-    
-    # 6. Customer Charts
+    return charts
+
+# 6. Customer Charts
+def customer_charts(data):
+    charts = {}
     df = data['customers']
     
     # Customer Demographics Analysis (Subplots)
@@ -408,9 +279,9 @@ def generate_all_charts():
     charts['customer_behavior'] = fig
     
     # Customer Segmentation
-    df['segment'] = pd.cut(df['monthly_bill'], bins=[0, 100, 200, float('inf')], 
-                          labels=['Low Value', 'Medium Value', 'High Value'])
-    segment_counts = df['segment'].value_counts()
+    segments = pd.cut(df['monthly_bill'], bins=[float('-inf'), 50, 80, float('inf')], 
+                      labels=['Low Value', 'Medium Value', 'High Value'])
+    segment_counts = segments.value_counts()
     fig = go.Figure(data=[go.Pie(labels=segment_counts.index, values=segment_counts.values, hole=0.4,
                                 marker_colors=['#ffc107', '#28a745', '#007bff'])])
     fig.update_layout(title="Customer Segmentation", height=400)
@@ -423,9 +294,12 @@ def generate_all_charts():
                             name='Risk vs Bill', marker_color='#007bff', yaxis='y2'))
     fig.update_layout(title="Churn Risk Analysis", yaxis2=dict(overlaying='y', side='right'), height=400)
     charts['churn_risk_analysis'] = fig
-    
-    # 7. Network Charts
-    df = data['network']
+    return charts
+
+# 7. Network Charts
+def network_charts(data):
+    charts = {}
+    df = data['network'].tail(24)
     
     # Network Performance Trends
     fig = go.Figure()
@@ -448,11 +322,11 @@ def generate_all_charts():
     fig = go.Figure()
     fig.add_trace(go.Scatter(x=df['timestamp'], y=df['active_connections'], 
                             mode='lines+markers', name='Active Connections', line=dict(color='#007bff')))
-    fig.add_trace(go.Scatter(x=df['timestamp'], y=df['packet_loss_percentage'], 
+    fig.add_trace(go.Scatter(x=df['timestamp'], y=df['packet_loss_percent'], 
                             mode='lines+markers', name='Packet Loss (%)', line=dict(color='#dc3545'), yaxis='y2'))
     fig.add_trace(go.Scatter(x=df['timestamp'], y=df['bandwidth_utilization'], 
                             mode='lines+markers', name='Bandwidth Utilization (%)', line=dict(color='#ffc107'), yaxis='y3'))
-    fig.add_trace(go.Scatter(x=df['timestamp'], y=df['uptime_percentage'], 
+    fig.add_trace(go.Scatter(x=df['timestamp'], y=df['uptime_percent'], 
                             mode='lines+markers', name='Uptime (%)', line=dict(color='#28a745'), yaxis='y4'))
     fig.update_layout(
         title="Network Metrics Analysis",
@@ -465,7 +339,7 @@ def generate_all_charts():
     charts['network_metrics_analysis'] = fig
     
     # Bandwidth Utilization
-    bandwidth_bins = pd.cut(df['bandwidth_utilization'], bins=[0, 30, 60, 80, 100], 
+    bandwidth_bins = pd.cut(df['bandwidth_utilization'], bins=[float('-inf'), 50, 75, 90, float('inf')], 
                            labels=['Low', 'Medium', 'High', 'Critical'])
     bandwidth_dist = bandwidth_bins.value_counts()
     fig = go.Figure(data=[go.Pie(labels=bandwidth_dist.index, values=bandwidth_dist.values, hole=0.4,
@@ -475,15 +349,18 @@ def generate_all_charts():
     
     # Network Health Dashboard
     fig = go.Figure()
-    fig.add_trace(go.Scatter(x=df['timestamp'], y=df['uptime_percentage'], 
+    fig.add_trace(go.Scatter(x=df['timestamp'], y=df['uptime_percent'], 
                             mode='lines+markers', name='Uptime (%)', line=dict(color='#28a745')))
-    fig.add_trace(go.Scatter(x=df['timestamp'], y=df['packet_loss_percentage']*10, 
+    fig.add_trace(go.Scatter(x=df['timestamp'], y=df['packet_loss_percent']*10, 
                             mode='lines+markers', name='Packet Loss (x10)', line=dict(color='#dc3545'), yaxis='y2'))
     fig.update_layout(title="Network Health Dashboard", 
                      yaxis2=dict(overlaying='y', side='right'), height=400)
     charts['network_health_dashboard'] = fig
-    
-    # 8. Operations Charts
+    return charts
+
+# 8. Operations Charts
+def operations_charts(data):
+    charts = {}
     df = data['operations']
     
     # Operations Performance Trends
@@ -492,7 +369,7 @@ def generate_all_charts():
                             mode='lines+markers', name='Invoices Processed', line=dict(color='#007bff')))
     fig.add_trace(go.Scatter(x=df['date'], y=df['processing_time_minutes'], 
                             mode='lines+markers', name='Processing Time (min)', line=dict(color='#ffc107'), yaxis='y2'))
-    fig.add_trace(go.Scatter(x=df['date'], y=df['automation_rate']*100, 
+    fig.add_trace(go.Scatter(x=df['date'], y=df['automation_rate_percent'], 
                             mode='lines+markers', name='Automation Rate (%)', line=dict(color='#28a745'), yaxis='y3'))
     fig.update_layout(
         title="Operations Performance Trends",
@@ -507,7 +384,7 @@ def generate_all_charts():
     fig = go.Figure()
     fig.add_trace(go.Scatter(x=df['date'], y=df['staff_productivity']*100, 
                             mode='lines+markers', name='Staff Productivity (%)', line=dict(color='#007bff')))
-    fig.add_trace(go.Scatter(x=df['date'], y=df['error_rate']*100, 
+    fig.add_trace(go.Scatter(x=df['date'], y=df['error_rate_percent'], 
                             mode='lines+markers', name='Error Rate (%)', line=dict(color='#dc3545'), yaxis='y2'))
     fig.add_trace(go.Scatter(x=df['date'], y=df['cost_per_invoice'], 
                             mode='lines+markers', name='Cost per Invoice ($)', line=dict(color='#ffc107'), yaxis='y3'))
@@ -524,7 +401,7 @@ def generate_all_charts():
     charts['operations_efficiency_analysis'] = fig
     
     # Cost Analysis by Operation
-    cost_bins = pd.cut(df['cost_per_invoice'], bins=[0, 3, 5, 7, float('inf')], 
+    cost_bins = pd.cut(df['cost_per_invoice'], bins=[float('-inf'), 1.5, 2.5, 3.5, float('inf')], 
                       labels=['Low', 'Medium', 'High', 'Very High'])
     cost_dist = cost_bins.value_counts()
     fig = go.Figure(data=[go.Pie(labels=cost_dist.index, values=cost_dist.values, hole=0.4,
@@ -534,20 +411,63 @@ def generate_all_charts():
     
     # Operations Health Dashboard
     fig = go.Figure()
-    fig.add_trace(go.Scatter(x=df['date'], y=df['automation_rate']*100, 
+    fig.add_trace(go.Scatter(x=df['date'], y=df['automation_rate_percent'], 
                             mode='lines+markers', name='Automation Rate (%)', line=dict(color='#28a745')))
-    fig.add_trace(go.Scatter(x=df['date'], y=df['error_rate']*100, 
+    fig.add_trace(go.Scatter(x=df['date'], y=df['error_rate_percent'], 
                             mode='lines+markers', name='Error Rate (%)', line=dict(color='#dc3545'), yaxis='y2'))
     fig.update_layout(title="Operations Health Dashboard", 
                      yaxis2=dict(overlaying='y', side='right'), height=400)
     charts['operations_health_dashboard'] = fig
-    
+    return charts
+
+# Builders por sección: report_pipeline.py los ejecuta en paralelo
+SECTION_BUILDERS = [realtime_charts, vip_charts, department_charts, product_charts,
+                    complaint_charts, customer_charts, network_charts, operations_charts]
+
+# Generar todos los gráficos
+def generate_all_charts(data=None):
+    # Los datos vienen del caché compartido con el dashboard (synthetic_data.py)
+    if data is None:
+        data = load_synthetic_data()
+    charts = {}
+    for builder in SECTION_BUILDERS:
+        charts.update(builder(data))
     return charts
 
 # Generar HTML estático
-def generate_html_report():
-    data = generate_synthetic_data()
-    charts = generate_all_charts()
+def generate_html_report(workers=None, compact=False, compress=None, offline=False, use_cache=True):
+    """
+    Genera billing_dashboard_report.html.
+
+    Args:
+        workers (int): Procesos para construir los gráficos (por defecto REPORT_WORKERS)
+        compact (bool): Figuras con typed arrays, sin templates repetidos y
+            comprimidas dentro del HTML (report_compact.py)
+        compress (str): 'gzip' o 'br' para guardar además una copia comprimida
+        offline (bool): Embeber plotly.js (solo los tipos de traza usados si
+            hay un bundle parcial en caché) en lugar de cargarlo del CDN
+        use_cache (bool): Reutilizar los gráficos de las secciones cuyas
+            tablas no cambiaron desde la última ejecución (report_cache.py)
+    """
+    data = load_synthetic_data()
+    cache = ReportCache(params={'decimals': FLOAT_DECIMALS} if compact else None) if use_cache else None
+    # JSON de cada gráfico, construido por sección en paralelo (report_pipeline.py)
+    if compact:
+        charts = build_charts(SECTION_BUILDERS, data, workers, serialize=compact_json, cache=cache)
+        plotly_js_url, chart_script = PLOTLY_JS_URL, render_compact_script(charts)
+    else:
+        charts = build_charts(SECTION_BUILDERS, data, workers, cache=cache)
+        plotly_js_url = PLOTLY_CDN_URL
+        chart_script = f"""<script>
+            // Render all charts
+            {render_script(charts)}
+        </script>"""
+    # Sin conexión: plotly.js va dentro del HTML (plotly_bundle.py)
+    if offline:
+        plotly_js = script_tag(trace_types(charts))
+    else:
+        plotly_js = f'<script src="{plotly_js_url}"></script>'
+    last_24h = data['real_time'].tail(24)
     
     html_content = f"""
     <!DOCTYPE html>
@@ -556,7 +476,7 @@ def generate_html_report():
         <meta charset="UTF-8">
         <meta name="viewport" content="width=device-width, initial-scale=1.0">
         <title>Charter Spectrum - Billing Operations Dashboard Report</title>
-        <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
+        {plotly_js}
         <style>
             body {{
                 font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
@@ -633,19 +553,19 @@ def generate_html_report():
             <h2>📈 Real-time Billing Analysis</h2>
             <div class="metrics">
                 <div class="metric">
-                    <h3>${data['real_time']['total_revenue'].sum():,.0f}</h3>
+                    <h3>${last_24h['total_revenue'].sum():,.0f}</h3>
                     <p>Total Revenue (24h)</p>
                 </div>
                 <div class="metric">
-                    <h3>{data['real_time']['calls_volume'].sum():,}</h3>
+                    <h3>{last_24h['calls_volume'].sum():,}</h3>
                     <p>Calls Volume</p>
                 </div>
                 <div class="metric">
-                    <h3>{data['real_time']['data_volume_gb'].sum():,.0f}</h3>
+                    <h3>{last_24h['data_volume_gb'].sum():,.0f}</h3>
                     <p>Data Volume (GB)</p>
                 </div>
                 <div class="metric">
-                    <h3>{data['real_time']['messages_volume'].sum():,}</h3>
+                    <h3>{last_24h['messages_volume'].sum():,}</h3>
                     <p>Messages Volume</p>
                 </div>
             </div>
@@ -764,15 +684,15 @@ def generate_html_report():
                     <p>Total Complaints</p>
                 </div>
                 <div class="metric">
-                    <h3>{data['complaints']['resolution_time_hours'].mean():.1f}h</h3>
+                    <h3>{data['complaints']['resolution_time_days'].mean():.1f} days</h3>
                     <p>Avg Resolution Time</p>
                 </div>
                 <div class="metric">
-                    <h3>{data['complaints']['satisfaction_score'].mean():.1f}</h3>
+                    <h3>{data['complaints']['customer_satisfaction'].mean():.1f}/5</h3>
                     <p>Avg Satisfaction</p>
                 </div>
                 <div class="metric">
-                    <h3>{data['complaints']['resolved'].mean():.1%}</h3>
+                    <h3>{(data['complaints']['status'] == 'Resolved').mean():.1%}</h3>
                     <p>Resolution Rate</p>
                 </div>
             </div>
@@ -836,7 +756,7 @@ def generate_html_report():
                     <p>Avg Connection Speed (Mbps)</p>
                 </div>
                 <div class="metric">
-                    <h3>{data['network']['uptime_percentage'].mean():.1f}%</h3>
+                    <h3>{data['network']['uptime_percent'].mean():.1f}%</h3>
                     <p>Avg Uptime</p>
                 </div>
                 <div class="metric">
@@ -870,11 +790,11 @@ def generate_html_report():
                     <p>Avg Processing Time</p>
                 </div>
                 <div class="metric">
-                    <h3>{data['operations']['automation_rate'].mean():.1%}</h3>
+                    <h3>{data['operations']['automation_rate_percent'].mean():.1f}%</h3>
                     <p>Automation Rate</p>
                 </div>
                 <div class="metric">
-                    <h3>{data['operations']['error_rate'].mean():.1%}</h3>
+                    <h3>{data['operations']['error_rate_percent'].mean():.2f}%</h3>
                     <p>Error Rate</p>
                 </div>
             </div>
@@ -897,38 +817,7 @@ def generate_html_report():
             <p>All data is synthetic and for demonstration purposes</p>
         </div>
         
-        <script>
-            // Render all charts
-            Plotly.newPlot('revenue-trends', {charts['revenue_trends'].to_json()});
-            Plotly.newPlot('service-usage', {charts['service_usage'].to_json()});
-            Plotly.newPlot('revenue-distribution', {charts['revenue_distribution'].to_json()});
-            Plotly.newPlot('vip-usage-trends', {charts['vip_usage_trends'].to_json()});
-            Plotly.newPlot('vip-performance', {charts['vip_performance'].to_json()});
-            Plotly.newPlot('vip-service-levels', {charts['vip_service_levels'].to_json()});
-            Plotly.newPlot('dept-billing-trends', {charts['dept_billing_trends'].to_json()});
-            Plotly.newPlot('dept-performance', {charts['dept_performance'].to_json()});
-            Plotly.newPlot('dept-efficiency', {charts['dept_efficiency'].to_json()});
-            Plotly.newPlot('product-revenue-trends', {charts['product_revenue_trends'].to_json()});
-            Plotly.newPlot('product-performance', {charts['product_performance'].to_json()});
-            Plotly.newPlot('product-revenue-distribution', {charts['product_revenue_distribution'].to_json()});
-            Plotly.newPlot('product-churn-analysis', {charts['product_churn_analysis'].to_json()});
-            Plotly.newPlot('complaints-timeline', {charts['complaints_timeline'].to_json()});
-            Plotly.newPlot('complaints-by-type', {charts['complaints_by_type'].to_json()});
-            Plotly.newPlot('resolution-time-distribution', {charts['resolution_time_distribution'].to_json()});
-            Plotly.newPlot('dept-complaints-performance', {charts['dept_complaints_performance'].to_json()});
-            Plotly.newPlot('customer-demographics', {charts['customer_demographics'].to_json()});
-            Plotly.newPlot('customer-behavior', {charts['customer_behavior'].to_json()});
-            Plotly.newPlot('customer-segmentation', {charts['customer_segmentation'].to_json()});
-            Plotly.newPlot('churn-risk-analysis', {charts['churn_risk_analysis'].to_json()});
-            Plotly.newPlot('network-performance-trends', {charts['network_performance_trends'].to_json()});
-            Plotly.newPlot('network-metrics-analysis', {charts['network_metrics_analysis'].to_json()});
-            Plotly.newPlot('bandwidth-utilization', {charts['bandwidth_utilization'].to_json()});
-            Plotly.newPlot('network-health-dashboard', {charts['network_health_dashboard'].to_json()});
-            Plotly.newPlot('operations-performance-trends', {charts['operations_performance_trends'].to_json()});
-            Plotly.newPlot('operations-efficiency-analysis', {charts['operations_efficiency_analysis'].to_json()});
-            Plotly.newPlot('cost-analysis', {charts['cost_analysis'].to_json()});
-            Plotly.newPlot('operations-health-dashboard', {charts['operations_health_dashboard'].to_json()});
-        </script>
+        {chart_script}
     </body>
     </html>
     """
@@ -937,10 +826,25 @@ def generate_html_report():
     with open('billing_dashboard_report.html', 'w', encoding='utf-8') as f:
         f.write(html_content)
     
-    print("✅ Reporte HTML generado exitosamente: billing_dashboard_report.html")
+    print(f"✅ Reporte HTML generado exitosamente: billing_dashboard_report.html ({len(html_content.encode('utf-8')) / 1024:.0f} KB)")
+    if compress:
+        print(f"🗜️  Copia comprimida: {write_compressed('billing_dashboard_report.html', html_content, compress)}")
     print("📧 Este archivo se puede enviar por email o abrir en cualquier navegador")
     
     return html_content
 
 if __name__ == "__main__":
-    generate_html_report()
+    parser = argparse.ArgumentParser(description="Reporte HTML del dashboard de billing")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Procesos en paralelo para construir los gráficos")
+    parser.add_argument('--compact', action='store_true',
+                        help="Salida compacta (typed arrays, template único, figuras comprimidas)")
+    parser.add_argument('--compress', choices=['gzip', 'br'], default=None,
+                        help="Guardar además una copia .gz o .br del HTML")
+    parser.add_argument('--offline', action='store_true',
+                        help="Embeber plotly.js en el HTML (sin CDN)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Reconstruir todos los gráficos sin usar la caché")
+    args = parser.parse_args()
+    generate_html_report(workers=args.workers, compact=args.compact, compress=args.compress,
+                         offline=args.offline, use_cache=not args.no_cache)
@@ -1,182 +1,20 @@
+import argparse
 import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
 import pandas as pd
-import numpy as np
-from datetime import datetime, timedelta
-import random
+from datetime import datetime
+from synthetic_data import load_synthetic_data
+from report_cache import ReportCache
+from report_compact import FLOAT_DECIMALS, PLOTLY_JS_URL, compact_json, render_compact_script, write_compressed
+from plotly_bundle import script_tag, trace_types
+from report_pipeline import PLOTLY_CDN_URL, build_charts, render_script
 import warnings
 warnings.filterwarnings('ignore')
 
-# Exact same data generation function as billing_dashboard.py
-def generate_synthetic_data():
-    np.random.seed(42)
-    random.seed(42)
-    
-    dates = pd.date_range(start=datetime.now() - timedelta(days=30), end=datetime.now(), freq='H')
-    
-    # Real-time data
-    real_time_data = []
-    for date in dates:
-        hour_factor = 1 + 0.5 * np.sin(2 * np.pi * date.hour / 24)
-        real_time_data.append({
-            'timestamp': date,
-            'calls_volume': int(1000 + 500 * hour_factor + np.random.normal(0, 100)),
-            'messages_volume': int(5000 + 2000 * hour_factor + np.random.normal(0, 500)),
-            'data_volume_gb': round(100 + 50 * hour_factor + np.random.normal(0, 10), 2),
-            'voice_revenue': round(5000 + 2000 * hour_factor + np.random.normal(0, 500), 2),
-            'data_revenue': round(8000 + 3000 * hour_factor + np.random.normal(0, 800), 2),
-            'total_revenue': round(13000 + 5000 * hour_factor + np.random.normal(0, 1000), 2)
-        })
-    
-    real_time_df = pd.DataFrame(real_time_data)
-    
-    # VIP Customers
-    vip_customers = []
-    customer_ids = [f'VIP_{i:03d}' for i in range(1, 21)]
-    for customer_id in customer_ids:
-        for i in range(30):
-            date = datetime.now() - timedelta(days=i)
-            vip_customers.append({
-                'customer_id': customer_id,
-                'date': date,
-                'voice_usage_minutes': int(200 + np.random.normal(0, 50)),
-                'data_usage_gb': round(10 + np.random.normal(0, 3), 2),
-                'monthly_bill': round(150 + np.random.normal(0, 30), 2),
-                'pending_amount': round(np.random.uniform(0, 50), 2),
-                'service_level': random.choice(['Premium', 'Enterprise', 'Gold']),
-                'satisfaction_score': round(np.random.uniform(7, 10), 1)
-            })
-    
-    vip_df = pd.DataFrame(vip_customers)
-    
-    # Departments
-    departments = ['Sales', 'Marketing', 'Engineering', 'Finance', 'HR', 'Operations', 'Customer Service']
-    dept_data = []
-    for dept in departments:
-        for i in range(30):
-            date = datetime.now() - timedelta(days=i)
-            dept_data.append({
-                'department': dept,
-                'date': date,
-                'billed_amount': round(5000 + np.random.normal(0, 1000), 2),
-                'traffic_volume': int(1000 + np.random.normal(0, 200)),
-                'active_users': int(50 + np.random.normal(0, 10)),
-                'cost_per_user': round(50 + np.random.normal(0, 10), 2),
-                'efficiency_score': round(np.random.uniform(0.7, 1.0), 2)
-            })
-    
-    dept_df = pd.DataFrame(dept_data)
-    
-    # Products
-    products = ['Internet 100Mbps', 'Internet 500Mbps', 'Internet 1Gbps', 'Cable TV Basic', 
-                'Cable TV Premium', 'Phone Line', 'Mobile Plan', 'Bundle Package']
-    product_data = []
-    for product in products:
-        for i in range(30):
-            date = datetime.now() - timedelta(days=i)
-            product_data.append({
-                'product': product,
-                'date': date,
-                'billed_amount': round(10000 + np.random.normal(0, 2000), 2),
-                'subscribers': int(500 + np.random.normal(0, 100)),
-                'revenue_per_subscriber': round(80 + np.random.normal(0, 15), 2),
-                'churn_rate': round(np.random.uniform(0.01, 0.05), 3),
-                'profit_margin': round(np.random.uniform(0.2, 0.4), 2)
-            })
-    
-    product_df = pd.DataFrame(product_data)
-    
-    # Complaints
-    complaint_types = ['Billing Error', 'Service Outage', 'Speed Issues', 'Customer Service', 
-                      'Installation Problem', 'Equipment Issue', 'Contract Dispute']
-    resolution_times = [1, 2, 3, 5, 7, 10, 15]
-    
-    complaints_data = []
-    for i in range(200):
-        complaint_date = datetime.now() - timedelta(days=np.random.randint(1, 30))
-        resolution_date = complaint_date + timedelta(days=random.choice(resolution_times))
-        complaints_data.append({
-            'complaint_id': f'COMP_{i:04d}',
-            'complaint_date': complaint_date,
-            'resolution_date': resolution_date,
-            'complaint_type': random.choice(complaint_types),
-            'priority': random.choice(['Low', 'Medium', 'High', 'Critical']),
-            'resolution_time_days': (resolution_date - complaint_date).days,
-            'customer_satisfaction': random.choice([1, 2, 3, 4, 5]),
-            'department': random.choice(departments),
-            'status': random.choice(['Resolved', 'In Progress', 'Escalated'])
-        })
-    
-    complaints_df = pd.DataFrame(complaints_data)
-    
-    # Customers
-    customer_data = []
-    for i in range(1000):
-        customer_data.append({
-            'customer_id': f'CUST_{i:04d}',
-            'age': np.random.randint(18, 80),
-            'income_level': random.choice(['Low', 'Medium', 'High']),
-            'tenure_months': np.random.randint(1, 120),
-            'monthly_bill': round(50 + np.random.normal(0, 20), 2),
-            'services_count': np.random.randint(1, 5),
-            'churn_risk': round(np.random.uniform(0, 1), 2),
-            'satisfaction_score': round(np.random.uniform(1, 10), 1),
-            'payment_method': random.choice(['Credit Card', 'Bank Transfer', 'Check', 'Auto-Pay']),
-            'region': random.choice(['Northeast', 'Southeast', 'Midwest', 'West'])
-        })
-    
-    customer_df = pd.DataFrame(customer_data)
-    
-    # Network
-    network_data = []
-    for date in dates:
-        network_data.append({
-            'timestamp': date,
-            'traffic_volume_gbps': round(10 + 5 * np.sin(2 * np.pi * date.hour / 24) + np.random.normal(0, 1), 2),
-            'connection_speed_mbps': round(100 + np.random.normal(0, 10), 2),
-            'latency_ms': round(20 + np.random.normal(0, 5), 2),
-            'packet_loss_percent': round(np.random.uniform(0, 2), 3),
-            'uptime_percent': round(99.5 + np.random.normal(0, 0.1), 2),
-            'active_connections': int(50000 + np.random.normal(0, 5000)),
-            'bandwidth_utilization': round(60 + 20 * np.sin(2 * np.pi * date.hour / 24) + np.random.normal(0, 5), 2)
-        })
-    
-    network_df = pd.DataFrame(network_data)
-    
-    # Operations
-    operations_data = []
-    for i in range(30):
-        date = datetime.now() - timedelta(days=i)
-        operations_data.append({
-            'date': date,
-            'invoices_processed': int(1000 + np.random.normal(0, 100)),
-            'processing_time_minutes': round(5 + np.random.normal(0, 1), 2),
-            'error_rate_percent': round(np.random.uniform(0.1, 2.0), 2),
-            'automation_rate_percent': round(85 + np.random.normal(0, 5), 2),
-            'staff_productivity': round(np.random.uniform(0.8, 1.2), 2),
-            'cost_per_invoice': round(2 + np.random.normal(0, 0.5), 2),
-            'customer_satisfaction': round(np.random.uniform(7, 9), 1)
-        })
-    
-    operations_df = pd.DataFrame(operations_data)
-    
-    return {
-        'real_time': real_time_df,
-        'vip_customers': vip_df,
-        'departments': dept_df,
-        'products': product_df,
-        'complaints': complaints_df,
-        'customers': customer_df,
-        'network': network_df,
-        'operations': operations_df
-    }
-
-# Generate all charts using the exact same logic as billing_dashboard.py
-def generate_all_charts():
-    data = generate_synthetic_data()
+# Section 1: Real-time Billing
+def realtime_charts(data):
     charts = {}
-    
     # 1. Real-time Revenue Trends
     df = data['real_time'].tail(24)
     fig = go.Figure()
@@ -190,7 +28,7 @@ def generate_all_charts():
                             mode='lines+markers', name='Data Revenue', 
                             line=dict(color='#ffc107', width=2), marker=dict(size=4)))
     fig.update_layout(title="Revenue Trends - Last 24 Hours", height=400)
-    charts['revenue_trends'] = fig.to_json()
+    charts['revenue_trends'] = fig
     
     # 2. Service Usage Subplots
     fig = make_subplots(rows=2, cols=2, subplot_titles=('Calls Volume', 'Messages Volume', 'Data Volume', 'Revenue per Hour'))
@@ -199,7 +37,7 @@ def generate_all_charts():
     fig.add_trace(go.Bar(x=df['timestamp'], y=df['data_volume_gb'], name='Data (GB)', marker_color='#ffc107'), row=2, col=1)
     fig.add_trace(go.Bar(x=df['timestamp'], y=df['total_revenue'], name='Revenue ($)', marker_color='#dc3545'), row=2, col=2)
     fig.update_layout(height=500, showlegend=False)
-    charts['service_usage'] = fig.to_json()
+    charts['service_usage'] = fig
     
     # 3. Revenue Distribution Pie
     voice_total = df['voice_revenue'].sum()
@@ -207,15 +45,19 @@ def generate_all_charts():
     fig = go.Figure(data=[go.Pie(labels=['Voice Revenue', 'Data Revenue'], 
                                 values=[voice_total, data_total], hole=0.4)])
     fig.update_layout(title="Revenue Distribution", height=400)
-    charts['revenue_distribution'] = fig.to_json()
-    
+    charts['revenue_distribution'] = fig
+    return charts
+
+# Section 2: VIP Customers
+def vip_charts(data):
+    charts = {}
     # 4. VIP Usage Trends
     vip_df = data['vip_customers']
     latest_vip = vip_df.groupby('customer_id').last().reset_index()
     top_10 = latest_vip.nlargest(10, 'monthly_bill')
     fig = go.Figure(data=[go.Bar(x=top_10['customer_id'], y=top_10['monthly_bill'], marker_color='#007bff')])
     fig.update_layout(title="Top 10 VIP Customers by Monthly Bill", height=400)
-    charts['vip_usage_trends'] = fig.to_json()
+    charts['vip_usage_trends'] = fig
     
     # 5. VIP Performance
     fig = go.Figure()
@@ -224,14 +66,18 @@ def generate_all_charts():
     fig.add_trace(go.Scatter(x=vip_df['date'], y=vip_df['data_usage_gb'], 
                             mode='lines', name='Data Usage', line=dict(color='#28a745'), yaxis='y2'))
     fig.update_layout(title="VIP Customer Performance Trends", yaxis2=dict(overlaying='y', side='right'), height=400)
-    charts['vip_performance'] = fig.to_json()
+    charts['vip_performance'] = fig
     
     # 6. VIP Service Level Distribution
     service_counts = vip_df['service_level'].value_counts()
     fig = go.Figure(data=[go.Pie(labels=service_counts.index, values=service_counts.values)])
     fig.update_layout(title="VIP Service Level Distribution", height=400)
-    charts['vip_service_levels'] = fig.to_json()
-    
+    charts['vip_service_levels'] = fig
+    return charts
+
+# Section 3: Departments
+def department_charts(data):
+    charts = {}
     # 7. Department Billing Trends
     dept_df = data['departments']
     latest_dept = dept_df.groupby('department').last().reset_index()
@@ -241,20 +87,24 @@ def generate_all_charts():
     fig.add_trace(go.Bar(x=latest_dept['department'], y=latest_dept['active_users'], 
                         name='Active Users', marker_color='#28a745', yaxis='y2'))
     fig.update_layout(title="Department Performance", yaxis2=dict(overlaying='y', side='right'), height=400, barmode='group')
-    charts['dept_billing_trends'] = fig.to_json()
+    charts['dept_billing_trends'] = fig
     
     # 8. Department Performance
     fig = go.Figure()
     fig.add_trace(go.Scatter(x=dept_df['date'], y=dept_df['efficiency_score'], 
                             mode='lines+markers', name='Efficiency Score', line=dict(color='#007bff')))
     fig.update_layout(title="Department Efficiency Trends", height=400)
-    charts['dept_performance'] = fig.to_json()
+    charts['dept_performance'] = fig
     
     # 9. Department Efficiency
     fig = go.Figure(data=[go.Bar(x=latest_dept['department'], y=latest_dept['efficiency_score'], marker_color='#28a745')])
     fig.update_layout(title="Department Efficiency Scores", height=400)
-    charts['dept_efficiency'] = fig.to_json()
-    
+    charts['dept_efficiency'] = fig
+    return charts
+
+# Section 4: Products
+def product_charts(data):
+    charts = {}
     # 10. Product Revenue Trends
     product_df = data['products']
     latest_products = product_df.groupby('product').last().reset_index()
@@ -264,43 +114,47 @@ def generate_all_charts():
     fig.add_trace(go.Bar(x=latest_products['product'], y=latest_products['subscribers'], 
                         name='Subscribers', marker_color='#28a745', yaxis='y2'))
     fig.update_layout(title="Product Performance", yaxis2=dict(overlaying='y', side='right'), height=400, barmode='group')
-    charts['product_revenue_trends'] = fig.to_json()
+    charts['product_revenue_trends'] = fig
     
     # 11. Product Performance
     fig = go.Figure()
     fig.add_trace(go.Scatter(x=product_df['date'], y=product_df['revenue_per_subscriber'], 
                             mode='lines+markers', name='Revenue per Subscriber', line=dict(color='#007bff')))
     fig.update_layout(title="Product Revenue per Subscriber Trends", height=400)
-    charts['product_performance'] = fig.to_json()
+    charts['product_performance'] = fig
     
     # 12. Product Revenue Distribution
     fig = go.Figure(data=[go.Pie(labels=latest_products['product'], values=latest_products['billed_amount'])])
     fig.update_layout(title="Product Revenue Distribution", height=400)
-    charts['product_revenue_distribution'] = fig.to_json()
+    charts['product_revenue_distribution'] = fig
     
     # 13. Product Churn Analysis
     fig = go.Figure(data=[go.Bar(x=latest_products['product'], y=latest_products['churn_rate'], marker_color='#dc3545')])
     fig.update_layout(title="Product Churn Rates", height=400)
-    charts['product_churn_analysis'] = fig.to_json()
-    
+    charts['product_churn_analysis'] = fig
+    return charts
+
+# Section 5: Complaints
+def complaint_charts(data):
+    charts = {}
     # 14. Complaints Timeline
     complaints_df = data['complaints']
     daily_complaints = complaints_df.groupby('complaint_date').size().reset_index(name='count')
     fig = go.Figure(data=[go.Scatter(x=daily_complaints['complaint_date'], y=daily_complaints['count'], 
                                     mode='lines+markers', line=dict(color='#dc3545'))])
     fig.update_layout(title="Complaints Timeline", height=400)
-    charts['complaints_timeline'] = fig.to_json()
+    charts['complaints_timeline'] = fig
     
     # 15. Complaints by Type
     complaint_counts = complaints_df['complaint_type'].value_counts()
     fig = go.Figure(data=[go.Bar(x=complaint_counts.index, y=complaint_counts.values, marker_color='#dc3545')])
     fig.update_layout(title="Complaints by Type", height=400)
-    charts['complaints_by_type'] = fig.to_json()
+    charts['complaints_by_type'] = fig
     
     # 16. Resolution Time Distribution
     fig = go.Figure(data=[go.Histogram(x=complaints_df['resolution_time_days'], nbinsx=10, marker_color='#007bff')])
     fig.update_layout(title="Resolution Time Distribution", height=400)
-    charts['resolution_time_distribution'] = fig.to_json()
+    charts['resolution_time_distribution'] = fig
     
     # 17. Department Complaints Performance
     dept_complaints = complaints_df.groupby('department').agg({
@@ -314,13 +168,17 @@ def generate_all_charts():
     fig.add_trace(go.Bar(x=dept_complaints['department'], y=dept_complaints['resolution_time_days'], 
                         name='Avg Resolution Time', marker_color='#28a745', yaxis='y2'))
     fig.update_layout(title="Department Complaints Performance", yaxis2=dict(overlaying='y', side='right'), height=400, barmode='group')
-    charts['dept_complaints_performance'] = fig.to_json()
-    
+    charts['dept_complaints_performance'] = fig
+    return charts
+
+# Section 6: Customers
+def customer_charts(data):
+    charts = {}
     # 18. Customer Demographics
     customer_df = data['customers']
     fig = go.Figure(data=[go.Histogram(x=customer_df['age'], nbinsx=20, marker_color='#007bff')])
     fig.update_layout(title="Customer Age Distribution", height=400)
-    charts['customer_demographics'] = fig.to_json()
+    charts['customer_demographics'] = fig
     
     # 19. Customer Behavior
     fig = go.Figure()
@@ -328,19 +186,23 @@ def generate_all_charts():
                             mode='markers', marker=dict(color=customer_df['satisfaction_score'], 
                             colorscale='Viridis', size=8)))
     fig.update_layout(title="Customer Behavior Analysis", height=400)
-    charts['customer_behavior'] = fig.to_json()
+    charts['customer_behavior'] = fig
     
     # 20. Customer Segmentation
     income_counts = customer_df['income_level'].value_counts()
     fig = go.Figure(data=[go.Pie(labels=income_counts.index, values=income_counts.values)])
     fig.update_layout(title="Customer Income Level Distribution", height=400)
-    charts['customer_segmentation'] = fig.to_json()
+    charts['customer_segmentation'] = fig
     
     # 21. Churn Risk Analysis
     fig = go.Figure(data=[go.Histogram(x=customer_df['churn_risk'], nbinsx=20, marker_color='#dc3545')])
     fig.update_layout(title="Customer Churn Risk Distribution", height=400)
-    charts['churn_risk_analysis'] = fig.to_json()
-    
+    charts['churn_risk_analysis'] = fig
+    return charts
+
+# Section 7: Network
+def network_charts(data):
+    charts = {}
     # 22. Network Performance Trends
     network_df = data['network']
     fig = go.Figure()
@@ -349,7 +211,7 @@ def generate_all_charts():
     fig.add_trace(go.Scatter(x=network_df['timestamp'], y=network_df['connection_speed_mbps'], 
                             mode='lines+markers', name='Connection Speed', line=dict(color='#28a745'), yaxis='y2'))
     fig.update_layout(title="Network Performance Trends", yaxis2=dict(overlaying='y', side='right'), height=400)
-    charts['network_performance_trends'] = fig.to_json()
+    charts['network_performance_trends'] = fig
     
     # 23. Network Metrics Analysis
     fig = go.Figure()
@@ -358,13 +220,13 @@ def generate_all_charts():
     fig.add_trace(go.Scatter(x=network_df['timestamp'], y=network_df['uptime_percent'], 
                             mode='lines+markers', name='Uptime %', line=dict(color='#28a745'), yaxis='y2'))
     fig.update_layout(title="Network Health Metrics", yaxis2=dict(overlaying='y', side='right'), height=400)
-    charts['network_metrics_analysis'] = fig.to_json()
+    charts['network_metrics_analysis'] = fig
     
     # 24. Bandwidth Utilization
     fig = go.Figure(data=[go.Scatter(x=network_df['timestamp'], y=network_df['bandwidth_utilization'], 
                                     mode='lines+markers', line=dict(color='#007bff'))])
     fig.update_layout(title="Bandwidth Utilization", height=400)
-    charts['bandwidth_utilization'] = fig.to_json()
+    charts['bandwidth_utilization'] = fig
     
     # 25. Network Health Dashboard
     latest_network = network_df.tail(1).iloc[0]
@@ -372,8 +234,12 @@ def generate_all_charts():
     fig.add_trace(go.Indicator(mode="gauge+number", value=latest_network['uptime_percent'], 
                               title={'text': "Uptime %"}, gauge={'axis': {'range': [None, 100]}}))
     fig.update_layout(title="Network Health Dashboard", height=400)
-    charts['network_health_dashboard'] = fig.to_json()
-    
+    charts['network_health_dashboard'] = fig
+    return charts
+
+# Section 8: Operations
+def operations_charts(data):
+    charts = {}
     # 26. Operations Performance Trends
     operations_df = data['operations']
     fig = go.Figure()
@@ -382,7 +248,7 @@ def generate_all_charts():
     fig.add_trace(go.Scatter(x=operations_df['date'], y=operations_df['automation_rate_percent'], 
                             mode='lines+markers', name='Automation Rate %', line=dict(color='#28a745'), yaxis='y2'))
     fig.update_layout(title="Operations Performance Trends", yaxis2=dict(overlaying='y', side='right'), height=400)
-    charts['operations_performance_trends'] = fig.to_json()
+    charts['operations_performance_trends'] = fig
     
     # 27. Operations Efficiency Analysis
     fig = go.Figure()
@@ -391,13 +257,13 @@ def generate_all_charts():
     fig.add_trace(go.Scatter(x=operations_df['date'], y=operations_df['error_rate_percent'], 
                             mode='lines+markers', name='Error Rate %', line=dict(color='#dc3545'), yaxis='y2'))
     fig.update_layout(title="Operations Efficiency Analysis", yaxis2=dict(overlaying='y', side='right'), height=400)
-    charts['operations_efficiency_analysis'] = fig.to_json()
+    charts['operations_efficiency_analysis'] = fig
     
     # 28. Cost Analysis
     fig = go.Figure(data=[go.Scatter(x=operations_df['date'], y=operations_df['cost_per_invoice'], 
                                     mode='lines+markers', line=dict(color='#007bff'))])
     fig.update_layout(title="Cost per Invoice Trends", height=400)
-    charts['cost_analysis'] = fig.to_json()
+    charts['cost_analysis'] = fig
     
     # 29. Operations Health Dashboard
     latest_ops = operations_df.tail(1).iloc[0]
@@ -405,12 +271,42 @@ def generate_all_charts():
     fig.add_trace(go.Indicator(mode="gauge+number", value=latest_ops['automation_rate_percent'], 
                               title={'text': "Automation Rate %"}, gauge={'axis': {'range': [None, 100]}}))
     fig.update_layout(title="Operations Health Dashboard", height=400)
-    charts['operations_health_dashboard'] = fig.to_json()
-    
+    charts['operations_health_dashboard'] = fig
+    return charts
+
+# Per-section builders, run in parallel by report_pipeline.py
+SECTION_BUILDERS = [realtime_charts, vip_charts, department_charts, product_charts,
+                    complaint_charts, customer_charts, network_charts, operations_charts]
+
+# Generate all charts using the exact same logic as billing_dashboard.py
+def generate_all_charts(workers=None, serialize=None, cache=None):
+    # Same cached tables the dashboard loads (synthetic_data.py)
+    data = load_synthetic_data()
+    # JSON of every chart, built per section in parallel (report_pipeline.py);
+    # with a cache only sections whose tables changed are rebuilt (report_cache.py)
+    if serialize:
+        charts = build_charts(SECTION_BUILDERS, data, workers, serialize=serialize, cache=cache)
+    else:
+        charts = build_charts(SECTION_BUILDERS, data, workers, cache=cache)
     return charts, data
 
-def generate_html_report():
-    charts, data = generate_all_charts()
+def generate_html_report(workers=None, compact=False, compress=None, offline=False, use_cache=True):
+    # compact: typed arrays, one shared template and gzip-packed figures (report_compact.py)
+    cache = ReportCache(params={'decimals': FLOAT_DECIMALS} if compact else None) if use_cache else None
+    charts, data = generate_all_charts(workers, compact_json if compact else None, cache)
+    if compact:
+        plotly_js_url, chart_script = PLOTLY_JS_URL, render_compact_script(charts)
+    else:
+        plotly_js_url = PLOTLY_CDN_URL
+        chart_script = f"""<script>
+            // Render all charts using the exact same data as the dashboard
+            {render_script(charts)}
+        </script>"""
+    # offline: embed plotly.js (only the trace types used, if cached) instead of the CDN (plotly_bundle.py)
+    if offline:
+        plotly_js = script_tag(trace_types(charts))
+    else:
+        plotly_js = f'<script src="{plotly_js_url}"></script>'
     
     html_content = f"""
     <!DOCTYPE html>
@@ -419,7 +315,7 @@ def generate_html_report():
         <meta charset="UTF-8">
         <meta name="viewport" content="width=device-width, initial-scale=1.0">
         <title>Charter Spectrum - Complete Billing Operations Dashboard Report</title>
-        <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
+        {plotly_js}
         <style>
             body {{
                 font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
@@ -760,38 +656,7 @@ def generate_html_report():
             <p>All data is synthetic and for demonstration purposes</p>
         </div>
         
-        <script>
-            // Render all charts using the exact same data as the dashboard
-            Plotly.newPlot('revenue-trends', {charts['revenue_trends']});
-            Plotly.newPlot('service-usage', {charts['service_usage']});
-            Plotly.newPlot('revenue-distribution', {charts['revenue_distribution']});
-            Plotly.newPlot('vip-usage-trends', {charts['vip_usage_trends']});
-            Plotly.newPlot('vip-performance', {charts['vip_performance']});
-            Plotly.newPlot('vip-service-levels', {charts['vip_service_levels']});
-            Plotly.newPlot('dept-billing-trends', {charts['dept_billing_trends']});
-            Plotly.newPlot('dept-performance', {charts['dept_performance']});
-            Plotly.newPlot('dept-efficiency', {charts['dept_efficiency']});
-            Plotly.newPlot('product-revenue-trends', {charts['product_revenue_trends']});
-            Plotly.newPlot('product-performance', {charts['product_performance']});
-            Plotly.newPlot('product-revenue-distribution', {charts['product_revenue_distribution']});
-            Plotly.newPlot('product-churn-analysis', {charts['product_churn_analysis']});
-            Plotly.newPlot('complaints-timeline', {charts['complaints_timeline']});
-            Plotly.newPlot('complaints-by-type', {charts['complaints_by_type']});
-            Plotly.newPlot('resolution-time-distribution', {charts['resolution_time_distribution']});
-            Plotly.newPlot('dept-complaints-performance', {charts['dept_complaints_performance']});
-            Plotly.newPlot('customer-demographics', {charts['customer_demographics']});
-            Plotly.newPlot('customer-behavior', {charts['customer_behavior']});
-            Plotly.newPlot('customer-segmentation', {charts['customer_segmentation']});
-            Plotly.newPlot('churn-risk-analysis', {charts['churn_risk_analysis']});
-            Plotly.newPlot('network-performance-trends', {charts['network_performance_trends']});
-            Plotly.newPlot('network-metrics-analysis', {charts['network_metrics_analysis']});
-            Plotly.newPlot('bandwidth-utilization', {charts['bandwidth_utilization']});
-            Plotly.newPlot('network-health-dashboard', {charts['network_health_dashboard']});
-            Plotly.newPlot('operations-performance-trends', {charts['operations_performance_trends']});
-            Plotly.newPlot('operations-efficiency-analysis', {charts['operations_efficiency_analysis']});
-            Plotly.newPlot('cost-analysis', {charts['cost_analysis']});
-            Plotly.newPlot('operations-health-dashboard', {charts['operations_health_dashboard']});
-        </script>
+        {chart_script}
     </body>
     </html>
     """
@@ -799,13 +664,28 @@ def generate_html_report():
     with open('billing_dashboard_report_complete.html', 'w', encoding='utf-8') as f:
         f.write(html_content)
     
-    print("✅ Reporte HTML completo generado exitosamente: billing_dashboard_report_complete.html")
+    print(f"✅ Reporte HTML completo generado exitosamente: billing_dashboard_report_complete.html ({len(html_content.encode('utf-8')) / 1024:.0f} KB)")
+    if compress:
+        print(f"🗜️  Compressed copy: {write_compressed('billing_dashboard_report_complete.html', html_content, compress)}")
     print("📊 Este reporte incluye TODOS los gráficos del dashboard original con los mismos valores")
     print("📧 Se puede enviar por email o abrir en cualquier navegador")
     
     return html_content
 
 if __name__ == "__main__":
-    generate_html_report()
+    parser = argparse.ArgumentParser(description="Complete billing dashboard HTML report")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Processes used to build the charts in parallel")
+    parser.add_argument('--compact', action='store_true',
+                        help="Compact output (typed arrays, one shared template, packed figures)")
+    parser.add_argument('--compress', choices=['gzip', 'br'], default=None,
+                        help="Also write a .gz or .br copy of the HTML")
+    parser.add_argument('--offline', action='store_true',
+                        help="Embed plotly.js in the HTML instead of loading it from the CDN")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Rebuild every chart instead of reusing the cached ones")
+    args = parser.parse_args()
+    generate_html_report(workers=args.workers, compact=args.compact, compress=args.compress,
+                         offline=args.offline, use_cache=not args.no_cache)
 
 
@@ -1,169 +1,19 @@
+import argparse
 import plotly.graph_objects as go
 import pandas as pd
-import numpy as np
-from datetime import datetime, timedelta
-import json
-
-# Generar datos sintéticos
-def generate_synthetic_data():
-    np.random.seed(42)
-    
-    # Real-time data
-    timestamps = pd.date_range(start=datetime.now() - timedelta(hours=23), 
-                              end=datetime.now(), freq='H')
-    
-    real_time_data = []
-    for ts in timestamps:
-        real_time_data.append({
-            'timestamp': ts,
-            'total_revenue': np.random.uniform(50000, 150000),
-            'voice_revenue': np.random.uniform(20000, 60000),
-            'data_revenue': np.random.uniform(30000, 90000),
-            'calls_volume': np.random.randint(1000, 5000),
-            'data_volume_gb': np.random.uniform(500, 2000),
-            'messages_volume': np.random.randint(5000, 15000)
-        })
-    
-    real_time = pd.DataFrame(real_time_data)
-    
-    # VIP Customers
-    vip_data = []
-    for i in range(50):
-        for day in range(30):
-            vip_data.append({
-                'customer_id': f'VIP_{i+1:03d}',
-                'date': datetime.now() - timedelta(days=29-day),
-                'voice_usage_minutes': np.random.uniform(200, 800),
-                'data_usage_gb': np.random.uniform(50, 200),
-                'monthly_bill': np.random.uniform(150, 500),
-                'satisfaction_score': np.random.uniform(7, 10),
-                'service_level': np.random.choice(['Premium', 'Enterprise', 'Gold']),
-                'pending_amount': np.random.uniform(0, 100)
-            })
-    
-    vip_customers = pd.DataFrame(vip_data)
-    
-    # Departments
-    departments = ['Sales', 'Marketing', 'Engineering', 'Finance', 'HR', 'Operations', 'Support']
-    dept_data = []
-    for dept in departments:
-        for day in range(30):
-            dept_data.append({
-                'department': dept,
-                'date': datetime.now() - timedelta(days=29-day),
-                'billed_amount': np.random.uniform(10000, 100000),
-                'active_users': np.random.randint(50, 300),
-                'efficiency_score': np.random.uniform(0.7, 0.95),
-                'cost_per_user': np.random.uniform(50, 200)
-            })
-    
-    departments_df = pd.DataFrame(dept_data)
-    
-    # Products
-    products = ['Internet Basic', 'Internet Premium', 'Cable TV', 'Phone Service', 'Bundle Package']
-    product_data = []
-    for product in products:
-        for day in range(30):
-            product_data.append({
-                'product': product,
-                'date': datetime.now() - timedelta(days=29-day),
-                'billed_amount': np.random.uniform(5000, 50000),
-                'subscribers': np.random.randint(100, 1000),
-                'churn_rate': np.random.uniform(0.02, 0.08),
-                'profit_margin': np.random.uniform(0.15, 0.35)
-            })
-    
-    products_df = pd.DataFrame(product_data)
-    
-    # Complaints
-    complaint_types = ['Billing Issue', 'Service Outage', 'Speed Problem', 'Customer Service']
-    priorities = ['Low', 'Medium', 'High', 'Critical']
-    depts = ['Support', 'Billing', 'Technical', 'Sales']
-    
-    complaints_data = []
-    for day in range(30):
-        daily_complaints = np.random.randint(10, 50)
-        for _ in range(daily_complaints):
-            complaints_data.append({
-                'date': datetime.now() - timedelta(days=29-day),
-                'complaint_type': np.random.choice(complaint_types),
-                'priority': np.random.choice(priorities),
-                'resolution_time_hours': np.random.uniform(1, 72),
-                'satisfaction_score': np.random.uniform(1, 10),
-                'department': np.random.choice(depts),
-                'resolved': np.random.choice([True, False], p=[0.85, 0.15])
-            })
-    
-    complaints = pd.DataFrame(complaints_data)
-    
-    # Customers
-    customer_data = []
-    for i in range(1000):
-        customer_data.append({
-            'customer_id': f'CUST_{i+1:04d}',
-            'age': np.random.randint(18, 80),
-            'income_level': np.random.choice(['Low', 'Medium', 'High', 'Very High']),
-            'tenure_months': np.random.randint(1, 120),
-            'region': np.random.choice(['North', 'South', 'East', 'West', 'Central']),
-            'monthly_bill': np.random.uniform(50, 300),
-            'services_count': np.random.randint(1, 5),
-            'payment_method': np.random.choice(['Credit Card', 'Bank Transfer', 'Cash', 'Digital Wallet']),
-            'satisfaction_score': np.random.uniform(1, 10),
-            'churn_risk': np.random.uniform(0, 1)
-        })
-    
-    customers = pd.DataFrame(customer_data)
-    
-    # Network
-    network_data = []
-    for hour in range(24):
-        network_data.append({
-            'timestamp': datetime.now() - timedelta(hours=23-hour),
-            'traffic_volume_gbps': np.random.uniform(50, 200),
-            'connection_speed_mbps': np.random.uniform(100, 1000),
-            'uptime_percentage': np.random.uniform(95, 99.9),
-            'latency_ms': np.random.uniform(5, 50),
-            'active_connections': np.random.randint(10000, 50000),
-            'packet_loss_percentage': np.random.uniform(0, 2),
-            'bandwidth_utilization': np.random.uniform(30, 90)
-        })
-    
-    network = pd.DataFrame(network_data)
-    
-    # Operations
-    operations_data = []
-    for day in range(30):
-        operations_data.append({
-            'date': datetime.now() - timedelta(days=29-day),
-            'invoices_processed': np.random.randint(500, 2000),
-            'processing_time_minutes': np.random.uniform(5, 30),
-            'automation_rate': np.random.uniform(0.6, 0.95),
-            'error_rate': np.random.uniform(0.01, 0.05),
-            'staff_productivity': np.random.uniform(0.7, 0.95),
-            'cost_per_invoice': np.random.uniform(2, 10),
-            'customer_satisfaction': np.random.uniform(7, 10)
-        })
-    
-    operations = pd.DataFrame(operations_data)
-    
-    return {
-        'real_time': real_time,
-        'vip_customers': vip_customers,
-        'departments': departments_df,
-        'products': products_df,
-        'complaints': complaints,
-        'customers': customers,
-        'network': network,
-        'operations': operations
-    }
+from datetime import datetime
+from synthetic_data import load_synthetic_data
+from plotly_bundle import script_tag, trace_types
+from report_pipeline import PLOTLY_CDN_URL
 
 # Generar gráficos principales
 def generate_main_charts():
-    data = generate_synthetic_data()
+    # Los datos vienen del caché compartido con el dashboard (synthetic_data.py)
+    data = load_synthetic_data()
     charts = {}
     
     # 1. Revenue Trends
-    df = data['real_time']
+    df = data['real_time'].tail(24)
     fig = go.Figure()
     fig.add_trace(go.Scatter(x=df['timestamp'], y=df['total_revenue'], 
                             mode='lines+markers', name='Total Revenue', line=dict(color='#007bff', width=3)))
@@ -174,7 +24,7 @@ def generate_main_charts():
     
     # 2. VIP Performance
     df = data['vip_customers']
-    latest_vip = df.groupby('customer_id').last().reset_index()
+    latest_vip = df.groupby('customer_id', observed=True).last().reset_index()
     top_10 = latest_vip.nlargest(10, 'monthly_bill')
     fig = go.Figure(data=[go.Bar(x=top_10['customer_id'], y=top_10['monthly_bill'], 
                                 marker_color='#007bff')])
@@ -183,7 +33,7 @@ def generate_main_charts():
     
     # 3. Department Performance
     df = data['departments']
-    latest_dept = df.groupby('department').last().reset_index()
+    latest_dept = df.groupby('department', observed=True).last().reset_index()
     fig = go.Figure()
     fig.add_trace(go.Bar(x=latest_dept['department'], y=latest_dept['billed_amount'], 
                         name='Billed Amount', marker_color='#007bff'))
@@ -194,7 +44,7 @@ def generate_main_charts():
     
     # 4. Product Performance
     df = data['products']
-    latest_products = df.groupby('product').last().reset_index()
+    latest_products = df.groupby('product', observed=True).last().reset_index()
     fig = go.Figure()
     fig.add_trace(go.Bar(x=latest_products['product'], y=latest_products['billed_amount'], 
                         name='Revenue', marker_color='#007bff'))
@@ -205,7 +55,8 @@ def generate_main_charts():
     
     # 5. Complaints Timeline
     df = data['complaints']
-    daily_complaints = df.groupby('date').size().reset_index(name='count')
+    daily_complaints = df.groupby(df['complaint_date'].dt.date).size().reset_index(name='count')
+    daily_complaints.columns = ['date', 'count']
     fig = go.Figure(data=[go.Scatter(x=daily_complaints['date'], y=daily_complaints['count'], 
                                     mode='lines+markers', line=dict(color='#dc3545'))])
     fig.update_layout(title="Complaints Timeline", height=400)
@@ -218,7 +69,7 @@ def generate_main_charts():
     charts['customer_demographics'] = fig.to_json()
     
     # 7. Network Performance
-    df = data['network']
+    df = data['network'].tail(24)
     fig = go.Figure()
     fig.add_trace(go.Scatter(x=df['timestamp'], y=df['traffic_volume_gbps'], 
                             mode='lines+markers', name='Traffic Volume', line=dict(color='#007bff')))
@@ -232,7 +83,7 @@ def generate_main_charts():
     fig = go.Figure()
     fig.add_trace(go.Scatter(x=df['date'], y=df['invoices_processed'], 
                             mode='lines+markers', name='Invoices Processed', line=dict(color='#007bff')))
-    fig.add_trace(go.Scatter(x=df['date'], y=df['automation_rate']*100, 
+    fig.add_trace(go.Scatter(x=df['date'], y=df['automation_rate_percent'], 
                             mode='lines+markers', name='Automation Rate (%)', line=dict(color='#28a745'), yaxis='y2'))
     fig.update_layout(title="Operations Performance", yaxis2=dict(overlaying='y', side='right'), height=400)
     charts['operations_performance'] = fig.to_json()
@@ -240,8 +91,14 @@ def generate_main_charts():
     return charts, data
 
 # Generar HTML
-def generate_html_report():
+def generate_html_report(offline=False):
     charts, data = generate_main_charts()
+    # Sin conexión: plotly.js va dentro del HTML (plotly_bundle.py)
+    if offline:
+        plotly_js = script_tag(trace_types(charts))
+    else:
+        plotly_js = f'<script src="{PLOTLY_CDN_URL}"></script>'
+    last_24h = data['real_time'].tail(24)
     
     html_content = f"""
     <!DOCTYPE html>
@@ -250,7 +107,7 @@ def generate_html_report():
         <meta charset="UTF-8">
         <meta name="viewport" content="width=device-width, initial-scale=1.0">
         <title>Charter Spectrum - Billing Operations Dashboard Report</title>
-        <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
+        {plotly_js}
         <style>
             body {{
                 font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
@@ -327,19 +184,19 @@ def generate_html_report():
             <h2>📈 Real-time Billing Analysis</h2>
             <div class="metrics">
                 <div class="metric">
-                    <h3>${data['real_time']['total_revenue'].sum():,.0f}</h3>
+                    <h3>${last_24h['total_revenue'].sum():,.0f}</h3>
                     <p>Total Revenue (24h)</p>
                 </div>
                 <div class="metric">
-                    <h3>{data['real_time']['calls_volume'].sum():,}</h3>
+                    <h3>{last_24h['calls_volume'].sum():,}</h3>
                     <p>Calls Volume</p>
                 </div>
                 <div class="metric">
-                    <h3>{data['real_time']['data_volume_gb'].sum():,.0f}</h3>
+                    <h3>{last_24h['data_volume_gb'].sum():,.0f}</h3>
                     <p>Data Volume (GB)</p>
                 </div>
                 <div class="metric">
-                    <h3>{data['real_time']['messages_volume'].sum():,}</h3>
+                    <h3>{last_24h['messages_volume'].sum():,}</h3>
                     <p>Messages Volume</p>
                 </div>
             </div>
@@ -431,15 +288,15 @@ def generate_html_report():
                     <p>Total Complaints</p>
                 </div>
                 <div class="metric">
-                    <h3>{data['complaints']['resolution_time_hours'].mean():.1f}h</h3>
+                    <h3>{data['complaints']['resolution_time_days'].mean():.1f} days</h3>
                     <p>Avg Resolution Time</p>
                 </div>
                 <div class="metric">
-                    <h3>{data['complaints']['satisfaction_score'].mean():.1f}</h3>
+                    <h3>{data['complaints']['customer_satisfaction'].mean():.1f}/5</h3>
                     <p>Avg Satisfaction</p>
                 </div>
                 <div class="metric">
-                    <h3>{data['complaints']['resolved'].mean():.1%}</h3>
+                    <h3>{(data['complaints']['status'] == 'Resolved').mean():.1%}</h3>
                     <p>Resolution Rate</p>
                 </div>
             </div>
@@ -485,7 +342,7 @@ def generate_html_report():
                     <p>Avg Connection Speed (Mbps)</p>
                 </div>
                 <div class="metric">
-                    <h3>{data['network']['uptime_percentage'].mean():.1f}%</h3>
+                    <h3>{data['network']['uptime_percent'].mean():.1f}%</h3>
                     <p>Avg Uptime</p>
                 </div>
                 <div class="metric">
@@ -510,11 +367,11 @@ def generate_html_report():
                     <p>Avg Processing Time</p>
                 </div>
                 <div class="metric">
-                    <h3>{data['operations']['automation_rate'].mean():.1%}</h3>
+                    <h3>{data['operations']['automation_rate_percent'].mean():.1f}%</h3>
                     <p>Automation Rate</p>
                 </div>
                 <div class="metric">
-                    <h3>{data['operations']['error_rate'].mean():.1%}</h3>
+                    <h3>{data['operations']['error_rate_percent'].mean():.2f}%</h3>
                     <p>Error Rate</p>
                 </div>
             </div>
@@ -553,4 +410,8 @@ def generate_html_report():
     return html_content
 
 if __name__ == "__main__":
-    generate_html_report()
+    parser = argparse.ArgumentParser(description="Reporte HTML simplificado del dashboard de billing")
+    parser.add_argument('--offline', action='store_true',
+                        help="Embeber plotly.js en el HTML (sin CDN)")
+    args = parser.parse_args()
+    generate_html_report(offline=args.offline)
@@ -0,0 +1,128 @@
+# =============================================================================
+# SERVICIO DE PCA CON MODELOS Y PROYECCIONES EN CACHÉ
+# =============================================================================
+# update_pca_analysis volvía a ajustar StandardScaler + PCA en cada callback.
+# Este módulo ajusta el modelo una sola vez por versión de dataset y guarda
+# las componentes y las coordenadas proyectadas de todos los clientes:
+#
+#   - datasets medianos: PCA (randomizado si supera PCA_RANDOMIZED_ROWS filas)
+#   - datasets grandes (más de PCA_INCREMENTAL_ROWS filas) o que no entran en
+#     memoria: PCAModel.fit_chunks() con IncrementalPCA y
+#     StandardScaler.partial_fit por chunks de CHUNK_ROWS filas, así la
+#     matriz float64 intermedia nunca supera un chunk
+#   - las coordenadas de los clientes salen de PCAModel.project(), una sola
+#     multiplicación de matrices
+#
+# Configuración por variables de entorno:
+#   PCA_RANDOMIZED_ROWS  -> filas a partir de las cuales se usa el solver randomizado
+#   PCA_INCREMENTAL_ROWS -> filas a partir de las cuales se ajusta por chunks
+# =============================================================================
+
+import os
+import threading
+
+from sklearn.decomposition import PCA, IncrementalPCA
+from sklearn.preprocessing import StandardScaler
+
+from churn_data import CHUNK_ROWS, FEATURE_COLUMNS, feature_matrix, get_dataset
+
+PCA_RANDOMIZED_ROWS = int(os.environ.get('PCA_RANDOMIZED_ROWS', 100000))
+PCA_INCREMENTAL_ROWS = int(os.environ.get('PCA_INCREMENTAL_ROWS', 1000000))
+
+
+class PCAModel:
+    """Normalización + PCA ajustados, listos para proyectar filas nuevas"""
+
+    def __init__(self, scaler, pca, columns=FEATURE_COLUMNS):
+        """
+        Args:
+            scaler (StandardScaler): Normalización ya ajustada
+            pca (PCA | IncrementalPCA): PCA ya ajustado sobre los datos normalizados
+            columns (list): Columnas de entrada, en orden
+        """
+        self.columns = list(columns)
+        self.explained_variance_ratio = pca.explained_variance_ratio_
+        # Normalizar y proyectar se reduce a (X - center) @ projection:
+        # ((X - media) / escala - media_pca) @ componentes.T
+        scale = scaler.scale_
+        self.projection = (pca.components_ / scale).T
+        self.center = scaler.mean_ + pca.mean_ * scale
+
+    @classmethod
+    def fit(cls, df, n_components=2, columns=FEATURE_COLUMNS):
+        """Ajusta el modelo sobre un DataFrame en memoria"""
+        features = feature_matrix(df, columns)
+        scaler = StandardScaler().fit(features)
+        solver = 'randomized' if len(df) > PCA_RANDOMIZED_ROWS else 'auto'
+        pca = PCA(n_components=n_components, svd_solver=solver, random_state=42)
+        pca.fit(scaler.transform(features))
+        return cls(scaler, pca, columns)
+
+    @classmethod
+    def fit_chunks(cls, make_chunks, n_components=2, columns=FEATURE_COLUMNS):
+        """
+        Ajusta el modelo recorriendo los datos por partes (dos pasadas: una
+        para la normalización y otra para el PCA), sin cargarlos completos.
+
+        Args:
+            make_chunks (callable): Función sin argumentos que devuelve un
+                iterable de DataFrames, p. ej. lambda: read_churn_csv_chunks(path)
+            n_components (int): Componentes a conservar
+            columns (list): Columnas de entrada, en orden
+
+        Returns:
+            PCAModel: Modelo ajustado
+        """
+        scaler = StandardScaler()
+        for chunk in make_chunks():
+            scaler.partial_fit(feature_matrix(chunk, columns))
+
+        pca = IncrementalPCA(n_components=n_components)
+        for chunk in make_chunks():
+            # IncrementalPCA necesita al menos n_components filas por llamada
+            if len(chunk) >= n_components:
+                pca.partial_fit(scaler.transform(feature_matrix(chunk, columns)))
+        return cls(scaler, pca, columns)
+
+    def project(self, df):
+        """Coordenadas en las componentes principales (una multiplicación de matrices)"""
+        return (feature_matrix(df, self.columns) - self.center) @ self.projection
+
+
+class PCAService:
+    """Un modelo y sus proyecciones por versión de dataset"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # key -> (version, PCAModel, coordenadas proyectadas)
+        self._fitted = {}
+
+    def get(self, ref):
+        """
+        Modelo y coordenadas de todos los clientes del dataset; solo se ajusta
+        la primera vez que se pide cada versión.
+
+        Args:
+            ref (dict): Referencia devuelta por register_dataset()
+
+        Returns:
+            tuple: (PCAModel, np.ndarray de len(df) x n_components)
+        """
+        key, version = ref['key'], ref.get('version')
+        with self._lock:
+            cached = self._fitted.get(key)
+            if cached is None or cached[0] != version:
+                df = get_dataset(ref)
+                if len(df) > PCA_INCREMENTAL_ROWS:
+                    model = PCAModel.fit_chunks(
+                        lambda: (df.iloc[start:start + CHUNK_ROWS] for start in range(0, len(df), CHUNK_ROWS))
+                    )
+                else:
+                    model = PCAModel.fit(df)
+                cached = (version, model, model.project(df))
+                self._fitted[key] = cached
+        return cached[1], cached[2]
+
+
+# Servicio compartido por los callbacks
+pca_service = PCAService()
@@ -0,0 +1,153 @@
+# =============================================================================
+# PLOTLY.JS EMBEBIDO PARA LOS REPORTES SIN CONEXIÓN
+# =============================================================================
+# Los reportes HTML cargan plotly.js desde el CDN al abrirse: en equipos sin
+# internet (VDI aislada) los gráficos no se dibujan, y cada apertura paga la
+# descarga. En modo offline el reporte incluye plotly.js dentro del HTML:
+#
+#   - se usa la versión minificada que trae el paquete plotly de Python, así
+#     que funciona sin red desde la primera vez
+#   - si en PLOTLY_JS_CACHE hay bundles parciales de esa versión (solo
+#     algunos tipos de traza, p. ej. 'finance' o 'cartesian'), se embebe el
+#     más chico que cubre los tipos de traza que usa el reporte
+#   - cada bundle se lee una sola vez por proceso: un lote de reportes para
+#     muchos destinatarios reutiliza la misma copia en memoria
+#
+# Los bundles parciales se descargan una vez desde una máquina con conexión
+# (python plotly_bundle.py --fetch finance cartesian) o se copian a mano a la
+# carpeta con el nombre plotly-<bundle>-<versión>.min.js.
+#
+# Configuración por variables de entorno:
+#   PLOTLY_JS_CACHE -> carpeta de los bundles parciales (por defecto Data/cache/plotlyjs)
+# =============================================================================
+
+import argparse
+import functools
+import json
+import os
+import urllib.request
+
+import plotly.offline
+
+PLOTLY_JS_CACHE = os.environ.get('PLOTLY_JS_CACHE', os.path.join('Data', 'cache', 'plotlyjs'))
+PLOTLY_JS_VERSION = plotly.offline.get_plotlyjs_version()
+
+# Bundles parciales oficiales de plotly.js 2.x y los tipos de traza que incluyen
+PARTIAL_BUNDLES = {
+    'basic': {'scatter', 'bar', 'pie'},
+    'cartesian': {'scatter', 'bar', 'box', 'heatmap', 'histogram', 'histogram2d', 'histogram2dcontour',
+                  'image', 'pie', 'contour', 'scatterternary', 'violin'},
+    'geo': {'scatter', 'scattergeo', 'choropleth'},
+    'gl2d': {'scatter', 'scattergl', 'splom', 'pointcloud', 'heatmapgl', 'contourgl', 'parcoords'},
+    'gl3d': {'scatter', 'scatter3d', 'surface', 'mesh3d', 'isosurface', 'volume', 'cone', 'streamtube'},
+    'mapbox': {'scatter', 'scattermapbox', 'choroplethmapbox', 'densitymapbox'},
+    'finance': {'scatter', 'bar', 'histogram', 'pie', 'funnelarea', 'ohlc', 'candlestick',
+                'funnel', 'waterfall', 'indicator'},
+}
+
+
+def bundle_path(name, version=PLOTLY_JS_VERSION, cache_dir=PLOTLY_JS_CACHE):
+    """Ruta del bundle parcial en la carpeta de caché"""
+    return os.path.join(cache_dir, f"plotly-{name}-{version}.min.js")
+
+
+def fetch_bundle(name, version=PLOTLY_JS_VERSION, cache_dir=PLOTLY_JS_CACHE):
+    """
+    Descarga un bundle parcial del CDN de plotly y lo guarda en la caché (de
+    forma atómica).
+
+    Returns:
+        str: Ruta del archivo guardado
+    """
+    path = bundle_path(name, version, cache_dir)
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    os.makedirs(cache_dir, exist_ok=True)
+    try:
+        with urllib.request.urlopen(f"https://cdn.plot.ly/plotly-{name}-{version}.min.js") as response:
+            with open(tmp_path, 'wb') as f:
+                f.write(response.read())
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path
+
+
+def trace_types(charts):
+    """
+    Tipos de traza que usan los gráficos del reporte.
+
+    Args:
+        charts (dict): Clave del gráfico -> JSON de la figura
+
+    Returns:
+        frozenset: Tipos de traza ('scatter', 'bar', ...)
+    """
+    types = set()
+    for chart in charts.values():
+        types.update(trace.get('type', 'scatter') for trace in json.loads(chart).get('data', []))
+    return frozenset(types)
+
+
+@functools.lru_cache(maxsize=None)
+def _read_bundle(path):
+    """Contenido de un bundle parcial (se lee una sola vez por proceso)"""
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+@functools.lru_cache(maxsize=None)
+def _full_bundle():
+    """plotly.js completo que trae el paquete plotly (se lee una sola vez por proceso)"""
+    return plotly.offline.get_plotlyjs()
+
+
+def select_bundle(types=None, cache_dir=PLOTLY_JS_CACHE):
+    """
+    Bundle más chico de la caché que incluye todos los tipos de traza; si no
+    hay ninguno, el bundle completo del paquete plotly.
+
+    Args:
+        types (iterable): Tipos de traza del reporte (None = bundle completo)
+        cache_dir (str): Carpeta de los bundles parciales
+
+    Returns:
+        tuple: (nombre del bundle, código JavaScript)
+    """
+    if types is not None:
+        candidates = []
+        for name, supported in PARTIAL_BUNDLES.items():
+            path = bundle_path(name, cache_dir=cache_dir)
+            if set(types) <= supported and os.path.exists(path):
+                candidates.append((os.path.getsize(path), name, path))
+        if candidates:
+            _, name, path = min(candidates)
+            return name, _read_bundle(path)
+    return 'full', _full_bundle()
+
+
+@functools.lru_cache(maxsize=32)
+def script_tag(types=None, cache_dir=PLOTLY_JS_CACHE):
+    """
+    Etiqueta <script> con plotly.js embebido, para reemplazar la del CDN.
+
+    Args:
+        types (frozenset): Tipos de traza del reporte (ver trace_types());
+            None para embeber el bundle completo
+        cache_dir (str): Carpeta de los bundles parciales
+
+    Returns:
+        str: <script> con el bundle elegido (la misma cadena para todo el lote)
+    """
+    name, source = select_bundle(types, cache_dir)
+    print(f"📦 plotly.js {PLOTLY_JS_VERSION} ({name}) embebido: {len(source) / 1024:.0f} KB")
+    return f'<script type="text/javascript">{source}</script>'
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Caché de bundles parciales de plotly.js")
+    parser.add_argument('--fetch', nargs='+', choices=sorted(PARTIAL_BUNDLES), required=True,
+                        help="Bundles parciales a descargar a PLOTLY_JS_CACHE")
+    args = parser.parse_args()
+    for bundle in args.fetch:
+        print(f"✅ {fetch_bundle(bundle)}")
@@ -0,0 +1,352 @@
+# =============================================================================
+# REPORTES POR DESTINATARIO EN LOTE
+# =============================================================================
+# Cada generate_email_report*.py produce un único reporte fijo. Este módulo
+# genera una variante por destinatario a partir de una lista de perfiles
+# (secciones, departamentos / productos y rango de fechas) en una sola pasada:
+#
+#   1. carga las tablas una vez (caché de synthetic_data.py)
+#   2. planifica: cada sección depende solo de sus tablas y de los filtros que
+#      las afectan, así que los perfiles que piden la misma sección con el
+#      mismo recorte comparten sus gráficos (se construyen una sola vez)
+#   3. construye las secciones distintas en paralelo (report_pipeline.py,
+#      las tablas viajan una vez por worker)
+#   4. arma y escribe el HTML de cada destinatario en paralelo (hilos), y se
+#      imprime el tiempo de cada etapa
+#
+# Las secciones cuyo recorte y tablas no cambiaron desde la ejecución anterior
+# salen de la caché en disco (report_cache.py, desactivable con --no-cache).
+#
+# --compact y --offline funcionan igual que en generate_email_report.py; en
+# modo offline plotly.js se embebe con el mismo <script> para todo el lote.
+#
+# Perfiles (JSON, una lista de objetos):
+#   {"name": "Sales Lead",                      -> nombre del archivo y del encabezado
+#    "sections": ["departments", "complaints"], -> por defecto, todas (ver SECTIONS)
+#    "departments": ["Sales"],                  -> opcional
+#    "products": ["Internet 1Gbps"],            -> opcional
+#    "days": 7}                                 -> últimos N días, o "start" / "end"
+#
+# Configuración por variables de entorno:
+#   REPORT_OUT_DIR -> carpeta de salida de los reportes (por defecto reports)
+# =============================================================================
+
+import argparse
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pandas as pd
+
+from generate_email_report import (complaint_charts, customer_charts, department_charts, network_charts,
+                                   operations_charts, product_charts, realtime_charts, vip_charts)
+from plotly_bundle import script_tag, trace_types
+from report_cache import ReportCache
+from report_compact import FLOAT_DECIMALS, PLOTLY_JS_URL, compact_json, render_compact_script
+from report_pipeline import PLOTLY_CDN_URL, REPORT_WORKERS, run_builders, render_script
+from synthetic_data import DEPARTMENTS, PRODUCTS, load_synthetic_data
+
+REPORT_OUT_DIR = os.environ.get('REPORT_OUT_DIR', 'reports')
+
+# Secciones del reporte: nombre -> (título, builder, tablas que lee)
+SECTIONS = {
+    'real_time': ('📈 Real-time Billing Analysis', realtime_charts, ['real_time']),
+    'vip': ('👑 VIP Customers Analysis', vip_charts, ['vip_customers']),
+    'departments': ('🏢 Department Billing Analysis', department_charts, ['departments']),
+    'products': ('📦 Product Billing Analysis', product_charts, ['products']),
+    'complaints': ('⚠️ Complaints & Resolutions Analysis', complaint_charts, ['complaints']),
+    'customers': ('👥 Customer Analysis', customer_charts, ['customers']),
+    'network': ('🌐 Network Analysis', network_charts, ['network']),
+    'operations': ('⚙️ Operations Analysis', operations_charts, ['operations']),
+}
+
+# Columnas que recorta cada filtro, por tabla
+DATE_COLUMNS = {'real_time': 'timestamp', 'vip_customers': 'date', 'departments': 'date',
+                'products': 'date', 'complaints': 'complaint_date', 'network': 'timestamp',
+                'operations': 'date'}
+DEPARTMENT_COLUMNS = {'departments': 'department', 'complaints': 'department'}
+PRODUCT_COLUMNS = {'products': 'product'}
+
+REPORT_CSS = """
+    body { font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; margin: 0; padding: 20px; background-color: #f8f9fa; }
+    .header { background: linear-gradient(135deg, #007bff, #0056b3); color: white; padding: 30px; text-align: center;
+              border-radius: 10px; margin-bottom: 30px; box-shadow: 0 4px 6px rgba(0,0,0,0.1); }
+    .section { background: white; margin: 20px 0; padding: 25px; border-radius: 10px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
+    .section h2 { color: #007bff; border-bottom: 2px solid #007bff; padding-bottom: 10px; margin-bottom: 20px; }
+    .chart-container { margin: 20px 0; text-align: center; }
+    .footer { text-align: center; margin-top: 40px; padding: 20px; background: #f8f9fa; border-radius: 10px; color: #6c757d; }
+"""
+
+
+class Profile:
+    """Preferencias de un destinatario: secciones, filtros y rango de fechas"""
+
+    def __init__(self, name, sections=None, departments=None, products=None, start=None, end=None, days=None):
+        """
+        Args:
+            name (str): Nombre del destinatario (encabezado y nombre del archivo)
+            sections (list): Secciones de SECTIONS, en orden (por defecto todas)
+            departments (list): Departamentos a incluir (por defecto todos)
+            products (list): Productos a incluir (por defecto todos)
+            start (str): Fecha inicial (inclusive)
+            end (str): Fecha final (inclusive, el día completo)
+            days (int): Últimos N días de datos (en lugar de start)
+        """
+        for label, values, options in [('secciones', sections, list(SECTIONS)),
+                                       ('departamentos', departments, DEPARTMENTS),
+                                       ('productos', products, PRODUCTS)]:
+            unknown = [value for value in values or [] if value not in options]
+            if unknown:
+                raise ValueError(f"Perfil '{name}': {label} desconocidos {unknown} (opciones: {options})")
+        self.name = name
+        self.slug = re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-') or 'report'
+        self.sections = list(sections or SECTIONS)
+        self.departments = tuple(sorted(departments)) if departments else None
+        self.products = tuple(sorted(products)) if products else None
+        self.start = pd.Timestamp(start) if start else None
+        self.end = pd.Timestamp(end).normalize() + pd.Timedelta(days=1) if end else None
+        self.days = days
+
+    def date_range(self, latest):
+        """Rango [inicio, fin) de fechas; 'days' se cuenta hacia atrás desde el último dato"""
+        end = self.end
+        start = self.start
+        if self.days:
+            start = (end or latest) - pd.Timedelta(days=self.days)
+        return start, end
+
+    def period_label(self):
+        """Rango de fechas para los títulos de los gráficos (None = todo el histórico)"""
+        last = self.end - pd.Timedelta(days=1) if self.end is not None else None
+        if self.days:
+            label = f"Last {self.days} Days"
+            return f"{label} to {last:%b %d, %Y}" if last is not None else label
+        if self.start is not None and last is not None:
+            return f"{self.start:%b %d, %Y} - {last:%b %d, %Y}"
+        if self.start is not None:
+            return f"Since {self.start:%b %d, %Y}"
+        if last is not None:
+            return f"Through {last:%b %d, %Y}"
+        return None
+
+
+class SliceFilter:
+    """Recorte de las tablas de una sección (fechas, departamentos, productos)"""
+
+    def __init__(self, tables, start=None, end=None, departments=None, products=None, period=None):
+        self.tables = tuple(tables)
+        self.start = start
+        self.end = end
+        self.departments = departments
+        self.products = products
+        # Texto del rango para los títulos de los gráficos (df.attrs['period'])
+        self.period = period
+
+    @property
+    def key(self):
+        """Clave del recorte: secciones con la misma clave comparten gráficos"""
+        return (self.tables, self.start, self.end, self.departments, self.products, self.period)
+
+    def __call__(self, data):
+        tables = dict(data)
+        for name in self.tables:
+            df = data[name]
+            mask = pd.Series(True, index=df.index)
+            if name in DATE_COLUMNS and self.start is not None:
+                mask &= df[DATE_COLUMNS[name]] >= self.start
+            if name in DATE_COLUMNS and self.end is not None:
+                mask &= df[DATE_COLUMNS[name]] < self.end
+            if name in DEPARTMENT_COLUMNS and self.departments:
+                mask &= df[DEPARTMENT_COLUMNS[name]].isin(self.departments)
+            if name in PRODUCT_COLUMNS and self.products:
+                mask &= df[PRODUCT_COLUMNS[name]].isin(self.products)
+            if not mask.all():
+                df = df[mask.to_numpy()].reset_index(drop=True)
+                # Sin las categorías que quedaron afuera: los groupby de los
+                # builders (observed=False) las dibujarían con ceros
+                for column in df.select_dtypes('category'):
+                    df[column] = df[column].cat.remove_unused_categories()
+            if name in DATE_COLUMNS and self.period:
+                df = df.copy(deep=False)
+                df.attrs['period'] = self.period
+            tables[name] = df
+        return tables
+
+
+def section_filter(profile, section, latest):
+    """Recorte de una sección para un perfil (solo con los filtros que afectan a sus tablas)"""
+    tables = SECTIONS[section][2]
+    start, end = profile.date_range(latest)
+    dated = any(name in DATE_COLUMNS for name in tables)
+    return SliceFilter(
+        tables,
+        start if dated else None,
+        end if dated else None,
+        profile.departments if any(name in DEPARTMENT_COLUMNS for name in tables) else None,
+        profile.products if any(name in PRODUCT_COLUMNS for name in tables) else None,
+        profile.period_label() if dated else None,
+    )
+
+
+def load_profiles(path):
+    """Lee la lista de perfiles de un JSON"""
+    with open(path, encoding='utf-8') as f:
+        profiles = [Profile(**entry) for entry in json.load(f)]
+    slugs = [profile.slug for profile in profiles]
+    duplicated = sorted({slug for slug in slugs if slugs.count(slug) > 1})
+    if duplicated:
+        raise ValueError(f"Perfiles con el mismo nombre de archivo: {duplicated}")
+    return profiles
+
+
+def render_report(profile, sections, plotly_js, compact=False):
+    """
+    HTML de un destinatario.
+
+    Args:
+        profile (Profile): Destinatario
+        sections (list): Pares (título, {clave: json}) en el orden del perfil
+        plotly_js (str): Etiqueta <script> de plotly.js (CDN o embebido)
+        compact (bool): Los JSON vienen de compact_json()
+
+    Returns:
+        str: Documento HTML
+    """
+    charts = {key: chart for _, section in sections for key, chart in section.items()}
+    body = '\n'.join(
+        f'<div class="section">\n<h2>{title}</h2>\n'
+        + '\n'.join(f'<div class="chart-container"><div id="{key.replace("_", "-")}"></div></div>'
+                    for key in section)
+        + '\n</div>'
+        for title, section in sections)
+    if compact:
+        chart_script = render_compact_script(charts)
+    else:
+        chart_script = f"<script>\n{render_script(charts)}\n</script>"
+
+    filters = ', '.join(filter(None, [
+        ', '.join(profile.departments) if profile.departments else '',
+        ', '.join(profile.products) if profile.products else '',
+    ])) or 'All departments and products'
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<title>Charter Spectrum - Billing Report for {profile.name}</title>
+{plotly_js}
+<style>{REPORT_CSS}</style>
+</head>
+<body>
+<div class="header">
+<h1>📊 Charter Spectrum - Billing Operations Report</h1>
+<p>Prepared for {profile.name} - {datetime.now().strftime('%B %d, %Y')}</p>
+<p>{filters}</p>
+</div>
+{body}
+<div class="footer">
+<p>📊 This report was generated automatically on {datetime.now().strftime('%B %d, %Y at %I:%M %p')}</p>
+<p>All data is synthetic and for demonstration purposes</p>
+</div>
+{chart_script}
+</body>
+</html>
+"""
+
+
+def generate_reports(profiles, out_dir=REPORT_OUT_DIR, workers=None, compact=False, offline=False, data=None,
+                     use_cache=True):
+    """
+    Genera el reporte de cada perfil.
+
+    Args:
+        profiles (list): Perfiles (ver Profile / load_profiles())
+        out_dir (str): Carpeta de salida (un <slug>.html por perfil)
+        workers (int): Procesos para los gráficos e hilos para el HTML
+            (por defecto REPORT_WORKERS)
+        compact (bool): Salida compacta (report_compact.py)
+        offline (bool): Embeber plotly.js (plotly_bundle.py)
+        data (dict): Tablas ya cargadas (por defecto load_synthetic_data())
+        use_cache (bool): Reutilizar las secciones cuyas tablas y recorte no
+            cambiaron desde la última ejecución (report_cache.py)
+
+    Returns:
+        dict: Segundos de cada etapa
+    """
+    workers = workers or REPORT_WORKERS
+    timings = {}
+    start = time.perf_counter()
+
+    # 1. Datos (una sola carga para todo el lote)
+    if data is None:
+        data = load_synthetic_data()
+    timings['datos'] = time.perf_counter() - start
+
+    # 2. Plan: una tarea por (sección, recorte) distinto
+    stage = time.perf_counter()
+    latest = max(data[table][column].max() for table, column in DATE_COLUMNS.items())
+    tasks, task_index, layouts = [], {}, []
+    for profile in profiles:
+        layout = []
+        for section in profile.sections:
+            select = section_filter(profile, section, latest)
+            key = (section, select.key)
+            if key not in task_index:
+                task_index[key] = len(tasks)
+                tasks.append((SECTIONS[section][1], select))
+            layout.append((SECTIONS[section][0], task_index[key]))
+        layouts.append(layout)
+    requested = sum(len(layout) for layout in layouts)
+    timings['plan'] = time.perf_counter() - stage
+
+    # 3. Gráficos de cada sección distinta, en paralelo
+    stage = time.perf_counter()
+    cache = ReportCache(params={'decimals': FLOAT_DECIMALS} if compact else None) if use_cache else None
+    results = run_builders(tasks, data, workers, compact_json if compact else None, cache)
+    sections = [charts for charts, _, _ in results]
+    timings['gráficos'] = time.perf_counter() - stage
+
+    # 4. HTML de cada destinatario, en paralelo
+    stage = time.perf_counter()
+    if offline:
+        plotly_js = script_tag(frozenset().union(*(trace_types(charts) for charts in sections)))
+    else:
+        plotly_js = f'<script src="{PLOTLY_JS_URL if compact else PLOTLY_CDN_URL}"></script>'
+    os.makedirs(out_dir, exist_ok=True)
+
+    def write(profile, layout):
+        html_content = render_report(profile, [(title, sections[i]) for title, i in layout], plotly_js, compact)
+        with open(os.path.join(out_dir, f"{profile.slug}.html"), 'w', encoding='utf-8') as f:
+            f.write(html_content)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(write, profiles, layouts))
+    timings['html'] = time.perf_counter() - stage
+    timings['total'] = time.perf_counter() - start
+
+    rebuilt = sum(not cached for _, _, cached in results)
+    print(f"📨 {len(profiles)} reporte(s) en {out_dir}/: {len(tasks)} sección(es) distintas "
+          f"para {requested} pedidas ({rebuilt} reconstruidas, {len(tasks) - rebuilt} desde la caché)")
+    for name, elapsed in timings.items():
+        print(f"   ⏱️  {name}: {elapsed:.2f} s")
+    return timings
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reportes de billing por destinatario")
+    parser.add_argument('profiles', help="JSON con la lista de perfiles")
+    parser.add_argument('--out-dir', default=REPORT_OUT_DIR, help="Carpeta de salida")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Procesos para los gráficos e hilos para el HTML")
+    parser.add_argument('--compact', action='store_true',
+                        help="Salida compacta (typed arrays, template único, figuras comprimidas)")
+    parser.add_argument('--offline', action='store_true',
+                        help="Embeber plotly.js en el HTML (sin CDN)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Reconstruir todas las secciones sin usar la caché")
+    args = parser.parse_args()
+    generate_reports(load_profiles(args.profiles), args.out_dir, args.workers, args.compact, args.offline,
+                     use_cache=not args.no_cache)
@@ -0,0 +1,191 @@
+# =============================================================================
+# CACHÉ EN DISCO DE LOS GRÁFICOS DE LOS REPORTES
+# =============================================================================
+# generate_email_report.py reconstruía todos los gráficos en cada ejecución
+# aunque solo hubiera cambiado una tabla. ReportCache guarda en disco el JSON
+# de los gráficos de cada builder (una sección del reporte) junto con un hash
+# del contenido de las tablas que ese builder leyó:
+#
+#   - la clave de la entrada es el builder y el serializador (nombre, código
+#     fuente y código del módulo de cada uno, así un cambio en los helpers
+#     del reporte o en report_compact invalida la entrada), el contenido de las tablas recortadas (hash de las
+#     select.tables del reporte por destinatario, no sus fechas límite) y los
+#     parámetros de salida (p. ej. decimales en modo compacto), más la
+#     versión de plotly: otro rango con el mismo contenido reutiliza la entrada
+#   - además se registran las tablas que el builder lee al construirse y en
+#     la siguiente ejecución se comparan sus hashes (pd.util.hash_pandas_object,
+#     una vez por tabla y ejecución)
+#   - si todas coinciden se reutiliza el JSON guardado; si no, el builder se
+#     vuelve a ejecutar y la entrada se reemplaza (escritura atómica)
+#   - prune() borra las entradas sin usar hace más de REPORT_CACHE_MAX_AGE
+#     días y las menos usadas por encima de REPORT_CACHE_MAX_ENTRIES
+#
+# Configuración por variables de entorno:
+#   REPORT_CACHE_DIR         -> carpeta de la caché (por defecto Data/cache/reports)
+#   REPORT_CACHE_MAX_AGE     -> días sin uso tras los que se borra una entrada (por defecto 7)
+#   REPORT_CACHE_MAX_ENTRIES -> cantidad máxima de entradas (por defecto 256)
+# =============================================================================
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+import sys
+import time
+
+import pandas as pd
+import plotly
+
+REPORT_CACHE_DIR = os.environ.get('REPORT_CACHE_DIR', os.path.join('Data', 'cache', 'reports'))
+REPORT_CACHE_MAX_AGE = float(os.environ.get('REPORT_CACHE_MAX_AGE', 7))
+REPORT_CACHE_MAX_ENTRIES = int(os.environ.get('REPORT_CACHE_MAX_ENTRIES', 256))
+
+
+class TrackedTables(dict):
+    """Dict de tablas que registra qué tablas se leyeron"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.read = set()
+
+    def __getitem__(self, name):
+        self.read.add(name)
+        return super().__getitem__(name)
+
+
+def _source_hash(func):
+    """Hash del código de una función (cambia si se edita el builder)"""
+    try:
+        source = inspect.getsource(func).encode()
+    except (OSError, TypeError):
+        source = func.__code__.co_code
+    return hashlib.sha1(source).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def _module_hash(module_name):
+    """Hash del código del módulo cargado (helpers del builder, report_compact, ...)"""
+    try:
+        source = inspect.getsource(sys.modules[module_name]).encode()
+    except (KeyError, OSError, TypeError):
+        return None
+    return hashlib.sha1(source).hexdigest()
+
+
+def table_hash(df):
+    """Hash del contenido de una tabla (valores, índice, columnas, tipos y df.attrs)"""
+    digest = hashlib.sha1(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    digest.update(repr([(str(col), str(dtype)) for col, dtype in df.dtypes.items()]).encode())
+    digest.update(repr(sorted(df.attrs.items())).encode())
+    return digest.hexdigest()
+
+
+class ReportCache:
+    """JSON de los gráficos de cada builder, válido mientras no cambien sus tablas"""
+
+    def __init__(self, cache_dir=REPORT_CACHE_DIR, params=None, max_age=REPORT_CACHE_MAX_AGE,
+                 max_entries=REPORT_CACHE_MAX_ENTRIES):
+        """
+        Args:
+            cache_dir (str): Carpeta de las entradas
+            params (dict): Parámetros de salida que cambian el JSON (forman parte de la clave)
+            max_age (float): Días sin uso tras los que prune() borra una entrada
+            max_entries (int): Entradas que conserva prune() (las usadas más recientemente)
+        """
+        self.cache_dir = cache_dir
+        self.params = params or {}
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        # id de la tabla (completa o recortada) -> (DataFrame, hash) de la ejecución actual
+        self._hashes = {}
+
+    def _table_hash(self, df):
+        cached = self._hashes.get(id(df))
+        if cached is None or cached[0] is not df:
+            cached = (df, table_hash(df))
+            self._hashes[id(df)] = cached
+        return cached[1]
+
+    def _path(self, builder, select, serialize, data):
+        sliced = {name: self._table_hash(data[name]) for name in getattr(select, 'tables', ()) if name in data}
+        key = json.dumps([
+            f"{builder.__module__}.{builder.__qualname__}", _source_hash(builder), _module_hash(builder.__module__),
+            f"{serialize.__module__}.{serialize.__qualname__}", _source_hash(serialize),
+            _module_hash(serialize.__module__),
+            sliced, self.params, plotly.__version__,
+        ], sort_keys=True, default=str)
+        return os.path.join(self.cache_dir, f"{hashlib.sha1(key.encode()).hexdigest()}.json")
+
+    def get(self, builder, select, serialize, data):
+        """
+        Gráficos guardados del builder, si las tablas que leyó no cambiaron.
+
+        Args:
+            data (dict): Tablas que recibe el builder (ya recortadas por select)
+
+        Returns:
+            dict: Clave del gráfico -> JSON, o None si hay que reconstruirlos
+        """
+        path = self._path(builder, select, serialize, data)
+        try:
+            with open(path, encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        for name, expected in entry['tables'].items():
+            if name not in data or self._table_hash(data[name]) != expected:
+                self.misses += 1
+                return None
+        self.hits += 1
+        try:
+            os.utime(path)  # fecha de último uso, para prune()
+        except OSError:
+            pass
+        return entry['charts']
+
+    def put(self, builder, select, serialize, data, tables_read, charts):
+        """Guarda los gráficos del builder con el hash de las tablas (recortadas) que leyó"""
+        entry = {
+            'tables': {name: self._table_hash(data[name]) for name in sorted(tables_read)},
+            'charts': charts,
+        }
+        path = self._path(builder, select, serialize, data)
+        tmp_path = f"{path}.tmp-{os.getpid()}"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def prune(self):
+        """
+        Borra las entradas sin usar hace más de max_age días y, si quedan más
+        de max_entries, las usadas hace más tiempo.
+
+        Returns:
+            int: Cantidad de entradas borradas
+        """
+        try:
+            entries = [(entry.stat().st_mtime, entry.path) for entry in os.scandir(self.cache_dir)
+                       if entry.name.endswith('.json')]
+        except OSError:
+            return 0
+        entries.sort(reverse=True)
+        cutoff = time.time() - self.max_age * 86400
+        stale = [path for i, (mtime, path) in enumerate(entries) if i >= self.max_entries or mtime < cutoff]
+        for path in stale:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        return len(stale)
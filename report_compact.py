@@ -0,0 +1,154 @@
+# =============================================================================
+# SALIDA COMPACTA DE LOS REPORTES HTML
+# =============================================================================
+# Cada gráfico del reporte se incrustaba con fig.to_json(): los arrays como
+# texto con todos sus decimales y el template completo de plotly (~7 KB) repetido
+# en cada una de las ~29 figuras. El modo compacto:
+#
+#   - redondea los floats a REPORT_FLOAT_DECIMALS y codifica los arrays
+#     numéricos como typed arrays en base64 ({'dtype': 'f4', 'bdata': ...},
+#     plotly.js >= 2.28), con el tipo más chico que conserva los valores
+#   - quita de cada figura el template por defecto y los valores vacíos; el
+#     template se incluye una sola vez y se aplica en el navegador
+#   - comprime todas las figuras juntas con gzip; el HTML las descomprime con
+#     DecompressionStream, así sigue siendo un único archivo que abre sin
+#     servidor (p. ej. como adjunto de un email)
+#
+# write_compressed() guarda además una copia .gz o .br del HTML para
+# publicarlo o enviarlo (brotli es opcional: sin el paquete se usa gzip).
+#
+# Configuración por variables de entorno:
+#   REPORT_FLOAT_DECIMALS -> decimales de los floats en modo compacto (por defecto 3)
+# =============================================================================
+
+import base64
+import gzip
+import os
+
+import numpy as np
+import plotly.io as pio
+import plotly.offline
+
+FLOAT_DECIMALS = int(os.environ.get('REPORT_FLOAT_DECIMALS', 3))
+
+# Los typed arrays necesitan plotly.js >= 2.28: se usa la versión que trae plotly
+PLOTLY_JS_URL = f"https://cdn.plot.ly/plotly-{plotly.offline.get_plotlyjs_version()}.min.js"
+
+# Tipos enteros que entiende plotly.js, del más chico al más grande
+_INT_DTYPES = [('i1', np.int8), ('u1', np.uint8), ('i2', np.int16), ('u2', np.uint16),
+               ('i4', np.int32), ('u4', np.uint32)]
+
+
+def _typed_array(values, decimals):
+    """Array numérico -> {'dtype', 'bdata'} con el tipo más chico que conserva los valores"""
+    if values.dtype.kind in 'iu' or (values.dtype.kind == 'f' and np.isfinite(values).all()
+                                     and np.array_equal(values, np.round(values))):
+        for name, dtype in _INT_DTYPES:
+            info = np.iinfo(dtype)
+            if values.size == 0 or (values.min() >= info.min and values.max() <= info.max):
+                return {'dtype': name, 'bdata': base64.b64encode(values.astype(dtype).tobytes()).decode()}
+
+    values = np.round(values.astype(np.float64), decimals)
+    # float32 alcanza si el error queda por debajo de la precisión redondeada
+    as_f4 = values.astype(np.float32)
+    if np.allclose(as_f4, values, rtol=0, atol=0.5 * 10 ** -decimals, equal_nan=True):
+        return {'dtype': 'f4', 'bdata': base64.b64encode(as_f4.tobytes()).decode()}
+    return {'dtype': 'f8', 'bdata': base64.b64encode(values.tobytes()).decode()}
+
+
+def _compact(value, decimals):
+    """Recorre la figura: typed arrays para los arrays numéricos, sin valores vacíos"""
+    if isinstance(value, dict):
+        compacted = {k: _compact(v, decimals) for k, v in value.items()}
+        return {k: v for k, v in compacted.items() if v is not None and not (isinstance(v, dict) and not v)}
+    if isinstance(value, np.ndarray):
+        if value.dtype.kind in 'iuf' and value.ndim == 1:
+            return _typed_array(value, decimals)
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_compact(v, decimals) for v in value]
+    if isinstance(value, (float, np.floating)):
+        return round(float(value), decimals)
+    return value
+
+
+def default_template():
+    """Template por defecto de plotly como dict (se incluye una sola vez en el HTML)"""
+    return pio.templates[pio.templates.default].to_plotly_json()
+
+
+def compact_json(fig, decimals=None):
+    """
+    JSON compacto de una figura (se puede usar como serialize de build_charts).
+
+    Args:
+        fig (go.Figure): Figura a serializar
+        decimals (int): Decimales de los floats (por defecto FLOAT_DECIMALS)
+
+    Returns:
+        str: JSON con typed arrays y sin el template por defecto
+    """
+    decimals = FLOAT_DECIMALS if decimals is None else decimals
+    figure = fig.to_plotly_json()
+    layout = dict(figure.get('layout', {}))
+    if layout.get('template') == default_template():
+        del layout['template']
+    compacted = {'data': _compact(figure.get('data', []), decimals), 'layout': _compact(layout, decimals)}
+    return pio.json.to_json_plotly(compacted)
+
+
+def render_compact_script(charts):
+    """
+    Script que descomprime las figuras y las dibuja (cada una en el div con
+    su clave, cambiando '_' por '-').
+
+    Args:
+        charts (dict): Clave del gráfico -> JSON de compact_json()
+
+    Returns:
+        str: Bloque HTML con los datos comprimidos y el código que los dibuja
+    """
+    figures = ','.join(f'"{key.replace("_", "-")}":{chart}' for key, chart in charts.items())
+    payload = f'{{"template":{pio.json.to_json_plotly(default_template())},"figures":{{{figures}}}}}'
+    encoded = base64.b64encode(gzip.compress(payload.encode(), compresslevel=9, mtime=0)).decode()
+    return f"""<script id="report-data" type="application/octet-stream">{encoded}</script>
+        <script>
+            // Figuras comprimidas con gzip (ver report_compact.py)
+            (async function () {{
+                const bytes = Uint8Array.from(atob(document.getElementById('report-data').textContent), c => c.charCodeAt(0));
+                const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'));
+                const payload = JSON.parse(await new Response(stream).text());
+                for (const [id, figure] of Object.entries(payload.figures)) {{
+                    figure.layout.template = figure.layout.template || payload.template;
+                    Plotly.newPlot(id, figure);
+                }}
+            }})();
+        </script>"""
+
+
+def write_compressed(path, content, method='gzip'):
+    """
+    Guarda una copia comprimida del reporte (path + '.gz' o '.br').
+
+    Args:
+        path (str): Ruta del HTML sin comprimir
+        content (str): Contenido del HTML
+        method (str): 'gzip' o 'br' (brotli; si no está instalado se usa gzip)
+
+    Returns:
+        str: Ruta del archivo comprimido
+    """
+    raw = content.encode('utf-8')
+    if method == 'br':
+        try:
+            import brotli
+            compressed, suffix = brotli.compress(raw, quality=11), '.br'
+        except ImportError:
+            print("⚠️  brotli no está instalado: el reporte se comprime con gzip")
+            method = 'gzip'
+    if method == 'gzip':
+        compressed, suffix = gzip.compress(raw, compresslevel=9, mtime=0), '.gz'
+
+    with open(path + suffix, 'wb') as f:
+        f.write(compressed)
+    return path + suffix
@@ -0,0 +1,165 @@
+# =============================================================================
+# CONSTRUCCIÓN EN PARALELO DE LOS GRÁFICOS DE LOS REPORTES HTML
+# =============================================================================
+# generate_all_charts() armaba los ~29 gráficos del reporte uno detrás de otro
+# y después los serializaba con .to_json() dentro del f-string del HTML. Cada
+# sección (real time, VIP, departamentos, ...) solo lee sus tablas, así que
+# los generadores separan la construcción en "builders" por sección y este
+# módulo los ejecuta en un pool de procesos:
+#
+#   - cada builder recibe las tablas y devuelve {clave: go.Figure}
+#   - el worker serializa las figuras a JSON antes de devolverlas: solo viajan
+#     strings entre procesos y la serialización también corre en paralelo
+#   - las tablas se envían una vez por worker (initializer del pool), no una
+#     vez por builder
+#   - con un solo worker se ejecuta todo en el proceso actual, sin pool
+#   - serialize permite otro formato de salida (p. ej. compact_json de
+#     report_compact.py)
+#   - con una ReportCache (report_cache.py) solo se reconstruyen los builders
+#     cuyas tablas cambiaron desde la ejecución anterior
+#
+# Configuración por variables de entorno:
+#   REPORT_WORKERS  -> procesos del pool (por defecto, los núcleos disponibles)
+# =============================================================================
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from report_cache import TrackedTables
+
+# plotly.js que cargan los reportes por defecto
+PLOTLY_CDN_URL = "https://cdn.plot.ly/plotly-latest.min.js"
+
+REPORT_WORKERS = int(os.environ.get('REPORT_WORKERS', os.cpu_count() or 1))
+
+# Tablas del reporte dentro de cada worker (las carga _init_worker)
+_worker_data = None
+
+
+def _init_worker(data):
+    """Guarda las tablas en el worker una sola vez"""
+    global _worker_data
+    _worker_data = data
+
+
+def _to_json(fig):
+    """Serialización por defecto de las figuras"""
+    return fig.to_json()
+
+
+def _run_builder(builder, serialize, select=None, data=None):
+    """
+    Ejecuta un builder y serializa sus figuras.
+
+    Returns:
+        tuple: ({clave: json}, segundos, tablas que leyó el builder)
+    """
+    start = time.perf_counter()
+    tables = _worker_data if data is None else data
+    if select is not None:
+        tables = select(tables)
+    tables = TrackedTables(tables)
+    figures = builder(tables)
+    return {key: serialize(fig) for key, fig in figures.items()}, time.perf_counter() - start, tables.read
+
+
+def run_builders(tasks, data, workers=None, serialize=None, cache=None):
+    """
+    Ejecuta tareas (builder, select) en el pool: select recorta las tablas
+    (p. ej. por fechas o departamentos) antes de llamar al builder.
+
+    Args:
+        tasks (list): Pares (builder, select); select es un callable de nivel
+            de módulo tablas -> tablas, o None para usar todas las tablas
+        data (dict): Tablas del reporte
+        workers (int): Procesos del pool (por defecto REPORT_WORKERS; 1 = sin pool)
+        serialize (callable): Función de nivel de módulo go.Figure -> str
+            (por defecto fig.to_json())
+        cache (ReportCache): Caché en disco; solo se ejecutan las tareas
+            cuyas tablas (recortadas) cambiaron (ver report_cache.py)
+
+    Returns:
+        list: ({clave: json}, segundos, True si salió de la caché) de cada
+            tarea, en el mismo orden
+    """
+    serialize = serialize or _to_json
+    results = [None] * len(tasks)
+    pending = []
+    # Tablas recortadas de las tareas pendientes (la caché guarda sus hashes)
+    sliced = {}
+    for i, (builder, select) in enumerate(tasks):
+        start = time.perf_counter()
+        charts = None
+        if cache is not None:
+            sliced[i] = select(data) if select is not None else data
+            charts = cache.get(builder, select, serialize, sliced[i])
+        if charts is not None:
+            results[i] = (charts, time.perf_counter() - start, True)
+            del sliced[i]
+        else:
+            pending.append(i)
+
+    workers = min(workers or REPORT_WORKERS, len(pending))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(data,)) as pool:
+            futures = [pool.submit(_run_builder, tasks[i][0], serialize, tasks[i][1]) for i in pending]
+            built = [future.result() for future in futures]
+    else:
+        built = [_run_builder(tasks[i][0], serialize, tasks[i][1], data) for i in pending]
+
+    for i, (charts, elapsed, tables_read) in zip(pending, built):
+        if cache is not None:
+            cache.put(tasks[i][0], tasks[i][1], serialize, sliced[i], tables_read, charts)
+        results[i] = (charts, elapsed, False)
+    if cache is not None:
+        cache.prune()
+    return results
+
+
+def build_charts(builders, data, workers=None, verbose=True, serialize=_to_json, cache=None):
+    """
+    Construye y serializa los gráficos de todos los builders.
+
+    Args:
+        builders (list): Funciones de nivel de módulo tablas -> {clave: go.Figure}
+            (tienen que poder enviarse a otro proceso)
+        data (dict): Tablas del reporte (p. ej. las de load_synthetic_data())
+        workers (int): Procesos del pool (por defecto REPORT_WORKERS; 1 = sin pool)
+        verbose (bool): Imprimir el tiempo de cada builder y el total
+        serialize (callable): Función de nivel de módulo go.Figure -> str
+            (por defecto fig.to_json())
+        cache (ReportCache): Caché en disco de los gráficos (None = reconstruir todo)
+
+    Returns:
+        dict: Clave del gráfico -> JSON de la figura, en el orden de los builders
+    """
+    start = time.perf_counter()
+    results = run_builders([(builder, None) for builder in builders], data, workers, serialize, cache)
+
+    charts = {}
+    for builder, (section, elapsed, cached) in zip(builders, results):
+        charts.update(section)
+        if verbose:
+            source = "desde la caché" if cached else "construido(s)"
+            print(f"   ⏱️  {builder.__name__}: {len(section)} gráfico(s) {source} en {elapsed:.2f} s")
+    if verbose:
+        rebuilt = sum(not cached for _, _, cached in results)
+        print(f"📊 {len(charts)} gráficos en {time.perf_counter() - start:.2f} s "
+              f"({rebuilt} de {len(builders)} secciones reconstruidas)")
+    return charts
+
+
+def render_script(charts):
+    """
+    Líneas Plotly.newPlot() de cada gráfico, en el div con su clave
+    cambiando '_' por '-' ('revenue_trends' -> 'revenue-trends').
+
+    Args:
+        charts (dict): Clave del gráfico -> JSON de la figura
+
+    Returns:
+        str: Código JavaScript para el bloque <script> del reporte
+    """
+    return '\n            '.join(f"Plotly.newPlot('{key.replace('_', '-')}', {chart});"
+                                 for key, chart in charts.items())
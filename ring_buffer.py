@@ -0,0 +1,119 @@
+# =============================================================================
+# RING BUFFER COLUMNAR PARA SERIES TEMPORALES
+# =============================================================================
+# Buffer de capacidad fija con un array de NumPy por columna. Cada valor se
+# escribe dos veces (en la posición i y en i + capacidad), así cualquier
+# ventana de hasta 'capacity' registros es un slice contiguo del array y se
+# puede leer sin copiar, aunque el buffer ya haya dado la vuelta.
+#
+#   - append(): O(k) por k filas nuevas, sin realocar ni concatenar
+#   - view(n) / view_last(offset): vistas sin copia de los últimos registros
+#   - tail(n) / last(offset) / between() / since(): lo mismo como DataFrame
+#     (para los callbacks), leído con el mismo lock que usa append()
+#
+# La memoria queda acotada en 2 * capacity valores por columna sin importar
+# cuánto tiempo esté corriendo el dashboard.
+# =============================================================================
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+
+class RingBuffer:
+    """Ring buffer columnar de capacidad fija"""
+
+    def __init__(self, dtypes, capacity):
+        """
+        Args:
+            dtypes (dict): Columna -> dtype de NumPy
+            capacity (int): Cantidad máxima de registros que se conservan
+        """
+        self.capacity = capacity
+        self.columns = list(dtypes)
+        self._arrays = {col: np.empty(2 * capacity, dtype=dtype) for col, dtype in dtypes.items()}
+        self._count = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_frame(cls, df, capacity=None):
+        """Crea un buffer con las columnas y filas de un DataFrame"""
+        buffer = cls(df.dtypes.to_dict(), capacity or len(df))
+        buffer.append(df)
+        return buffer
+
+    def __len__(self):
+        return min(self._count, self.capacity)
+
+    @property
+    def appended(self):
+        """Total de filas agregadas desde la creación (sirve como versión)"""
+        return self._count
+
+    def append(self, rows):
+        """
+        Agrega filas al final del buffer; si se supera la capacidad se pisan
+        las más viejas.
+
+        Args:
+            rows (pd.DataFrame | dict): Valores por columna (mismas columnas del buffer)
+        """
+        values = {col: np.asarray(rows[col]) for col in self.columns}
+        n = len(values[self.columns[0]])
+        with self._lock:
+            skipped = max(n - self.capacity, 0)
+            positions = (self._count + skipped + np.arange(n - skipped)) % self.capacity
+            for col, array in self._arrays.items():
+                new_values = values[col][skipped:]
+                array[positions] = new_values
+                array[positions + self.capacity] = new_values
+            self._count += n
+
+    def view(self, n=None):
+        """
+        Últimos n registros (todos si n es None) como vistas de los arrays,
+        sin copia. Las vistas son válidas hasta que nuevas filas pisen esas
+        posiciones; para conservarlas usar tail().
+
+        Returns:
+            dict: Columna -> np.ndarray
+        """
+        size = len(self)
+        n = size if n is None else min(n, size)
+        start = (self._count - n) % self.capacity
+        return {col: array[start:start + n] for col, array in self._arrays.items()}
+
+    def view_last(self, offset, column='timestamp'):
+        """Vistas de los registros dentro del último 'offset' ('24h', '7D', ...)"""
+        times = self.view()[column]
+        if len(times) == 0:
+            return self.view(0)
+        cutoff = times[-1] - pd.Timedelta(offset).to_timedelta64()
+        return self.view(len(times) - np.searchsorted(times, cutoff, side='right'))
+
+    def tail(self, n=None):
+        """Últimos n registros como DataFrame"""
+        with self._lock:
+            return pd.DataFrame(self.view(n))
+
+    def last(self, offset, column='timestamp'):
+        """Registros dentro del último 'offset' ('24h', '7D', ...) como DataFrame"""
+        with self._lock:
+            return pd.DataFrame(self.view_last(offset, column))
+
+    def between(self, start, end, column='timestamp'):
+        """Registros con 'column' en [start, end] como DataFrame"""
+        with self._lock:
+            columns = self.view()
+            times = columns[column]
+            lo = np.searchsorted(times, pd.Timestamp(start).to_datetime64(), side='left')
+            hi = np.searchsorted(times, pd.Timestamp(end).to_datetime64(), side='right')
+            return pd.DataFrame({col: values[lo:hi] for col, values in columns.items()})
+
+    def since(self, value, column='timestamp'):
+        """Registros con 'column' posterior a 'value' como DataFrame"""
+        with self._lock:
+            times = self.view()[column]
+            start = np.searchsorted(times, pd.Timestamp(value).to_datetime64(), side='right')
+            return pd.DataFrame(self.view(len(times) - start))
@@ -0,0 +1,139 @@
+# =============================================================================
+# MATRIZ DE CORRELACIÓN INCREMENTAL
+# =============================================================================
+# update_correlation_matrix recalculaba df.corr() sobre las 18 variables cada
+# vez que cambiaba el store. CorrelationAccumulator guarda solo la cantidad de
+# filas, las medias y la matriz de co-momentos (sumas de productos cruzados
+# centrados) y las combina por lotes con la fórmula de Chan (Welford para
+# varios lotes), así que:
+#
+#   - agregar filas nuevas cuesta O(filas nuevas), sin recorrer la historia
+#   - un CSV que no entra en memoria se procesa chunk por chunk
+#   - dos acumuladores (p. ej. de procesos distintos) se pueden combinar
+#
+# Trabajar con valores centrados evita la cancelación numérica de la fórmula
+# ingenua sum(x*y) - sum(x)*sum(y)/n.
+# =============================================================================
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from churn_data import CHUNK_ROWS, FEATURE_COLUMNS, feature_matrix, get_dataset, read_churn_csv_chunks
+
+
+class CorrelationAccumulator:
+    """Medias y co-momentos acumulados para calcular correlaciones de Pearson"""
+
+    def __init__(self, columns=FEATURE_COLUMNS):
+        """
+        Args:
+            columns (list): Variables de la matriz, en orden
+        """
+        self.columns = list(columns)
+        d = len(self.columns)
+        self.count = 0
+        self.mean = np.zeros(d)
+        self.comoment = np.zeros((d, d))
+
+    def _merge(self, count, mean, comoment):
+        """Combina con el resumen (count, mean, comoment) de otro lote (fórmula de Chan)"""
+        if count == 0:
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        self.comoment += comoment + np.outer(delta, delta) * (self.count * count / total)
+        self.mean += delta * (count / total)
+        self.count = total
+
+    def update(self, df):
+        """Incorpora filas nuevas (DataFrame de churn con las columnas del acumulador)"""
+        values = feature_matrix(df, self.columns)
+        if len(values) == 0:
+            return self
+        mean = values.mean(axis=0)
+        centered = values - mean
+        self._merge(len(values), mean, centered.T @ centered)
+        return self
+
+    def combine(self, other):
+        """Incorpora otro acumulador con las mismas columnas"""
+        self._merge(other.count, other.mean, other.comoment)
+        return self
+
+    @classmethod
+    def from_csv(cls, path, chunksize=CHUNK_ROWS, columns=FEATURE_COLUMNS):
+        """Acumula un CSV de churn chunk por chunk, sin cargarlo completo"""
+        accumulator = cls(columns)
+        for chunk in read_churn_csv_chunks(path, chunksize):
+            accumulator.update(chunk)
+        return accumulator
+
+    def correlation(self):
+        """
+        Matriz de correlación de Pearson (como df.corr(); NaN para variables
+        constantes).
+
+        Returns:
+            pd.DataFrame: Matriz columnas x columnas
+        """
+        std = np.sqrt(np.diag(self.comoment))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = self.comoment / np.outer(std, std)
+        corr = np.clip(corr, -1, 1)
+        np.fill_diagonal(corr, np.where(std > 0, 1.0, np.nan))
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+
+class CorrelationService:
+    """
+    Un acumulador por dataset: cuando llega una versión nueva que solo agrega
+    filas al final, se suman esas filas; si cambió alguna fila ya acumulada,
+    se recalcula desde cero.
+    """
+
+    def __init__(self, load=get_dataset, columns=FEATURE_COLUMNS):
+        """
+        Args:
+            load (callable): ref -> DataFrame del dataset (ver churn_data.get_dataset)
+            columns (list): Variables de la matriz, en orden
+        """
+        self._load = load
+        self._columns = list(columns)
+        self._lock = threading.Lock()
+        # key -> (version, CorrelationAccumulator, hash de las filas acumuladas)
+        self._accumulators = {}
+
+    def _row_hashes(self, df):
+        """Hash de cada fila en las columnas de la matriz"""
+        return pd.util.hash_pandas_object(df[self._columns], index=False).to_numpy()
+
+    def _get(self, ref):
+        key, version = ref['key'], ref.get('version')
+        cached = self._accumulators.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        df = self._load(ref)
+        hashes = self._row_hashes(df)
+        accumulator = None
+        if cached is not None:
+            _, previous, prefix_hash = cached
+            # Versión que solo agrega filas al final (las acumuladas no
+            # cambiaron): se suman las nuevas en O(filas nuevas)
+            if len(df) >= previous.count and hashes[:previous.count].sum(dtype=np.uint64) == prefix_hash:
+                accumulator = previous.update(df.iloc[previous.count:])
+        if accumulator is None:
+            accumulator = CorrelationAccumulator(self._columns).update(df)
+        self._accumulators[key] = (version, accumulator, hashes.sum(dtype=np.uint64))
+        return accumulator
+
+    def correlation(self, ref):
+        """Matriz de correlación del dataset (se actualiza con cada versión nueva)"""
+        with self._lock:
+            return self._get(ref).correlation()
+
+
+# Servicio compartido por los callbacks
+correlation_service = CorrelationService()
@@ -0,0 +1,157 @@
+# =============================================================================
+# TRAZAS DE DISPERSIÓN QUE ESCALAN CON LA CANTIDAD DE PUNTOS
+# =============================================================================
+# Un go.Scatter dibuja cada marcador como un nodo SVG: con decenas de miles de
+# clientes el navegador deja de responder. scatter_trace() elige la traza
+# según la cantidad de puntos:
+#
+#   - hasta SCATTER_WEBGL_THRESHOLD puntos  -> go.Scatter (SVG, como antes)
+#   - hasta SCATTER_DENSITY_THRESHOLD       -> go.Scattergl (WebGL)
+#   - más puntos                            -> go.Heatmap con los conteos de
+#                                              una grilla calculada en el
+#                                              servidor (densidad)
+#
+# En el modo densidad el payload queda acotado por la grilla
+# (SCATTER_DENSITY_BINS x SCATTER_DENSITY_BINS) y no por la cantidad de filas.
+# Si el marker trae un color por punto (p. ej. churn 0/1 con su colorscale),
+# scatter_traces() arma una grilla por clase con el color de esa clase: todas
+# con los mismos bordes de celda y semitransparentes, para que se vean las
+# clases superpuestas. Los colores no numéricos (categorías) toman la paleta
+# discreta de plotly. Con más de SCATTER_DENSITY_MAX_CLASSES valores
+# distintos (color continuo) se usa WebGL para no perder los colores.
+#
+# Configuración por variables de entorno:
+#   SCATTER_WEBGL_THRESHOLD    -> puntos a partir de los cuales se usa WebGL
+#   SCATTER_DENSITY_THRESHOLD  -> puntos a partir de los cuales se agrega en grilla
+#   SCATTER_DENSITY_BINS       -> celdas por eje de la grilla de densidad
+#   SCATTER_DENSITY_MAX_CLASSES -> clases de color con grilla propia en modo densidad
+# =============================================================================
+
+import os
+
+import numpy as np
+import plotly.graph_objects as go
+from plotly.colors import qualitative, sample_colorscale
+
+WEBGL_THRESHOLD = int(os.environ.get('SCATTER_WEBGL_THRESHOLD', 10000))
+DENSITY_THRESHOLD = int(os.environ.get('SCATTER_DENSITY_THRESHOLD', 500000))
+DENSITY_BINS = int(os.environ.get('SCATTER_DENSITY_BINS', 200))
+DENSITY_MAX_CLASSES = int(os.environ.get('SCATTER_DENSITY_MAX_CLASSES', 8))
+
+# Opacidad de cada grilla cuando hay varias clases superpuestas
+DENSITY_CLASS_OPACITY = 0.6
+
+
+def density_trace(x, y, name=None, color='#007bff', bins=DENSITY_BINS, bounds=None, opacity=1.0):
+    """
+    Heatmap con la cantidad de puntos por celda de una grilla bins x bins.
+
+    Args:
+        x, y (array-like): Coordenadas de los puntos
+        name (str): Nombre de la traza
+        color (str): Color de las celdas más densas (las vacías quedan transparentes)
+        bins (int): Celdas por eje
+        bounds (list): [[xmin, xmax], [ymin, ymax]] de la grilla; por defecto
+            los de los puntos (trazas superpuestas deben compartirlos)
+        opacity (float): Opacidad de la traza
+
+    Returns:
+        go.Heatmap: Traza de densidad
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    valid = np.isfinite(x) & np.isfinite(y)
+    counts, x_edges, y_edges = np.histogram2d(x[valid], y[valid], bins=bins, range=bounds)
+    # Celdas vacías como NaN (null en el JSON) para que no tapen el fondo del gráfico
+    z = np.where(counts.T > 0, counts.T, np.nan)
+    return go.Heatmap(
+        x=(x_edges[:-1] + x_edges[1:]) / 2,
+        y=(y_edges[:-1] + y_edges[1:]) / 2,
+        z=z,
+        name=name,
+        zmin=0,
+        opacity=opacity,
+        colorscale=[[0, 'white'], [1, color]] if isinstance(color, str) else 'Blues',
+        showscale=False,
+        hoverongaps=False,
+        hovertemplate='x: %{x:.2f}<br>y: %{y:.2f}<br>Puntos: %{z}<extra></extra>'
+    )
+
+
+def _bounds(x, y):
+    """Extremos [[xmin, xmax], [ymin, ymax]] de los puntos válidos"""
+    valid = np.isfinite(x) & np.isfinite(y)
+    if not valid.any():
+        return None
+    return [[x[valid].min(), x[valid].max()], [y[valid].min(), y[valid].max()]]
+
+
+def _class_color(value, marker, index=0):
+    """
+    Color de una clase según el colorscale del marker (como lo dibujaría
+    plotly.js); si los colores no son numéricos, el index-ésimo de la paleta
+    discreta.
+    """
+    try:
+        values = np.asarray(marker['color'], dtype=np.float64)
+        value = float(value)
+    except (TypeError, ValueError):
+        return qualitative.Plotly[index % len(qualitative.Plotly)]
+    cmin = marker.get('cmin', np.nanmin(values))
+    cmax = marker.get('cmax', np.nanmax(values))
+    position = (value - cmin) / (cmax - cmin) if cmax > cmin else 0.0
+    return sample_colorscale(marker.get('colorscale') or 'Plasma', [min(max(position, 0.0), 1.0)])[0]
+
+
+def scatter_traces(x, y, mode='markers', **kwargs):
+    """
+    Trazas de dispersión (SVG, WebGL o densidad) según la cantidad de puntos.
+
+    Args:
+        x, y (array-like): Coordenadas de los puntos
+        mode (str): Modo de la traza ('markers', 'lines+markers', ...)
+        **kwargs: Argumentos de go.Scatter (name, marker, text, hovertemplate, ...);
+            en el modo densidad solo se usan name, text y los colores del marker
+
+    Returns:
+        list: Una traza, o en modo densidad con marker.color por punto una
+            go.Heatmap por clase de color
+    """
+    n = len(x)
+    marker = kwargs.get('marker') or {}
+    color = marker.get('color', '#007bff')
+    if n > DENSITY_THRESHOLD:
+        if isinstance(color, str):
+            return [density_trace(x, y, name=kwargs.get('name'), color=color)]
+        color = np.asarray(color)
+        classes = np.unique(color)
+        if len(classes) <= DENSITY_MAX_CLASSES:
+            x, y = np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64)
+            # Mismos bordes de celda para todas las clases
+            bounds = _bounds(x, y)
+            opacity = DENSITY_CLASS_OPACITY if len(classes) > 1 else 1.0
+            text = kwargs.get('text')
+            traces = []
+            for index, value in enumerate(classes):
+                selected = color == value
+                label = np.asarray(text)[selected][0] if text is not None and np.ndim(text) else value
+                traces.append(density_trace(x[selected], y[selected], name=str(label),
+                                            color=_class_color(value, marker, index),
+                                            bounds=bounds, opacity=opacity))
+            return traces
+    trace_type = go.Scattergl if n > WEBGL_THRESHOLD else go.Scatter
+    return [trace_type(x=x, y=y, mode=mode, **kwargs)]
+
+
+def scatter_trace(x, y, mode='markers', **kwargs):
+    """
+    Una sola traza de dispersión (ver scatter_traces()); con color por punto
+    en modo densidad se usa WebGL.
+
+    Returns:
+        go.Scatter | go.Scattergl | go.Heatmap
+    """
+    traces = scatter_traces(x, y, mode, **kwargs)
+    if len(traces) == 1:
+        return traces[0]
+    return go.Scattergl(x=x, y=y, mode=mode, **kwargs)
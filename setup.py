@@ -19,6 +19,7 @@ setup(
         "folium>=0.16.0",
         "dash-extensions>=1.0.4",
         "gunicorn>=23.0.0",
+        "pyarrow>=17.0.0",
     ],
     python_requires=">=3.12",
     classifiers=[
@@ -0,0 +1,398 @@
+# =============================================================================
+# GENERADOR VECTORIZADO DE DATOS SINTÉTICOS - BILLING OPERATIONS
+# =============================================================================
+# Genera las mismas 8 tablas que usa billing_dashboard.py (real_time,
+# vip_customers, departments, products, complaints, customers, network,
+# operations) con una sola llamada de NumPy por columna, sin bucles por fila.
+#
+# Permite escalar el volumen de datos (días, frecuencia, clientes, quejas)
+# para pruebas de carga: p. ej. freq='s' y days=116 produce ~10M filas en
+# las tablas real_time y network en pocos segundos.
+#
+# load_synthetic_data() es el punto de entrada compartido por el dashboard y
+# los generadores de reportes: genera las tablas una sola vez y las guarda en
+# un caché columnar (Parquet) identificado por semilla y escala. Como la clave
+# incluye la hora de referencia, después de cada escritura se borran las
+# carpetas del caché más viejas (se conservan las SYNTHETIC_DATA_CACHE_KEEP
+# más recientes).
+# =============================================================================
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+# =============================================================================
+# CATÁLOGOS
+# =============================================================================
+SERVICE_LEVELS = ['Premium', 'Enterprise', 'Gold']
+DEPARTMENTS = ['Sales', 'Marketing', 'Engineering', 'Finance', 'HR', 'Operations', 'Customer Service']
+PRODUCTS = ['Internet 100Mbps', 'Internet 500Mbps', 'Internet 1Gbps', 'Cable TV Basic',
+            'Cable TV Premium', 'Phone Line', 'Mobile Plan', 'Bundle Package']
+COMPLAINT_TYPES = ['Billing Error', 'Service Outage', 'Speed Issues', 'Customer Service',
+                   'Installation Problem', 'Equipment Issue', 'Contract Dispute']
+RESOLUTION_TIMES = [1, 2, 3, 5, 7, 10, 15]  # días
+PRIORITIES = ['Low', 'Medium', 'High', 'Critical']
+COMPLAINT_STATUSES = ['Resolved', 'In Progress', 'Escalated']
+INCOME_LEVELS = ['Low', 'Medium', 'High']
+PAYMENT_METHODS = ['Credit Card', 'Bank Transfer', 'Check', 'Auto-Pay']
+REGIONS = ['Northeast', 'Southeast', 'Midwest', 'West']
+
+# Tablas que produce el generador (mismo orden que el diccionario devuelto)
+TABLES = ['real_time', 'vip_customers', 'departments', 'products',
+          'complaints', 'customers', 'network', 'operations']
+
+# Carpeta del caché columnar (se puede cambiar con la variable de entorno)
+CACHE_DIR = os.environ.get('SYNTHETIC_DATA_CACHE', os.path.join('Data', 'cache'))
+CACHE_KEEP = int(os.environ.get('SYNTHETIC_DATA_CACHE_KEEP', 3))
+
+
+# =============================================================================
+# FUNCIONES AUXILIARES
+# =============================================================================
+def _choice(rng, categories, n):
+    """Elige n valores de una lista como columna categórica (códigos enteros)."""
+    codes = rng.integers(0, len(categories), n)
+    return pd.Categorical.from_codes(codes, categories=categories)
+
+
+def _ids(prefix, start, n, width):
+    """Genera identificadores tipo 'CUST_0001' para n filas."""
+    numbers = np.arange(start, start + n).astype(str)
+    return np.char.add(prefix, np.char.zfill(numbers, width)).astype(object)
+
+
+def _daily_panel(entities, dates):
+    """
+    Construye un panel entidad x día en el mismo orden que los bucles originales
+    (todas las fechas de la primera entidad, luego la segunda, ...).
+    """
+    n = len(entities) * len(dates)
+    entity_col = pd.Categorical.from_codes(
+        np.repeat(np.arange(len(entities)), len(dates)), categories=entities
+    )
+    date_col = np.tile(dates, len(entities))
+    return n, entity_col, date_col
+
+
+# =============================================================================
+# GENERADOR PRINCIPAL
+# =============================================================================
+def real_time_rows(rng, timestamps):
+    """
+    Filas de facturación en tiempo real para los timestamps dados.
+
+    Se usa tanto para la historia inicial como para los registros nuevos del
+    modo streaming (ver billing_stream.py).
+
+    Args:
+        rng (np.random.Generator): Generador aleatorio
+        timestamps (pd.DatetimeIndex): Marcas de tiempo de las filas
+
+    Returns:
+        pd.DataFrame: Filas con el esquema de la tabla real_time
+    """
+    n = len(timestamps)
+    hour_factor = 1 + 0.5 * np.sin(2 * np.pi * timestamps.hour.values / 24)
+    return pd.DataFrame({
+        'timestamp': timestamps,
+        'calls_volume': (1000 + 500 * hour_factor + rng.normal(0, 100, n)).astype(np.int64),
+        'messages_volume': (5000 + 2000 * hour_factor + rng.normal(0, 500, n)).astype(np.int64),
+        'data_volume_gb': np.round(100 + 50 * hour_factor + rng.normal(0, 10, n), 2),
+        'voice_revenue': np.round(5000 + 2000 * hour_factor + rng.normal(0, 500, n), 2),
+        'data_revenue': np.round(8000 + 3000 * hour_factor + rng.normal(0, 800, n), 2),
+        'total_revenue': np.round(13000 + 5000 * hour_factor + rng.normal(0, 1000, n), 2)
+    })
+
+
+def network_rows(rng, timestamps):
+    """
+    Filas de métricas de red para los timestamps dados.
+
+    Args:
+        rng (np.random.Generator): Generador aleatorio
+        timestamps (pd.DatetimeIndex): Marcas de tiempo de las filas
+
+    Returns:
+        pd.DataFrame: Filas con el esquema de la tabla network
+    """
+    n = len(timestamps)
+    daily_wave = np.sin(2 * np.pi * timestamps.hour.values / 24)
+    return pd.DataFrame({
+        'timestamp': timestamps,
+        'traffic_volume_gbps': np.round(10 + 5 * daily_wave + rng.normal(0, 1, n), 2),
+        'connection_speed_mbps': np.round(100 + rng.normal(0, 10, n), 2),
+        'latency_ms': np.round(20 + rng.normal(0, 5, n), 2),
+        'packet_loss_percent': np.round(rng.uniform(0, 2, n), 3),
+        'uptime_percent': np.round(99.5 + rng.normal(0, 0.1, n), 2),
+        'active_connections': (50000 + rng.normal(0, 5000, n)).astype(np.int64),
+        'bandwidth_utilization': np.round(60 + 20 * daily_wave + rng.normal(0, 5, n), 2)
+    })
+
+
+def generate_synthetic_data(seed=42, days=30, freq='h', n_customers=1000,
+                            n_complaints=200, n_vip=20, end=None):
+    """
+    Genera datos sintéticos para todos los dashboards de forma vectorizada.
+
+    Args:
+        seed (int): Semilla del generador aleatorio (reproducibilidad)
+        days (int): Días de historia para las tablas diarias y horarias
+        freq (str): Frecuencia de real_time y network ('h', 'min', 's', ...)
+        n_customers (int): Cantidad de clientes en la tabla customers
+        n_complaints (int): Cantidad de quejas en la tabla complaints
+        n_vip (int): Cantidad de clientes VIP
+        end (datetime): Fecha de referencia (por defecto, ahora)
+
+    Returns:
+        dict: Diccionario con los 8 DataFrames del dashboard
+    """
+    rng = np.random.default_rng(seed)
+    end = pd.Timestamp(end if end is not None else datetime.now())
+
+    # Fechas de la serie temporal y fechas diarias (de más reciente a más antigua,
+    # igual que el generador original)
+    timestamps = pd.date_range(start=end - timedelta(days=days), end=end, freq=freq)
+    daily_dates = (end - pd.to_timedelta(np.arange(days), unit='D')).values
+
+    # =====================================================================
+    # DATOS DE FACTURACIÓN EN TIEMPO REAL
+    # =====================================================================
+    real_time_df = real_time_rows(rng, timestamps)
+
+    # =====================================================================
+    # DATOS DE CLIENTES VIP
+    # =====================================================================
+    vip_ids = [f'VIP_{i:03d}' for i in range(1, n_vip + 1)]
+    n, customer_col, date_col = _daily_panel(vip_ids, daily_dates)
+    vip_df = pd.DataFrame({
+        'customer_id': customer_col.astype(object),
+        'date': date_col,
+        'voice_usage_minutes': (200 + rng.normal(0, 50, n)).astype(np.int64),
+        'data_usage_gb': np.round(10 + rng.normal(0, 3, n), 2),
+        'monthly_bill': np.round(150 + rng.normal(0, 30, n), 2),
+        'pending_amount': np.round(rng.uniform(0, 50, n), 2),
+        'service_level': _choice(rng, SERVICE_LEVELS, n),
+        'satisfaction_score': np.round(rng.uniform(7, 10, n), 1)
+    })
+
+    # =====================================================================
+    # DATOS DE FACTURACIÓN POR DEPARTAMENTO
+    # =====================================================================
+    n, dept_col, date_col = _daily_panel(DEPARTMENTS, daily_dates)
+    dept_df = pd.DataFrame({
+        'department': dept_col,
+        'date': date_col,
+        'billed_amount': np.round(5000 + rng.normal(0, 1000, n), 2),
+        'traffic_volume': (1000 + rng.normal(0, 200, n)).astype(np.int64),
+        'active_users': (50 + rng.normal(0, 10, n)).astype(np.int64),
+        'cost_per_user': np.round(50 + rng.normal(0, 10, n), 2),
+        'efficiency_score': np.round(rng.uniform(0.7, 1.0, n), 2)
+    })
+
+    # =====================================================================
+    # DATOS DE FACTURACIÓN POR PRODUCTO
+    # =====================================================================
+    n, product_col, date_col = _daily_panel(PRODUCTS, daily_dates)
+    product_df = pd.DataFrame({
+        'product': product_col,
+        'date': date_col,
+        'billed_amount': np.round(10000 + rng.normal(0, 2000, n), 2),
+        'subscribers': (500 + rng.normal(0, 100, n)).astype(np.int64),
+        'revenue_per_subscriber': np.round(80 + rng.normal(0, 15, n), 2),
+        'churn_rate': np.round(rng.uniform(0.01, 0.05, n), 3),
+        'profit_margin': np.round(rng.uniform(0.2, 0.4, n), 2)
+    })
+
+    # =====================================================================
+    # DATOS DE QUEJAS Y RESOLUCIONES
+    # =====================================================================
+    n = n_complaints
+    complaint_dates = end - pd.to_timedelta(rng.integers(1, max(days, 2), n), unit='D')
+    resolution_days = rng.choice(RESOLUTION_TIMES, n)
+    complaints_df = pd.DataFrame({
+        'complaint_id': _ids('COMP_', 0, n, 4),
+        'complaint_date': complaint_dates,
+        'resolution_date': complaint_dates + pd.to_timedelta(resolution_days, unit='D'),
+        'complaint_type': _choice(rng, COMPLAINT_TYPES, n),
+        'priority': _choice(rng, PRIORITIES, n),
+        'resolution_time_days': resolution_days.astype(np.int64),
+        'customer_satisfaction': rng.integers(1, 6, n),
+        'department': _choice(rng, DEPARTMENTS, n),
+        'status': _choice(rng, COMPLAINT_STATUSES, n)
+    })
+
+    # =====================================================================
+    # DATOS DE ANÁLISIS DE CLIENTES
+    # =====================================================================
+    n = n_customers
+    customer_df = pd.DataFrame({
+        'customer_id': _ids('CUST_', 0, n, 4),
+        'age': rng.integers(18, 80, n),
+        'income_level': _choice(rng, INCOME_LEVELS, n),
+        'tenure_months': rng.integers(1, 120, n),
+        'monthly_bill': np.round(50 + rng.normal(0, 20, n), 2),
+        'services_count': rng.integers(1, 5, n),
+        'churn_risk': np.round(rng.uniform(0, 1, n), 2),
+        'satisfaction_score': np.round(rng.uniform(1, 10, n), 1),
+        'payment_method': _choice(rng, PAYMENT_METHODS, n),
+        'region': _choice(rng, REGIONS, n)
+    })
+
+    # =====================================================================
+    # DATOS DE ANÁLISIS DE RED
+    # =====================================================================
+    network_df = network_rows(rng, timestamps)
+
+    # =====================================================================
+    # DATOS DE ANÁLISIS DE OPERACIONES
+    # =====================================================================
+    n = days
+    operations_df = pd.DataFrame({
+        'date': daily_dates,
+        'invoices_processed': (1000 + rng.normal(0, 100, n)).astype(np.int64),
+        'processing_time_minutes': np.round(5 + rng.normal(0, 1, n), 2),
+        'error_rate_percent': np.round(rng.uniform(0.1, 2.0, n), 2),
+        'automation_rate_percent': np.round(85 + rng.normal(0, 5, n), 2),
+        'staff_productivity': np.round(rng.uniform(0.8, 1.2, n), 2),
+        'cost_per_invoice': np.round(2 + rng.normal(0, 0.5, n), 2),
+        'customer_satisfaction': np.round(rng.uniform(7, 9, n), 1)
+    })
+
+    return {
+        'real_time': real_time_df,
+        'vip_customers': vip_df,
+        'departments': dept_df,
+        'products': product_df,
+        'complaints': complaints_df,
+        'customers': customer_df,
+        'network': network_df,
+        'operations': operations_df
+    }
+
+
+# =============================================================================
+# CACHÉ COLUMNAR EN DISCO
+# =============================================================================
+def cache_key(seed=42, days=30, freq='h', n_customers=1000, n_complaints=200,
+              n_vip=20, end=None):
+    """
+    Calcula la clave del caché a partir de la semilla, la escala y la fecha de
+    referencia (redondeada a la hora).
+
+    Returns:
+        tuple: (clave hexadecimal, fecha de referencia usada)
+    """
+    end = pd.Timestamp(end if end is not None else datetime.now()).floor('h')
+    params = {
+        'seed': seed, 'days': days, 'freq': freq, 'n_customers': n_customers,
+        'n_complaints': n_complaints, 'n_vip': n_vip, 'end': end.isoformat()
+    }
+    digest = hashlib.sha1(json.dumps(params, sort_keys=True).encode()).hexdigest()[:16]
+    return digest, end
+
+
+def load_synthetic_data(seed=42, days=30, freq='h', n_customers=1000,
+                        n_complaints=200, n_vip=20, end=None, cache_dir=None):
+    """
+    Devuelve las tablas sintéticas leyéndolas del caché Parquet si existen;
+    si no, las genera una vez y las persiste para los siguientes procesos.
+
+    Args:
+        seed, days, freq, n_customers, n_complaints, n_vip: Ver generate_synthetic_data
+        end (datetime): Fecha de referencia (por defecto, la hora actual)
+        cache_dir (str): Carpeta del caché (por defecto, CACHE_DIR)
+
+    Returns:
+        dict: Diccionario con los 8 DataFrames del dashboard
+    """
+    key, end = cache_key(seed, days, freq, n_customers, n_complaints, n_vip, end)
+    path = os.path.join(cache_dir or CACHE_DIR, key)
+
+    if os.path.isdir(path):
+        try:
+            return {name: pd.read_parquet(os.path.join(path, f"{name}.parquet"))
+                    for name in TABLES}
+        except (ImportError, OSError, ValueError) as e:
+            print(f"⚠️  No se pudo leer el caché {path}: {e}")
+
+    data = generate_synthetic_data(seed=seed, days=days, freq=freq, n_customers=n_customers,
+                                   n_complaints=n_complaints, n_vip=n_vip, end=end)
+    _write_cache(data, path)
+    return data
+
+
+def _write_cache(data, path):
+    """
+    Escribe las tablas en una carpeta temporal y la renombra al final, para que
+    varios procesos (workers de gunicorn, reportes) nunca lean un caché a medias.
+    """
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    try:
+        os.makedirs(tmp_path, exist_ok=True)
+        for name, df in data.items():
+            df.to_parquet(os.path.join(tmp_path, f"{name}.parquet"), index=False)
+        os.replace(tmp_path, path)
+    except ImportError:
+        print("⚠️  pyarrow no está instalado: los datos no se guardarán en caché")
+        return
+    except OSError:
+        return  # Otro proceso escribió el mismo caché primero
+    finally:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+    _prune_cache(os.path.dirname(path))
+
+
+def _prune_cache(cache_dir, keep=CACHE_KEEP):
+    """
+    Borra las carpetas del caché de datos sintéticos (nombre = clave de 16
+    caracteres hexadecimales) salvo las 'keep' más recientes. Un proceso que
+    estuviera leyendo una carpeta borrada vuelve a generar los datos.
+    """
+    try:
+        entries = [entry for entry in os.scandir(cache_dir)
+                   if entry.is_dir() and re.fullmatch(r'[0-9a-f]{16}', entry.name)]
+    except OSError:
+        return
+    entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+    for entry in entries[keep:]:
+        shutil.rmtree(entry.path, ignore_errors=True)
+
+
+# =============================================================================
+# BENCHMARK DESDE LÍNEA DE COMANDOS
+# =============================================================================
+def main():
+    """Genera los datos con la escala indicada e imprime tiempos y tamaños"""
+    parser = argparse.ArgumentParser(description="Generador vectorizado de datos sintéticos")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--freq', default='h', help="Frecuencia de real_time/network (h, min, s)")
+    parser.add_argument('--customers', type=int, default=1000)
+    parser.add_argument('--complaints', type=int, default=200)
+    parser.add_argument('--vip', type=int, default=20)
+    parser.add_argument('--cache', action='store_true', help="Usar/llenar el caché Parquet")
+    args = parser.parse_args()
+
+    loader = load_synthetic_data if args.cache else generate_synthetic_data
+    start = time.perf_counter()
+    data = loader(seed=args.seed, days=args.days, freq=args.freq,
+                  n_customers=args.customers, n_complaints=args.complaints,
+                  n_vip=args.vip)
+    elapsed = time.perf_counter() - start
+
+    print(f"⏱️  Datos {'cargados' if args.cache else 'generados'} en {elapsed:.2f}s")
+    for name, df in data.items():
+        memory_mb = df.memory_usage(deep=True).sum() / 1024 ** 2
+        print(f"   • {name}: {len(df):,} filas ({memory_mb:,.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+import numpy as np
+import pandas as pd
+
+from billing_stream import TimeSeriesStream
+from synthetic_data import real_time_rows
+
+
+def test_advance_starts_an_empty_stream_and_refreshes_rollups():
+    history = real_time_rows(np.random.default_rng(0), pd.date_range('2024-01-01', periods=1, freq='h')).iloc[:0]
+    stream = TimeSeriesStream(history, real_time_rows, freq='h', capacity=100)
+    assert stream.last_timestamp() is None
+
+    assert stream.advance('2024-01-01 10:30') == 1
+    assert stream.last_timestamp() == '2024-01-01T10:00:00'
+    assert len(stream.rollup('1D')) == 1
+
+    stream.advance('2024-01-02 01:00')
+    assert stream.rollup('1D')['timestamp'].tolist() == [pd.Timestamp('2024-01-01'), pd.Timestamp('2024-01-02')]
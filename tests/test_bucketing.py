@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+
+from bucketing import Bins, Rules, bucket_counts
+
+
+def test_bins_boundaries_match_pd_cut():
+    bins = Bins([1, 3, 7], ['<=1', '2-3', '4-7', '8+'])
+    values = np.array([0, 1, 1.5, 3, 3.01, 7, 8])
+
+    expected = pd.cut(values, [-np.inf, 1, 3, 7, np.inf], labels=bins.labels)
+    assert list(bins(values)) == list(expected)
+
+
+def test_bins_closed_left_puts_threshold_in_upper_bucket():
+    bins = Bins([50], ['Low', 'High'], closed='left')
+
+    assert list(bins([49.99, 50, 51])) == ['Low', 'High', 'High']
+
+
+def test_rules_first_match_wins_and_default_applies():
+    rules = Rules([
+        ('Premium', lambda df: df['bill'] > 80),
+        ('Loyal', lambda df: df['tenure'] >= 24),
+    ], default='Standard')
+    df = pd.DataFrame({'bill': [81, 80, 90, 10], 'tenure': [30, 24, 1, 23]})
+
+    assert list(rules(df)) == ['Premium', 'Loyal', 'Premium', 'Standard']
+
+
+def test_bucket_counts_matches_value_counts_order():
+    values = pd.Series(['b', 'a', 'b', 'c', 'a', 'b'])
+    buckets = pd.Categorical(values, categories=['a', 'b', 'c', 'unused'])
+
+    pd.testing.assert_series_equal(bucket_counts(buckets), values.value_counts(), check_index_type=False)
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_snapshot import SnapshotStore
+
+
+@pytest.fixture
+def store():
+    return SnapshotStore({'customers': pd.DataFrame({
+        'customer_id': ['C1', 'C2'],
+        'bill': [10.0, 20.0],
+        'region': pd.Categorical(['North', 'South']),
+    })})
+
+
+def test_snapshot_arrays_are_read_only(store):
+    df = store.current().table('customers')
+
+    with pytest.raises(ValueError):
+        df['bill'].to_numpy()[0] = 99
+    with pytest.raises(ValueError):
+        np.asarray(df['region'].cat.codes.to_numpy())[0] = 1
+
+
+def test_table_copies_do_not_share_new_columns(store):
+    snapshot = store.current()
+    df = snapshot.table('customers')
+    df['double'] = df['bill'] * 2
+
+    assert 'double' not in snapshot.table('customers')
+
+
+def test_append_publishes_new_version_and_keeps_old(store):
+    old = store.current()
+    new = store.append('customers', pd.DataFrame({'customer_id': ['C3'], 'bill': [30.0],
+                                                  'region': pd.Categorical(['North'])}))
+
+    assert new.version == old.version + 1
+    assert len(old.table('customers')) == 2
+    assert len(store.current().table('customers')) == 3
+
+
+def test_upsert_replaces_by_key_and_rejects_duplicates(store):
+    rows = pd.DataFrame({'customer_id': ['C2', 'C3'], 'bill': [25.0, 30.0],
+                         'region': pd.Categorical(['South', 'North'])})
+    df = store.upsert('customers', rows, 'customer_id').table('customers')
+
+    assert df['customer_id'].is_unique
+    assert df.set_index('customer_id')['bill'].to_dict() == {'C1': 10.0, 'C2': 25.0, 'C3': 30.0}
+    with pytest.raises(ValueError):
+        store.upsert('customers', pd.concat([rows, rows]), 'customer_id')
+
+
+def test_upsert_keeps_the_position_of_replaced_rows(store):
+    rows = pd.DataFrame({'customer_id': ['C3', 'C1'], 'bill': [30.0, 15.0],
+                         'region': pd.Categorical(['North', 'North'])})
+    df = store.upsert('customers', rows, 'customer_id').table('customers')
+
+    assert df['customer_id'].tolist() == ['C1', 'C2', 'C3']
+    assert df['bill'].tolist() == [15.0, 20.0, 30.0]
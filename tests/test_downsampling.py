@@ -0,0 +1,29 @@
+import numpy as np
+
+from downsampling import lttb_indices
+
+
+def test_lttb_keeps_first_and_last_points_within_budget():
+    x = np.arange(10_000, dtype=np.float64)
+    y = np.sin(x / 50) + np.random.default_rng(0).normal(0, 0.1, len(x))
+
+    indices = lttb_indices(x, y, 500)
+
+    assert len(indices) == 500
+    assert indices[0] == 0 and indices[-1] == len(x) - 1
+    assert np.all(np.diff(indices) > 0)
+
+
+def test_lttb_keeps_an_isolated_peak():
+    x = np.arange(1_000, dtype=np.float64)
+    y = np.zeros(len(x))
+    y[617] = 100
+
+    assert 617 in lttb_indices(x, y, 50)
+
+
+def test_lttb_returns_every_point_when_budget_is_large_enough():
+    x = np.arange(20, dtype=np.float64)
+
+    np.testing.assert_array_equal(lttb_indices(x, x, 20), np.arange(20))
+    np.testing.assert_array_equal(lttb_indices(x, x, 2), np.arange(20))
@@ -0,0 +1,58 @@
+import pandas as pd
+
+import report_cache
+from report_cache import ReportCache
+from report_pipeline import run_builders
+
+
+def sales_builder(data):
+    return {'sales': f"total={data['sales']['amount'].sum()}"}
+
+
+def _serialize(value):
+    return value
+
+
+def _run(cache, data):
+    return run_builders([(sales_builder, None)], data, workers=1, serialize=_serialize, cache=cache)
+
+
+def test_hit_when_tables_are_unchanged(tmp_path):
+    data = {'sales': pd.DataFrame({'amount': [1, 2, 3]}), 'other': pd.DataFrame({'x': [1]})}
+
+    [(charts, _, cached)] = _run(ReportCache(tmp_path), data)
+    assert not cached and charts == {'sales': 'total=6'}
+
+    cache = ReportCache(tmp_path)
+    # Cambiar una tabla que el builder no lee no invalida la entrada
+    [(charts, _, cached)] = _run(cache, {**data, 'other': pd.DataFrame({'x': [2]})})
+    assert cached and charts == {'sales': 'total=6'}
+    assert (cache.hits, cache.misses) == (1, 0)
+
+
+def test_miss_when_a_read_table_changes(tmp_path):
+    _run(ReportCache(tmp_path), {'sales': pd.DataFrame({'amount': [1, 2, 3]})})
+
+    cache = ReportCache(tmp_path)
+    [(charts, _, cached)] = _run(cache, {'sales': pd.DataFrame({'amount': [1, 2, 4]})})
+    assert not cached and charts == {'sales': 'total=7'}
+    assert (cache.hits, cache.misses) == (0, 1)
+
+
+def test_prune_keeps_most_recent_entries(tmp_path):
+    for amount in range(5):
+        _run(ReportCache(tmp_path, params={'run': amount}), {'sales': pd.DataFrame({'amount': [amount]})})
+
+    assert ReportCache(tmp_path, max_entries=2).prune() == 3
+    assert len(list(tmp_path.glob('*.json'))) == 2
+
+
+def test_miss_when_the_builder_module_changes(tmp_path, monkeypatch):
+    data = {'sales': pd.DataFrame({'amount': [1, 2, 3]})}
+    _run(ReportCache(tmp_path), data)
+
+    # Un helper del módulo del builder cambió aunque el builder no
+    monkeypatch.setattr(report_cache, '_module_hash', lambda name: f"{name}-edited")
+    cache = ReportCache(tmp_path)
+    [(_, _, cached)] = _run(cache, data)
+    assert not cached and (cache.hits, cache.misses) == (0, 1)
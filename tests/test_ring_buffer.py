@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+
+from ring_buffer import RingBuffer
+
+
+def _frame(start, n):
+    return pd.DataFrame({
+        'timestamp': pd.date_range('2024-01-01', periods=start + n, freq='h')[start:],
+        'value': np.arange(start, start + n, dtype=np.float64),
+    })
+
+
+def test_wrap_around_keeps_latest_rows_in_order():
+    buffer = RingBuffer.from_frame(_frame(0, 5), capacity=8)
+    buffer.append(_frame(5, 6))
+
+    assert len(buffer) == 8
+    assert buffer.appended == 11
+    np.testing.assert_array_equal(buffer.tail()['value'], np.arange(3, 11))
+    np.testing.assert_array_equal(buffer.tail(3)['value'], [8, 9, 10])
+
+
+def test_views_are_contiguous_slices_after_wrapping():
+    buffer = RingBuffer.from_frame(_frame(0, 8), capacity=8)
+    buffer.append(_frame(8, 5))
+
+    view = buffer.view()
+    # Cada vista es un slice del array interno, sin copia
+    assert all(values.base is not None and values.flags['C_CONTIGUOUS'] for values in view.values())
+    np.testing.assert_array_equal(view['value'], np.arange(5, 13))
+
+
+def test_append_larger_than_capacity_keeps_last_rows():
+    buffer = RingBuffer.from_frame(_frame(0, 2), capacity=4)
+    buffer.append(_frame(2, 10))
+
+    np.testing.assert_array_equal(buffer.tail()['value'], [8, 9, 10, 11])
+
+
+def test_last_between_and_since_use_timestamps():
+    buffer = RingBuffer.from_frame(_frame(0, 48), capacity=48)
+    times = buffer.tail()['timestamp']
+
+    assert len(buffer.last('24h')) == 24
+    assert len(buffer.between(times.iloc[10], times.iloc[19])) == 10
+    np.testing.assert_array_equal(buffer.since(times.iloc[45])['value'], [46, 47])
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+
+from running_correlation import CorrelationAccumulator, CorrelationService
+
+COLUMNS = ['a', 'b', 'c', 'flag']
+
+
+def _frame(n, seed):
+    rng = np.random.default_rng(seed)
+    a = rng.normal(1e6, 5, n)
+    return pd.DataFrame({
+        'a': a,
+        'b': 0.5 * a + rng.normal(0, 1, n),
+        'c': rng.integers(0, 100, n).astype(np.int16),
+        'flag': rng.random(n) < 0.3,
+    })
+
+
+def test_chunked_updates_match_dataframe_corr():
+    df = _frame(5_000, seed=1)
+    accumulator = CorrelationAccumulator(COLUMNS)
+    for start in range(0, len(df), 1_237):
+        accumulator.update(df.iloc[start:start + 1_237])
+
+    expected = df.astype(np.float64).corr()
+    pd.testing.assert_frame_equal(accumulator.correlation(), expected, atol=1e-9, rtol=0)
+
+
+def test_combine_matches_single_pass():
+    left, right = _frame(300, seed=2), _frame(700, seed=3)
+    combined = CorrelationAccumulator(COLUMNS).update(left).combine(CorrelationAccumulator(COLUMNS).update(right))
+    single = CorrelationAccumulator(COLUMNS).update(pd.concat([left, right], ignore_index=True))
+
+    np.testing.assert_allclose(combined.correlation(), single.correlation(), atol=1e-12)
+
+
+def test_constant_column_is_nan_like_dataframe_corr():
+    df = _frame(100, seed=4).assign(c=7)
+
+    corr = CorrelationAccumulator(COLUMNS).update(df).correlation()
+
+    assert corr['c'].isna().all()
+    assert corr.loc['a', 'a'] == 1.0
+
+
+def test_service_adds_only_appended_rows():
+    first, extra = _frame(400, seed=5), _frame(100, seed=6)
+    versions = {'v1': first, 'v2': pd.concat([first, extra], ignore_index=True)}
+    service = CorrelationService(load=lambda ref: versions[ref['version']], columns=COLUMNS)
+
+    service.correlation({'key': 'k', 'version': 'v1'})
+    accumulator = service._accumulators['k'][1]
+    corr = service.correlation({'key': 'k', 'version': 'v2'})
+
+    assert service._accumulators['k'][1] is accumulator
+    assert accumulator.count == 500
+    pd.testing.assert_frame_equal(corr, versions['v2'].astype(np.float64).corr(), atol=1e-9, rtol=0)
+
+
+def test_service_rebuilds_when_accumulated_rows_change():
+    first = _frame(400, seed=7)
+    changed = first.assign(b=first['b'] * 2)
+    versions = {'v1': first, 'v2': changed}
+    service = CorrelationService(load=lambda ref: versions[ref['version']], columns=COLUMNS)
+
+    service.correlation({'key': 'k', 'version': 'v1'})
+    corr = service.correlation({'key': 'k', 'version': 'v2'})
+
+    assert service._accumulators['k'][1].count == 400
+    pd.testing.assert_frame_equal(corr, changed.astype(np.float64).corr(), atol=1e-9, rtol=0)
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+import scatter_traces
+
+
+@pytest.fixture
+def density(monkeypatch):
+    monkeypatch.setattr(scatter_traces, 'DENSITY_THRESHOLD', 100)
+
+
+def _points(n=2_000, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.normal(size=n), rng.normal(size=n)
+
+
+def test_class_grids_share_edges_and_overlap(density):
+    x, y = _points()
+    marker = dict(color=(x > 1).astype(int), colorscale=[[0, '#28a745'], [1, '#dc3545']])
+
+    traces = scatter_traces.scatter_traces(x, y, marker=marker)
+
+    assert len(traces) == 2
+    np.testing.assert_array_equal(traces[0].x, traces[1].x)
+    np.testing.assert_array_equal(traces[0].y, traces[1].y)
+    assert all(trace.opacity < 1 for trace in traces)
+    assert np.nansum(traces[0].z) + np.nansum(traces[1].z) == len(x)
+
+
+def test_categorical_colors_use_discrete_palette(density):
+    x, y = _points()
+
+    traces = scatter_traces.scatter_traces(x, y, marker=dict(color=np.where(x > 0, 'Yes', 'No')))
+
+    assert [trace.name for trace in traces] == ['No', 'Yes']
+    assert traces[0].colorscale[-1][1] != traces[1].colorscale[-1][1]